@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Alias-Method Selection Tables for RetroPunks
+
+Rarities.selectRandomTrait walks a table's packed uint16 weights until the
+running sum passes the roll, so a selection costs O(n) mloads (up to 211 for
+M_HAIR). This script builds a Vose alias table for every Rarities.sol
+constant, selectable in O(1):
+
+  columns = entries / 4
+  r       = LibPRNG.uniform(prng, columns * totalWeight)
+  column  = r / totalWeight
+  idx     = r % totalWeight < prob[column] ? column : alias[column]
+
+Each entry is a packed pair (uint16 prob, uint16 alias). The construction is
+done in integers: every weight is scaled by the column count, each column
+holds exactly totalWeight of mass, so nothing is rounded. Rolls the linear
+scan cannot place (M_HAIR sums to 9554 of 9579) get a sentinel column whose
+index is the table length; landing on it reverts with TraitSelectionFailed,
+exactly as before.
+
+Proof: every one of the columns * totalWeight rolls is replayed through the
+lookup above and the counts are compared, as exact Fractions, with
+RarityDistribution.weights_distribution of the current constant. Both layouts
+draw a single LibPRNG.uniform, but they map rolls to traits differently, so
+a given seed lands on a different trait: switching layouts re-rolls the
+collection (same distribution, different tokens).
+
+Gas is estimated per selection alongside RarityCompiler's linear estimate;
+--bench measures both layouts with script/SelectionGas.s.sol against a local
+anvil (forge must be on PATH).
+
+Usage:
+  python3 AliasTables.py [--bench] [--rpc-url http://127.0.0.1:8545] [--samples 256]
+  (writes output/rarity_alias.sol and output/reports/alias_gas_report.txt)
+"""
+
+import argparse
+import os
+import re
+import subprocess
+from fractions import Fraction
+import numpy as np
+from RarityCompiler import ROOT, SELECT_OVERHEAD_GAS, gas_comparison
+from RarityDistribution import REVERT, weights_distribution
+from TraitsGenerator import TOTALS, WEIGHTS
+
+OUTPUT_DIR = "output"
+REPORTS_DIR = os.path.join(OUTPUT_DIR, "reports")
+ALIAS_FILENAME = "rarity_alias.sol"
+GAS_REPORT_FILENAME = "alias_gas_report.txt"
+
+BENCH_SCRIPT = "script/SelectionGas.s.sol"
+BENCH_SIG = "run(bytes[],uint256[],bytes[],uint256)"
+DEFAULT_RPC_URL = "http://127.0.0.1:8545"
+
+UINT16_MAX = 0xFFFF
+
+# Opcode-count estimate for one alias lookup (mul, div, mod, mload, shifts, compare)
+ALIAS_LOOKUP_GAS = 160
+
+# ============================================================================
+# ALIAS TABLES
+# ============================================================================
+
+def effective_weights(weights: tuple, total: int) -> tuple:
+    """(weights, shortfall) as the linear scan sees them: anything past `total` never lands."""
+    effective, previous = [], 0
+    for running in np.cumsum(weights, dtype=np.int64).tolist():
+        capped = min(running, total)
+        effective.append(capped - previous)
+        previous = capped
+    return effective, total - previous
+
+def build_alias(weights: tuple, total: int) -> tuple:
+    """(prob, alias) lists; a shortfall adds a sentinel column whose index is len(weights)."""
+    effective, shortfall = effective_weights(weights, total)
+    if shortfall:
+        effective.append(shortfall)
+    columns = len(effective)
+    scaled = [w * columns for w in effective]
+    prob, alias = [total] * columns, list(range(columns))
+    small = [i for i, s in enumerate(scaled) if s < total]
+    large = [i for i, s in enumerate(scaled) if s >= total]
+    while small and large:
+        lo, hi = small.pop(), large.pop()
+        prob[lo], alias[lo] = scaled[lo], hi
+        scaled[hi] -= total - scaled[lo]
+        (small if scaled[hi] < total else large).append(hi)
+    # Integer mass is exact: whatever is left fills its own column
+    assert not small, "alias construction left an underfull column"
+    return prob, alias
+
+def pack_alias(prob: list, alias: list) -> str:
+    return "".join(f"{p:04X}{a:04X}" for p, a in zip(prob, alias))
+
+def alias_counts(prob: list, alias: list, total: int) -> np.ndarray:
+    """Outcome counts over every roll in [0, columns * total), replaying the on-chain lookup."""
+    prob, alias = np.asarray(prob, dtype=np.int64), np.asarray(alias, dtype=np.int64)
+    rolls = np.arange(len(prob) * total, dtype=np.int64)
+    column = rolls // total
+    idx = np.where(rolls % total < prob[column], column, alias[column])
+    return np.bincount(idx, minlength=len(prob))
+
+def prove(table: str, prob: list, alias: list) -> list:
+    """Mismatches between the alias table and the current constant (empty when identical)."""
+    weights, total = WEIGHTS[table], TOTALS[table]
+    expected = weights_distribution(weights, total)
+    counts = alias_counts(prob, alias, total)
+    rolls = len(prob) * total
+    got = {}
+    for idx, count in enumerate(counts.tolist()):
+        if count:
+            key = REVERT if idx >= len(weights) else idx
+            got[key] = got.get(key, 0) + Fraction(count, rolls)
+    return [f"{k}: linear {expected.get(k, 0)} vs alias {got.get(k, 0)}"
+            for k in sorted(set(expected) | set(got), key=str) if expected.get(k, 0) != got.get(k, 0)]
+
+# ============================================================================
+# GAS
+# ============================================================================
+
+def estimate_rows() -> list:
+    rows = []
+    for table, weights in WEIGHTS.items():
+        linear = gas_comparison(table, list(weights), TOTALS[table])
+        rows.append({"table": table, "entries": len(weights), "linear_gas": linear["linear_gas"],
+                     "alias_gas": SELECT_OVERHEAD_GAS + ALIAS_LOOKUP_GAS})
+    return rows
+
+def run_bench(tables: dict, rpc_url: str, samples: int) -> dict:
+    """{table: (linear_gas, alias_gas)} measured by the forge harness against rpc_url."""
+    names = list(tables)
+    as_array = lambda values: "[" + ",".join(values) + "]"
+    cmd = [
+        "forge", "script", BENCH_SCRIPT, "--rpc-url", rpc_url, "--sig", BENCH_SIG,
+        as_array("0x" + "".join(f"{w:04X}" for w in WEIGHTS[t]) for t in names),
+        as_array(str(TOTALS[t]) for t in names),
+        as_array("0x" + tables[t] for t in names),
+        str(samples),
+    ]
+    result = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"forge script failed:\n{result.stdout}\n{result.stderr}")
+    measured = {}
+    for layout, index, gas, _ in re.findall(r"^\s*(linear|alias) (\d+) (\d+) (\d+)\s*$", result.stdout, re.M):
+        measured.setdefault(names[int(index)], {})[layout] = int(gas)
+    return {t: (m["linear"], m["alias"]) for t, m in measured.items()}
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+_ALIAS_SELECT = '''
+    /// @dev O(1) replacement for selectRandomTrait over a *_ALIAS table; numTraits is the length of the original table.
+    function selectRandomTraitAlias(LibPRNG.PRNG memory prng, bytes memory aliasTable, uint256 totalWeight, uint256 numTraits) internal pure returns (uint256 idx) {
+        uint256 r = LibPRNG.uniform(prng, (aliasTable.length >> 2) * totalWeight);
+        assembly {
+            idx := div(r, totalWeight)
+            let entry := shr(224, mload(add(add(aliasTable, 32), shl(2, idx))))
+            if iszero(lt(mod(r, totalWeight), shr(16, entry))) { idx := and(entry, 0xffff) }
+        }
+        if (idx >= numTraits) {
+            revert TraitSelectionFailed();
+        }
+    }
+'''
+
+def write_alias_constants(tables: dict) -> str:
+    out_file = os.path.join(OUTPUT_DIR, ALIAS_FILENAME)
+    lines = [f'    bytes private constant {t}_ALIAS = hex"{packed}"; // numTraits {len(WEIGHTS[t])}'
+             for t, packed in tables.items()]
+    with open(out_file, 'w') as f:
+        f.write("\n".join(lines) + "\n" + _ALIAS_SELECT)
+    return out_file
+
+def write_gas_report(rows: list, measured: dict) -> str:
+    lines = [f"{'Table':<18} {'N':>4} {'Linear est':>11} {'Alias est':>10} {'Linear gas':>11} {'Alias gas':>10} {'Delta':>8}"]
+    for r in rows:
+        linear, alias = measured.get(r["table"], (None, None))
+        delta = (alias - linear) if linear is not None else r["alias_gas"] - r["linear_gas"]
+        lines.append(f"{r['table']:<18} {r['entries']:>4} {r['linear_gas']:>11.0f} {r['alias_gas']:>10.0f} "
+                     f"{linear if linear is not None else '-':>11} {alias if alias is not None else '-':>10} {delta:>+8.0f}")
+    lines.append("")
+    lines.append("Estimates: RarityCompiler linear model; alias "
+                 f"{SELECT_OVERHEAD_GAS} fixed + {ALIAS_LOOKUP_GAS} lookup gas")
+    lines.append("Measured: mean gas per selection from " + (BENCH_SCRIPT if measured else "--bench (not run)")
+                 + "; Delta uses measured gas when available")
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    out_file = os.path.join(REPORTS_DIR, GAS_REPORT_FILENAME)
+    with open(out_file, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+    return out_file
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Build alias selection tables for the Rarities.sol weight tables.")
+    parser.add_argument("--bench", action="store_true", help=f"measure both layouts with {BENCH_SCRIPT} on a local anvil")
+    parser.add_argument("--rpc-url", default=DEFAULT_RPC_URL, help=f"anvil RPC for --bench (default: {DEFAULT_RPC_URL})")
+    parser.add_argument("--samples", type=int, default=256, help="selections per table and layout for --bench (default: 256)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("Alias-Method Selection Tables")
+    print("=" * 70)
+
+    tables, failed = {}, 0
+    for table, weights in WEIGHTS.items():
+        total = TOTALS[table]
+        if total > UINT16_MAX:
+            print(f"  ⊗ {table}: total {total} does not fit a uint16 prob")
+            failed += 1
+            continue
+        prob, alias = build_alias(weights, total)
+        mismatches = prove(table, prob, alias)
+        tables[table] = pack_alias(prob, alias)
+        sentinel = " (+ revert column)" if len(prob) > len(weights) else ""
+        if mismatches:
+            failed += 1
+            print(f"  ⊗ {table}: {len(prob)} columns{sentinel}, distribution differs")
+            for line in mismatches[:5]:
+                print(f"      {line}")
+        else:
+            print(f"  ✓ {table}: {len(prob)} columns{sentinel}, {len(prob) * total} rolls, identical")
+    print(f"Tables:   {len(tables)} built, {len(tables) - failed} proven identical, {failed} failed")
+
+    measured = {}
+    if args.bench:
+        measured = run_bench(tables, args.rpc_url, args.samples)
+        print(f"Measured: {len(measured)} tables, {args.samples} selections each ({args.rpc_url})")
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    alias_file = write_alias_constants(tables)
+    report_file = write_gas_report(estimate_rows(), measured)
+
+    print("=" * 70)
+    print(f"Alias tables written to: {alias_file}")
+    print(f"Gas report written to:   {report_file}")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
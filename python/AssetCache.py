@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Content-Hash Build Cache for the RetroPunks Asset Encoders
+
+Every encoder run used to re-decode every PNG and re-encode every trait group,
+even when only one file changed. This cache stores each encoded group blob on
+disk, keyed by a sha256 over:
+
+  - the encoder's source files: its own module plus every imported module
+    that shapes the encoded bytes (so code changes invalidate old blobs),
+  - the encoder settings (FULL_RES_TRAITS, INCLUDE_NONE_TRAIT, canvas sizes...),
+  - the group name it is encoded under,
+  - every input PNG's filename and bytes, in encoding order.
+
+On a hit the stored blob is returned as-is and the group is skipped entirely;
+hashing a group directory is far cheaper than decoding and encoding it.
+Storing a group's blob deletes that group's older blobs in the namespace, so
+the cache holds one entry per group instead of one per edit.
+
+Layout:
+  output/.cache/<namespace>/<group>.<sha256>.bin    raw encoded group blob
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+CACHE_DIR = Path("output") / ".cache"
+
+def hash_file(path, h=None):
+    """Feed one file's bytes into `h` (a new sha256 if None) and return it."""
+    h = h or hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h
+
+def _group_slug(group_name: str) -> str:
+    """Filename-safe group name; never contains the '.' that separates it from the hash."""
+    return re.sub(r"[^A-Za-z0-9_-]", "_", group_name)
+
+class GroupCache:
+    """On-disk cache of encoded trait group blobs for a single encoder."""
+
+    def __init__(self, namespace: str, settings: dict, source_files,
+                 cache_dir=CACHE_DIR, enabled: bool = True):
+        self.enabled = enabled
+        self.directory = Path(cache_dir) / namespace
+
+        # Settings + encoder source form the fixed prefix of every key.
+        prefix = hashlib.sha256()
+        prefix.update(namespace.encode('utf-8') + b"\0")
+        prefix.update(json.dumps(settings, sort_keys=True, default=list).encode('utf-8') + b"\0")
+        if isinstance(source_files, (str, os.PathLike)):
+            source_files = [source_files]
+        for path in source_files:
+            prefix.update(os.path.basename(path).encode('utf-8') + b"\0")
+            hash_file(path, prefix)
+        self._prefix = prefix
+
+    def key(self, group_name: str, files: list) -> str:
+        """
+        Return the cache key for encoding `files` (paths, in encoding order)
+        under `group_name`. Missing files are hashed as absent so a later
+        addition still changes the key. The key starts with the group name so
+        store() can find the group's stale blobs.
+        """
+        h = self._prefix.copy()
+        h.update(group_name.encode('utf-8') + b"\0")
+        for path in files:
+            h.update(os.path.basename(path).encode('utf-8') + b"\0")
+            if os.path.exists(path):
+                h.update(hash_file(path).digest())
+            else:
+                h.update(b"<missing>")
+        return f"{_group_slug(group_name)}.{h.hexdigest()}"
+
+    def load(self, key: str):
+        """Return the cached blob for `key`, or None on a miss."""
+        if not self.enabled:
+            return None
+        path = self.directory / f"{key}.bin"
+        try:
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def store(self, key: str, data: bytes):
+        """
+        Persist `data` under `key` and drop the group's older blobs. Atomic,
+        so parallel workers never see partial blobs.
+        """
+        if not self.enabled:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{key}.bin"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self.prune(key)
+
+    def prune(self, key: str):
+        """Delete every blob stored for the same group as `key` except `key` itself."""
+        group = key.split(".", 1)[0]
+        for stale in self.directory.glob(f"{group}.*.bin"):
+            if stale != self.directory / f"{key}.bin":
+                stale.unlink(missing_ok=True)
@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import struct
+from FastLZ import compressed_path, write_compressed
 
 OUTPUT_DIR = "output"
 COMBINED_FILENAME = "background_asset.txt"
@@ -522,6 +524,11 @@ def encode_background_group():
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Background asset encoder for RetroPunks.")
+    parser.add_argument("--compress", action="store_true",
+                        help="also write a LibZip-compatible FastLZ blob to background_asset_compressed.txt")
+    args = parser.parse_args()
+
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     print("Generating Background Asset Group...")
 
@@ -544,6 +551,10 @@ def main():
     print(f"\nSuccess! Written to: {path}")
     print(f"  Binary size: {len(data):,} bytes")
     print(f"  Hex length:  {len(hex_string):,} chars")
+    if args.compress:
+        compressed_file = compressed_path(path)
+        (_, _, compressed_size), = write_compressed(compressed_file, [(GROUP_NAME, data)])
+        print(f"  Compressed:  {compressed_size:,} bytes -> {compressed_file}")
     print(
         f"  Palette size: {len({parse_color(c) for bg in BACKGROUNDS for c in bg.get('palette', [])}):,} unique colors")
 
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Vectorized Monte-Carlo Collection Simulator for RetroPunks
+
+Draws millions of TraitsContexts with batched NumPy lookups instead of
+per-token Python loops: every Rarities.sol weight table becomes a cumulative
+array and each slot is one np.searchsorted over a whole batch. The branching
+is _select_male / _select_female from TraitsGenerator, applied with row masks
+(face table A/B/C by skin, ghost eyes, facial hair A/B, None pre-rolls for
+hair and hat hair, no hair for Robot/Mummy/Vampire, MOUTH_C for every male),
+and sex follows the 70/30 split in generateTraitsContext.
+
+This is a statistical model of the distribution, not a replay: rolls come
+from numpy.random, not LibPRNG, so use TraitsGenerator for the actual tokens.
+Rows whose hair roll runs past M_HAIR revert on-chain and are flagged, not
+dropped; all statistics skip them.
+
+The table has one column per slot (enum index; the enum is E_Male_* or
+E_Female_* by the sex column) plus `reverted`. Rendered copies of the
+slots TraitLogic hides (mask, mouth, hair, hat hair) are derived for the
+duplicate-look and correlation reports.
+
+Usage:
+  python3 CollectionSimulator.py [--tokens 1000000] [--seed N] [--jobs 0]
+                                 [--collection-size 10000] [--format npz|arrow] [--check]
+  (writes output/simulated_traits.npz or .arrow and output/reports/simulation_report.txt)
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from TraitsGenerator import F, M, SEX_FEMALE, SEX_MALE, TOTALS, WEIGHTS, enum_index
+
+OUTPUT_DIR = "output"
+REPORTS_DIR = os.path.join(OUTPUT_DIR, "reports")
+TABLE_BASENAME = "simulated_traits"
+REPORT_FILENAME = "simulation_report.txt"
+
+DEFAULT_TOKENS = 1_000_000
+DEFAULT_COLLECTION_SIZE = 10000
+BATCH_SIZE = 250_000
+
+SLOTS = ("skin", "eyes", "face", "chain", "earring", "facial_hair", "mask", "scarf",
+         "hair", "hat_hair", "headwear", "eye_wear", "mouth")
+
+# Rendered slots that make up a token's look (attributes in tokenURI)
+LOOK_COLUMNS = ("sex", "skin", "eyes", "face", "chain", "earring", "facial_hair", "rendered_mask", "scarf",
+                "rendered_hair", "rendered_hat_hair", "headwear", "eye_wear", "rendered_mouth")
+
+# ============================================================================
+# SAMPLING
+# ============================================================================
+
+NOT_FOUND = np.iinfo(np.uint16).max
+
+class _Table:
+    """A weight table as a cumulative array for searchsorted lookups."""
+
+    def __init__(self, name: str):
+        self.total = TOTALS[name]
+        self.cumulative = np.cumsum(np.array(WEIGHTS[name], dtype=np.int64))
+
+    def draw(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """selectRandomTrait for n rows; rolls past the end come back as NOT_FOUND."""
+        r = rng.integers(0, self.total, size=n)
+        idx = np.searchsorted(self.cumulative, r, side='right')
+        idx[idx >= len(self.cumulative)] = NOT_FOUND
+        return idx.astype(np.uint16)
+
+_TABLES = {name: _Table(name) for name in WEIGHTS}
+
+def _isin(values: np.ndarray, members: tuple) -> np.ndarray:
+    return np.isin(values, np.array(members))
+
+def _fill(out: np.ndarray, rows: np.ndarray, table: str, rng: np.random.Generator):
+    """Draw `table` for the rows selected by a boolean mask."""
+    n = int(rows.sum())
+    if n:
+        out[rows] = _TABLES[table].draw(rng, n)
+
+def _fill_with_none(out: np.ndarray, rows: np.ndarray, table: str, none_weight: np.ndarray,
+                    rng: np.random.Generator):
+    """_select_with_none: a None pre-roll against table total + none_weight (per row), then the table."""
+    n = int(rows.sum())
+    if not n:
+        return
+    weights = none_weight[rows]
+    roll = rng.integers(0, TOTALS[table] + weights)
+    drawn = _TABLES[table].draw(rng, n)
+    out[rows] = np.where(roll < weights, 0, drawn)
+
+def _ghost_eyes(enum_name: str, n: int, rng: np.random.Generator) -> np.ndarray:
+    left, right = enum_index(enum_name, "Ghost_Left"), enum_index(enum_name, "Ghost_Right")
+    return np.where(rng.integers(0, 10000, size=n) < 5000, left, right).astype(np.uint16)
+
+def _male(rows: np.ndarray, cols: dict, rng: np.random.Generator):
+    skin = cols["skin"]
+    _fill(skin, rows, "M_SKIN", rng)
+    human = rows & (skin >= M.HUMAN_1) & (skin <= M.HUMAN_12)
+    zombie = rows & (skin == M.ZOMBIE)
+    ghost = rows & (skin == M.GHOST)
+
+    cols["eyes"][ghost] = _ghost_eyes("E_Male_Eyes", int(ghost.sum()), rng)
+    _fill(cols["eyes"], rows & ~ghost, "M_EYES", rng)
+
+    face_a = human | zombie
+    face_b = rows & _isin(skin, (M.APE, M.YETI, M.ZOMBIE_APE))
+    face_c = rows & _isin(skin, (M.ALIEN, M.DEMON, M.GHOST, M.GLITCH, M.GOBLIN, M.PUMPKIN, M.SKELETON, M.VAMPIRE))
+    _fill(cols["face"], face_a, "M_FACE_A", rng)
+    _fill(cols["face"], face_b & ~face_a, "M_FACE_B", rng)
+    _fill(cols["face"], face_c & ~face_a & ~face_b, "M_FACE_C", rng)
+
+    _fill(cols["chain"], rows, "M_CHAIN", rng)
+    _fill(cols["earring"], rows, "M_EARRING", rng)
+    _fill(cols["facial_hair"], ghost, "M_FACIAL_HAIR_A", rng)
+    _fill(cols["facial_hair"], face_a, "M_FACIAL_HAIR_B", rng)
+    _fill(cols["mask"], rows, "M_MASK", rng)
+    _fill(cols["scarf"], rows, "M_SCARF", rng)
+
+    has_hair = rows & ~_isin(skin, (M.ROBOT, M.MUMMY, M.VAMPIRE))
+    _fill_with_none(cols["hair"], has_hair, "M_HAIR", np.where(face_a, 400, 1200), rng)
+    _fill_with_none(cols["hat_hair"], has_hair, "M_HAT_HAIR", np.where(face_a, 400, 800), rng)
+
+    _fill(cols["headwear"], rows, "M_HEADWEAR", rng)
+    _fill(cols["eye_wear"], rows, "M_EYEWEAR", rng)
+    # selectMouth runs before facial hair is stored, so males always use MOUTH_C
+    _fill(cols["mouth"], rows, "MOUTH_C", rng)
+
+def _female(rows: np.ndarray, cols: dict, rng: np.random.Generator):
+    skin = cols["skin"]
+    _fill(skin, rows, "F_SKIN", rng)
+    human_or_zombie = rows & (((skin >= F.HUMAN_1) & (skin <= F.HUMAN_12)) | (skin == F.ZOMBIE))
+    ghost = rows & (skin == F.GHOST)
+
+    cols["eyes"][ghost] = _ghost_eyes("E_Female_Eyes", int(ghost.sum()), rng)
+    _fill(cols["eyes"], rows & ~ghost, "F_EYES", rng)
+
+    face_b = rows & _isin(skin, (F.APE, F.ZOMBIE_APE))
+    face_c = rows & _isin(skin, (F.ALIEN, F.DEMON, F.GHOST, F.GLITCH, F.GOBLIN, F.SKELETON, F.VAMPIRE))
+    _fill(cols["face"], human_or_zombie, "F_FACE_A", rng)
+    _fill(cols["face"], face_b & ~human_or_zombie, "F_FACE_B", rng)
+    _fill(cols["face"], face_c & ~human_or_zombie & ~face_b, "F_FACE_C", rng)
+
+    _fill(cols["chain"], rows, "F_CHAIN", rng)
+    _fill(cols["earring"], rows, "F_EARRING", rng)
+    _fill(cols["mask"], rows, "F_MASK", rng)
+    _fill(cols["scarf"], rows, "F_SCARF", rng)
+
+    has_hair = rows & ~_isin(skin, (F.ROBOT, F.MUMMY, F.VAMPIRE))
+    _fill_with_none(cols["hair"], has_hair, "F_HAIR", np.where(human_or_zombie, 400, 1200), rng)
+    _fill_with_none(cols["hat_hair"], has_hair, "F_HAT_HAIR", np.where(human_or_zombie, 400, 1200), rng)
+
+    _fill(cols["headwear"], rows, "F_HEADWEAR", rng)
+    _fill(cols["eye_wear"], rows, "F_EYEWEAR", rng)
+    _fill(cols["mouth"], rows, "MOUTH_A", rng)
+
+def simulate_batch(n: int, seed) -> dict:
+    """n random (non-special) TraitsContexts as {column: ndarray}."""
+    rng = np.random.default_rng(seed)
+    cols = {"sex": np.where(rng.integers(0, 10000, size=n) < 7000, SEX_MALE, SEX_FEMALE).astype(np.uint8)}
+    cols.update({slot: np.zeros(n, dtype=np.uint16) for slot in SLOTS})
+
+    male = cols["sex"] == SEX_MALE
+    _male(male, cols, rng)
+    _female(~male, cols, rng)
+
+    reverted = np.zeros(n, dtype=bool)
+    for slot in SLOTS:
+        reverted |= cols[slot] == NOT_FOUND
+    cols["reverted"] = reverted
+    return cols
+
+def simulate(tokens: int, seed: int, jobs: int) -> dict:
+    """`tokens` rows drawn in BATCH_SIZE batches, each with its own spawned seed, across `jobs` processes."""
+    sizes = [min(BATCH_SIZE, tokens - i) for i in range(0, tokens, BATCH_SIZE)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if jobs <= 1:
+        batches = [simulate_batch(n, s) for n, s in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            batches = list(pool.map(simulate_batch, sizes, seeds))
+    return {name: np.concatenate([b[name] for b in batches]) for name in batches[0]}
+
+# ============================================================================
+# ANALYSIS
+# ============================================================================
+
+def rendered_columns(table: dict) -> dict:
+    """What TraitLogic actually draws: hidden masks, mouths and hair zeroed."""
+    male = table["sex"] == SEX_MALE
+    mask = np.where(male & (table["facial_hair"] != 0), 0, table["mask"])
+    has_headwear = table["headwear"] != 0
+    return {
+        "rendered_mask": mask,
+        "rendered_mouth": np.where(table["mask"] != 0, 0, table["mouth"]),
+        "rendered_hair": np.where(has_headwear, 0, table["hair"]),
+        "rendered_hat_hair": np.where(has_headwear, table["hat_hair"], 0),
+    }
+
+def look_keys(table: dict) -> np.ndarray:
+    """One row per valid token holding its rendered look, packed into a void dtype for fast unique()."""
+    valid = ~table["reverted"]
+    cols = {**table, **rendered_columns(table)}
+    looks = np.column_stack([cols[c][valid].astype(np.uint16) for c in LOOK_COLUMNS])
+    return np.ascontiguousarray(looks).view(np.dtype((np.void, looks.dtype.itemsize * looks.shape[1]))).ravel()
+
+def duplicate_looks(keys: np.ndarray, collection_size: int) -> dict:
+    """
+    Duplicate-look rates: across the whole sample, and per disjoint chunk
+    of `collection_size` tokens (each chunk stands in for one collection).
+    """
+    _, counts = np.unique(keys, return_counts=True)
+    chunks = len(keys) // collection_size
+    per_collection = []
+    for i in range(chunks):
+        _, c = np.unique(keys[i * collection_size:(i + 1) * collection_size], return_counts=True)
+        per_collection.append(int((c[c > 1] - 1).sum()))
+    return {
+        "tokens": len(keys),
+        "distinct_looks": len(counts),
+        "tokens_sharing_a_look": int(counts[counts > 1].sum()),
+        "collections": chunks,
+        "mean_duplicates_per_collection": float(np.mean(per_collection)) if chunks else float("nan"),
+        "collections_with_duplicate": sum(1 for d in per_collection if d) / chunks if chunks else float("nan"),
+    }
+
+def cramers_v(a: np.ndarray, b: np.ndarray) -> float:
+    """Cramér's V of two small-integer categorical columns from their contingency table."""
+    if not len(a):
+        return 0.0
+    a, b = a.astype(np.int64, copy=False), b.astype(np.int64, copy=False)
+    kb = int(b.max()) + 1
+    observed = np.bincount(a * kb + b, minlength=(int(a.max()) + 1) * kb).reshape(-1, kb).astype(float)
+    observed = observed[observed.sum(1) > 0][:, observed.sum(0) > 0]
+    ka, kb = observed.shape
+    if ka < 2 or kb < 2:
+        return 0.0
+    n = observed.sum()
+    expected = observed.sum(1, keepdims=True) * observed.sum(0, keepdims=True) / n
+    chi2 = ((observed - expected) ** 2 / expected).sum()
+    return float(np.sqrt(chi2 / (n * (min(ka, kb) - 1))))
+
+def pair_correlations(table: dict, sex: int) -> list:
+    """(V, column, column) for every pair of rendered slots within one sex, strongest first."""
+    rows = (table["sex"] == sex) & ~table["reverted"]
+    all_cols = {**table, **rendered_columns(table)}
+    names = [c for c in LOOK_COLUMNS if c != "sex"]
+    cols = {name: all_cols[name][rows].astype(np.int64) for name in names}
+    pairs = []
+    for i, a in enumerate(names):
+        for b in names[i + 1:]:
+            pairs.append((cramers_v(cols[a], cols[b]), a, b))
+    return sorted(pairs, reverse=True)
+
+def check_against_exact(table: dict) -> tuple:
+    """Largest |z| of any selected-field marginal against RarityDistribution; (z, field, value)."""
+    from RarityDistribution import SELECTED, branches, joint
+    all_branches, _ = branches()
+    valid = ~table["reverted"]
+    n = int(valid.sum())
+    worst = (0.0, None, None)
+    for attr in SELECTED:
+        if attr.name == "sex":
+            continue
+        rows = valid if attr.sex is None else valid & (table["sex"] == attr.sex)
+        counts = np.bincount(table[attr.name.removeprefix("male_").removeprefix("female_")][rows])
+        for (value,), p in joint([attr], all_branches).items():
+            if value is None or p == 0 or p == 1:
+                continue
+            observed = counts[value] / n if value < len(counts) else 0.0
+            z = (observed - float(p)) / np.sqrt(float(p) * (1 - float(p)) / n)
+            if abs(z) > abs(worst[0]):
+                worst = (float(z), attr.name, value)
+    return worst
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def write_table(table: dict, fmt: str) -> str:
+    if fmt == "arrow":
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        out_file = os.path.join(OUTPUT_DIR, f"{TABLE_BASENAME}.arrow")
+        feather.write_feather(pa.table(table), out_file)
+    else:
+        out_file = os.path.join(OUTPUT_DIR, f"{TABLE_BASENAME}.npz")
+        np.savez(out_file, **table)
+    return out_file
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte-Carlo RetroPunks trait simulator (NumPy).")
+    parser.add_argument("--tokens", type=int, default=DEFAULT_TOKENS,
+                        help=f"random tokens to draw (default: {DEFAULT_TOKENS:,})")
+    parser.add_argument("--seed", type=int, default=0, help="numpy SeedSequence entropy (default: 0)")
+    parser.add_argument("--jobs", "-j", type=int, default=0, metavar="N",
+                        help="worker processes (0 = one per CPU core, default: 0)")
+    parser.add_argument("--collection-size", type=int, default=DEFAULT_COLLECTION_SIZE,
+                        help=f"tokens per simulated collection for duplicate rates (default: {DEFAULT_COLLECTION_SIZE})")
+    parser.add_argument("--format", choices=("npz", "arrow"), default="npz",
+                        help="table format; arrow needs pyarrow (default: npz)")
+    parser.add_argument("--check", action="store_true", help="compare marginals with RarityDistribution")
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    if args.format == "arrow":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("--format arrow needs pyarrow (pip install pyarrow)")
+
+    print("=" * 70)
+    print("Monte-Carlo Collection Simulator (NumPy)")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    table = simulate(args.tokens, args.seed, jobs)
+    elapsed = time.perf_counter() - start
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    table_file = write_table(table, args.format)
+
+    dup = duplicate_looks(look_keys(table), args.collection_size)
+    lines = [
+        f"Tokens drawn:            {args.tokens:,} (seed {args.seed})",
+        f"Reverted (M_HAIR):       {int(table['reverted'].sum()):,} ({table['reverted'].mean():.4%})",
+        f"Male share:              {(table['sex'] == SEX_MALE).mean():.4%}",
+        f"Distinct looks:          {dup['distinct_looks']:,} of {dup['tokens']:,}",
+        f"Tokens sharing a look:   {dup['tokens_sharing_a_look']:,}",
+        f"Per {args.collection_size:,}-token collection ({dup['collections']} simulated):",
+        f"  mean duplicate looks   {dup['mean_duplicates_per_collection']:.3f}",
+        f"  with any duplicate     {dup['collections_with_duplicate']:.2%}",
+    ]
+    for sex, name in ((SEX_MALE, "Male"), (SEX_FEMALE, "Female")):
+        lines.append(f"Strongest slot correlations ({name}, Cramér's V):")
+        lines.extend(f"  {v:.4f}  {a} x {b}" for v, a, b in pair_correlations(table, sex)[:8])
+    if args.check:
+        z, field, value = check_against_exact(table)
+        lines.append(f"Largest |z| vs exact marginals: {abs(z):.2f} ({field} = {value})")
+
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    report_file = os.path.join(REPORTS_DIR, REPORT_FILENAME)
+    with open(report_file, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+
+    print("\n".join(lines))
+    print(f"Simulated in {elapsed:.2f}s ({args.tokens / max(elapsed, 1e-9):,.0f} tokens/s)")
+    print("=" * 70)
+    print(f"Table written to:  {table_file}")
+    print(f"Report written to: {report_file}")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
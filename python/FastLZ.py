@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+FastLZ (level 1) Compressor for RetroPunks Assets
+
+Pure-Python port of Solady's LibZip.flzCompress / flzDecompress. Output is
+byte-identical to LibZip.flzCompress (and to solady.js, which the old
+`compress-assets.js` step used), so anything written here decodes unchanged via
+`Assets.loadAsset(key, true)` -> `LibZip.flzDecompress`.
+
+Usage:
+  python3 FastLZ.py              compress every output/*_asset.txt into *_asset_compressed.txt
+  python3 FastLZ.py FILE ...     compress only the given asset files
+  python3 FastLZ.py --optimal    use the optimal parser and report bytes saved
+                                 per group against the greedy encoder
+  python3 FastLZ.py --verify     check the encoders against the deployed trait blobs
+                                 in script/AddAssetsBatch.s.sol: recompressing each
+                                 decompressed blob must give identical bytes, and the
+                                 optimal parse must round-trip; exits 1 on a mismatch
+
+Encoders can also import `write_compressed` to emit *_compressed.txt directly.
+
+Stream format (as decoded by flzDecompress):
+  [c:1] with c >> 5 == 0       literal run of c + 1 bytes follows
+  [c:1][lo:1]                  match, len = (c >> 5) + 2, dist = ((c & 31) << 8) + lo + 1
+  [c:1][n:1][lo:1] (c>>5 == 7) long match, len = n + 9
+"""
+
+import argparse
+import os
+import re
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+ASSETS_SCRIPT_PATH = ROOT / "script" / "AddAssetsBatch.s.sol"
+
+OUTPUT_DIR = "output"
+COMPRESSED_SUFFIX = "_compressed"
+ASSET_SUFFIX = "_asset.txt"
+
+_HASH_SIZE = 0x2000
+_MAX_DISTANCE = 0x1fff
+_LINE_PATTERN = re.compile(r"^(.+?):\s*(0x[0-9a-fA-F]+)$")
+_ASSET_PATTERN = re.compile(r'Asset\(\{\s*key:\s*(\d+),\s*name:\s*"([^"]*)",\s*data:\s*hex"([0-9A-Fa-f]*)"\s*\}\)')
+COMPRESSED_KEY_LIMIT = 100          # trait groups are stored compressed; keys from 100 are raw specials
+
+# ============================================================================
+# COMPRESSION
+# ============================================================================
+
+def _hash(v: int) -> int:
+    return ((2654435769 * v) >> 19) & 0x1fff
+
+def _literals(out: bytearray, data: bytes, start: int, end: int):
+    """Emit data[start:end] as literal runs of at most 32 bytes."""
+    while end - start >= 32:
+        out.append(31)
+        out += data[start:start + 32]
+        start += 32
+    if end > start:
+        out.append(end - start - 1)
+        out += data[start:end]
+
+def _match(out: bytearray, length: int, distance: int):
+    """Emit a back-reference. `length` is the match length minus 2, as in LibZip."""
+    distance -= 1
+    hi, lo = distance >> 8, distance & 0xff
+    while length >= 263:
+        out += bytes((224 + hi, 253, lo))
+        length -= 262
+    if length >= 7:
+        out += bytes((224 + hi, length - 7, lo))
+    else:
+        out += bytes(((length << 5) + hi, lo))
+
+def flz_compress(data: bytes) -> bytes:
+    """Compress `data` exactly as LibZip.flzCompress does."""
+    data = bytes(data)
+    n = len(data)
+    table = [0] * _HASH_SIZE
+    out = bytearray()
+
+    def u24(i):
+        return data[i] | (data[i + 1] << 8) | (data[i + 2] << 16)
+
+    anchor = 0
+    ip = 2
+    ip_limit = n - 13
+
+    while ip < ip_limit:
+        # Scan forward for the next position whose 3-byte prefix was seen within range.
+        while True:
+            s = u24(ip)
+            h = _hash(s)
+            ref = table[h]
+            table[h] = ip
+            distance = ip - ref
+            if ip >= ip_limit:
+                break
+            ip += 1
+            if distance <= _MAX_DISTANCE and s == u24(ref):
+                break
+        if ip >= ip_limit:
+            break
+        ip -= 1
+
+        if ip > anchor:
+            _literals(out, data, anchor, ip)
+
+        # Extend the match; LibZip returns mismatch index + 1, capped at the bound.
+        p, q = ref + 3, ip + 3
+        bound = ip_limit + 9 - q
+        length = 0
+        while length < bound:
+            if data[p + length] != data[q + length]:
+                length += 1
+                break
+            length += 1
+
+        _match(out, length, distance)
+
+        ip += length
+        table[_hash(u24(ip))] = ip
+        ip += 1
+        table[_hash(u24(ip))] = ip
+        ip += 1
+        anchor = ip
+
+    _literals(out, data, anchor, n)
+    return bytes(out)
+
+# ============================================================================
+# OPTIMAL PARSING
+# ============================================================================
+#
+# The greedy matcher above takes the first hash hit and never looks back. The
+# decoder accepts any valid token sequence, so a shortest-path parse over the
+# same format can pack the same bytes tighter:
+#
+#   literal run of k bytes (1..32)  costs 1 + k
+#   match of 3..8 bytes             costs 2
+#   match of 9..264 bytes           costs 3
+#   distance                        1..8192 (one more than greedy allows)
+#
+# cost[i] is the fewest bytes that can encode data[i:]. A match of any length
+# up to the longest one found at i is valid (every prefix of a match is a
+# match), so only the longest match per position has to be searched for.
+
+_MIN_MATCH = 3
+_MAX_SHORT_MATCH = 8
+_MAX_MATCH = 264
+_MAX_LITERALS = 32
+_MAX_OPTIMAL_DISTANCE = 0x2000
+
+def _common_length(data: bytes, p: int, q: int, limit: int) -> int:
+    """Length of the common prefix of data[p:] and data[q:], at most `limit`."""
+    a = int.from_bytes(data[p:p + limit], 'big')
+    b = int.from_bytes(data[q:q + limit], 'big')
+    x = a ^ b
+    if not x:
+        return limit
+    return limit - (x.bit_length() + 7) // 8
+
+def _longest_matches(data: bytes, max_chain: int) -> tuple:
+    """
+    For every position, the longest earlier match (capped at _MAX_MATCH) and
+    its distance, found by walking a hash chain of equal 3-byte prefixes.
+    """
+    n = len(data)
+    lengths = [0] * n
+    distances = [0] * n
+    head = {}
+    prev = [-1] * n
+
+    for i in range(n - _MIN_MATCH + 1):
+        key = data[i:i + _MIN_MATCH]
+        candidate = head.get(key, -1)
+        prev[i] = candidate
+        head[key] = i
+
+        limit = min(_MAX_MATCH, n - i)
+        best_len = best_dist = 0
+        depth = 0
+        while candidate >= 0 and i - candidate <= _MAX_OPTIMAL_DISTANCE and depth < max_chain:
+            length = _common_length(data, candidate, i, limit)
+            if length > best_len:
+                best_len, best_dist = length, i - candidate
+                if length == limit:
+                    break
+            candidate = prev[candidate]
+            depth += 1
+
+        lengths[i] = best_len
+        distances[i] = best_dist
+    return lengths, distances
+
+def flz_compress_optimal(data: bytes, max_chain: int = 256) -> bytes:
+    """
+    Compress `data` with a minimum-size parse of the LibZip FastLZ format.
+
+    The result decodes with LibZip.flzDecompress exactly like flz_compress
+    output does. `max_chain` bounds how many earlier candidates are checked per
+    position; it only matters on highly repetitive input, where the longest
+    match is usually found first anyway. The greedy result is returned instead
+    if that bound ever makes the parse come out larger.
+    """
+    data = bytes(data)
+    n = len(data)
+    lengths, distances = _longest_matches(data, max_chain)
+
+    inf = float('inf')
+    cost = [inf] * (n + 1)
+    cost[n] = 0
+    step = [0] * (n + 1)          # > 0: match length, < 0: literal run length
+
+    for i in range(n - 1, -1, -1):
+        best = inf
+        choice = 0
+
+        for k in range(1, min(_MAX_LITERALS, n - i) + 1):
+            c = 1 + k + cost[i + k]
+            if c < best:
+                best, choice = c, -k
+
+        max_len = lengths[i]
+        if max_len >= _MIN_MATCH:
+            for length in range(_MIN_MATCH, min(max_len, _MAX_SHORT_MATCH) + 1):
+                c = 2 + cost[i + length]
+                if c < best:
+                    best, choice = c, length
+            for length in range(_MAX_SHORT_MATCH + 1, max_len + 1):
+                c = 3 + cost[i + length]
+                if c < best:
+                    best, choice = c, length
+
+        cost[i] = best
+        step[i] = choice
+
+    out = bytearray()
+    i = 0
+    while i < n:
+        choice = step[i]
+        if choice < 0:
+            out.append(-choice - 1)
+            out += data[i:i - choice]
+            i -= choice
+            continue
+        d = distances[i] - 1
+        if choice > _MAX_SHORT_MATCH:
+            out += bytes((224 + (d >> 8), choice - 9, d & 0xff))
+        else:
+            out += bytes((((choice - 2) << 5) + (d >> 8), d & 0xff))
+        i += choice
+
+    greedy = flz_compress(data)
+    return bytes(out) if len(out) <= len(greedy) else greedy
+
+# ============================================================================
+# DECOMPRESSION
+# ============================================================================
+
+def flz_decompress(data: bytes) -> bytes:
+    """Decompress `data` exactly as LibZip.flzDecompress does."""
+    out = bytearray()
+    i, n = 0, len(data)
+    while i < n:
+        c = data[i]
+        t = c >> 5
+        if t == 0:
+            out += data[i + 1:i + 2 + c]
+            i += 2 + c
+            continue
+        if t == 7:
+            length = data[i + 1] + 9
+            distance = ((c & 31) << 8) + data[i + 2] + 1
+            i += 3
+        else:
+            length = t + 2
+            distance = ((c & 31) << 8) + data[i + 1] + 1
+            i += 2
+        start = len(out) - distance
+        if distance >= length:
+            out += out[start:start + length]
+        else:
+            # Overlapping copy repeats the last `distance` bytes.
+            for j in range(length):
+                out.append(out[start + j])
+    return bytes(out)
+
+# ============================================================================
+# ASSET FILES
+# ============================================================================
+
+def compressed_path(path: str) -> str:
+    """output/traits_asset.txt -> output/traits_asset_compressed.txt"""
+    root, ext = os.path.splitext(path)
+    return f"{root}{COMPRESSED_SUFFIX}{ext}"
+
+def read_asset_lines(path: str) -> list:
+    """Parse "GroupName: 0xHEX" lines into [(name, bytes)], skipping blanks."""
+    entries = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            match = _LINE_PATTERN.match(line)
+            if not match:
+                print(f"  Skipping invalid line: {line[:50]}...")
+                continue
+            entries.append((match.group(1).strip(), bytes.fromhex(match.group(2)[2:])))
+    return entries
+
+def write_compressed(path: str, entries: list, optimal: bool = False) -> list:
+    """
+    Compress [(name, bytes)] and write them to `path` in the format
+    updateAssetsHex.py reads. Returns [(name, original_size, compressed_size)].
+    """
+    compress = flz_compress_optimal if optimal else flz_compress
+    lines = []
+    sizes = []
+    for name, data in entries:
+        compressed = compress(data)
+        lines.append(f"{name}: 0x{compressed.hex()}")
+        sizes.append((name, len(data), len(compressed)))
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+    return sizes
+
+def ratio(original: int, compressed: int) -> str:
+    return f"{(1 - compressed / original) * 100:.2f}" if original else "0.00"
+
+# ============================================================================
+# VERIFICATION
+# ============================================================================
+
+def verify_entry(data: bytes) -> list:
+    """
+    Problems found checking one deployed compressed blob: the greedy encoder
+    must reproduce it byte for byte and the optimal parse must round-trip.
+    """
+    try:
+        raw = flz_decompress(data)
+    except Exception as e:
+        return [f"deployed blob does not decompress ({e})"]
+    problems = []
+    greedy = flz_compress(raw)
+    if greedy != data:
+        problems.append(f"flz_compress differs from the deployed bytes ({len(greedy)} vs {len(data)})")
+    if flz_decompress(greedy) != raw:
+        problems.append("flz_compress does not round-trip")
+    if flz_decompress(flz_compress_optimal(raw)) != raw:
+        problems.append("flz_compress_optimal does not round-trip")
+    return problems
+
+def verify_script(path=ASSETS_SCRIPT_PATH) -> int:
+    """Check every compressed Asset entry of AddAssetsBatch.s.sol; returns the number of failures."""
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    failures = checked = 0
+    for key, name, hex_data in _ASSET_PATTERN.findall(source):
+        if int(key) >= COMPRESSED_KEY_LIMIT:
+            continue
+        checked += 1
+        problems = verify_entry(bytes.fromhex(hex_data))
+        if problems:
+            failures += 1
+            for problem in problems:
+                print(f"  ⊗ {key} {name}: {problem}")
+        else:
+            print(f"  ✓ {key} {name}: {len(hex_data) // 2:,} bytes")
+    if not checked:
+        print(f"  ⊗ no compressed Asset entries found in {path}")
+        return 1
+    return failures
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="LibZip-compatible FastLZ compressor for RetroPunks assets.")
+    parser.add_argument("files", nargs="*", help="asset files to compress (default: output/*_asset.txt)")
+    parser.add_argument("--optimal", action="store_true",
+                        help="minimum-size parse instead of LibZip's greedy matcher (slower)")
+    parser.add_argument("--verify", action="store_true",
+                        help="check both encoders against the trait blobs in script/AddAssetsBatch.s.sol")
+    args = parser.parse_args()
+
+    if args.verify:
+        print("=" * 70)
+        print("FastLZ Verification against AddAssetsBatch.s.sol")
+        print("=" * 70)
+        failures = verify_script()
+        print("=" * 70)
+        print(f"⊗ {failures} entr{'y' if failures == 1 else 'ies'} failed" if failures else "✓ All entries match")
+        print("=" * 70)
+        sys.exit(1 if failures else 0)
+
+    print("=" * 70)
+    print("FastLZ Asset Compressor (LibZip-compatible)")
+    if args.optimal:
+        print("Optimal parsing: sizes reported against the greedy encoder")
+    print("=" * 70)
+
+    if args.files:
+        files = args.files
+    else:
+        if not os.path.isdir(OUTPUT_DIR):
+            print("\nNo output directory found.")
+            return
+        files = [os.path.join(OUTPUT_DIR, f) for f in sorted(os.listdir(OUTPUT_DIR)) if f.endswith(ASSET_SUFFIX)]
+
+    if not files:
+        print("\nNo asset files found in output directory.")
+        return
+
+    grand_original = grand_compressed = grand_greedy = 0
+    for path in files:
+        print(f"\nProcessing: {path}")
+        print("-" * 60)
+        entries = read_asset_lines(path)
+        if not entries:
+            continue
+
+        out_path = compressed_path(path)
+        sizes = write_compressed(out_path, entries, optimal=args.optimal)
+        for (name, original, compressed), (_, data) in zip(sizes, entries):
+            line = f"  {name}: {original:,} -> {compressed:,} bytes ({ratio(original, compressed)}% reduction)"
+            if args.optimal:
+                greedy = len(flz_compress(data))
+                grand_greedy += greedy
+                line += f", {greedy - compressed:,} saved vs greedy"
+            print(line)
+            grand_original += original
+            grand_compressed += compressed
+        print(f"  Written to: {out_path}")
+
+    print("\n" + "=" * 70)
+    print("COMPRESSION SUMMARY")
+    print("=" * 70)
+    print(f"Total Original:   {grand_original:,} bytes")
+    print(f"Total Compressed: {grand_compressed:,} bytes")
+    print(f"Overall Savings:  {grand_original - grand_compressed:,} bytes")
+    print(f"Compression:      {ratio(grand_original, grand_compressed)}%")
+    if args.optimal:
+        print(f"Saved vs Greedy:  {grand_greedy - grand_compressed:,} bytes")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
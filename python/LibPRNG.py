@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Python Port of Solady's LibPRNG (src/libraries/LibPRNG.sol)
+
+Only the parts the RetroPunks contracts use: the PRNG and the LazyShuffler
+behind RetroPunks' tokenIdSeed assignment. Every value matches the EVM
+bit-for-bit, so on-chain randomness can be replayed offline.
+
+keccak256 comes from pycryptodome (pip install pycryptodome); hashlib's
+sha3_256 is the final SHA-3, which pads differently and does not match the EVM.
+"""
+
+from array import array
+
+try:
+    from Crypto.Hash import keccak
+except ImportError as e:
+    raise ImportError("LibPRNG needs pycryptodome for keccak256 (pip install pycryptodome)") from e
+
+UINT256_MOD = 1 << 256
+
+def keccak256(data: bytes) -> bytes:
+    return keccak.new(digest_bits=256, data=data).digest()
+
+def keccak_uint(data: bytes) -> int:
+    """uint256(keccak256(data))"""
+    return int.from_bytes(keccak256(data), 'big')
+
+class PRNG:
+    """LibPRNG.PRNG: a single 32-byte state word advanced by keccak256."""
+
+    __slots__ = ("state",)
+
+    def __init__(self, state: int = 0):
+        self.state = state
+
+    def seed(self, state: int):
+        self.state = state
+
+    def next(self) -> int:
+        """state = keccak256(state); return state"""
+        self.state = keccak_uint(self.state.to_bytes(32, 'big'))
+        return self.state
+
+    def uniform(self, upper: int) -> int:
+        """Uniform in [0, upper), rejection-sampled exactly like LibPRNG.uniform."""
+        threshold = (UINT256_MOD - upper) % upper
+        while True:
+            result = self.next()
+            if result >= threshold:
+                return result % upper
+
+class LazyShuffleFinished(Exception):
+    """LibPRNG.LazyShuffleFinished: every element has been drawn."""
+
+class LazyShuffler:
+    """
+    LibPRNG.LazyShuffler: a Fisher-Yates shuffle of [0, length) advanced one
+    step per next(). The on-chain version keeps only swapped slots in storage;
+    here the permutation is a flat array, so memory is O(length).
+    """
+
+    __slots__ = ("length", "num_shuffled", "_permutation")
+
+    def __init__(self, length: int):
+        if not 0 < length < 0xFFFFFFFF:
+            raise ValueError("lazy shuffler length must be in [1, 2**32 - 1)")
+        self.length = length
+        self.num_shuffled = 0
+        self._permutation = array('I', range(length))
+
+    def next(self, randomness: int) -> int:
+        """Swap a random unshuffled slot into position num_shuffled and return its value."""
+        shuffled = self.num_shuffled
+        remainder = self.length - shuffled
+        if remainder == 0:
+            raise LazyShuffleFinished()
+        index = keccak_uint(randomness.to_bytes(32, 'big') + shuffled.to_bytes(32, 'big')) % remainder + shuffled
+        perm = self._permutation
+        chosen = perm[index]
+        perm[index] = perm[shuffled]
+        perm[shuffled] = chosen
+        self.num_shuffled = shuffled + 1
+        return chosen
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+NumPy Pixel Rasterizer for RetroPunks
+
+Draws tokens straight from the decoded trait runs into a 48x48 RGBA array,
+with no SVG and no browser or cairosvg in between, then upscales with
+nearest neighbour for thumbnails. The two styles follow SVGRenderer:
+
+  STYLE_RECT  PathSVGRenderer.sol (what Renderer.sol ships): RGBA palettes,
+              48x48 runs, fully transparent runs skipped, translucent runs
+              blended source-over like overlapping SVG rects
+  STYLE_PATH  PathSVGRenderer2.sol: RGB palettes (always opaque), 24x24
+              logical runs scaled by unit=2, or unit=1 for LAYER_FULLRES and
+              LAYER_RECTS_FULLRES; rect and LAYER_VARIANT layers go through
+              TraitsDecoder.decode_layer_runs
+
+Every (group, trait) layer is rasterized once by slice assignment, one
+slice per run, and cached as flat pixel indices plus colors. A token is then
+one fancy-index store per layer on a copy of its cached background.
+
+Backgrounds: solid colors fill the canvas; image backgrounds are a layer.
+Gradients are sampled at the 48x48 pixel centres the way the SVG
+<linearGradient>/<radialGradient> maps over its 48x48 rect: vertical,
+horizontal, down (top-left to bottom-right) and up (bottom-left to
+top-right) for both the S_ and P_ types, which render identically in the
+SVG, and radial from the centre with radius 24. Pre-rendered specials
+(asset keys 101-107) are the uploaded PNG.
+
+PNGs are encoded here rather than through PIL: a token has well under 256
+colors, so it is written as an indexed PNG whose scanlines filter to zeros
+wherever the upscale repeated a row or a color run, which zlib compresses
+almost for free.
+
+Usage:
+  python3 PixelRasterizer.py --global-seed N (--metadata FILE | --shuffler-seed N | --supply 10000)
+                             [--size 480] [--format png|npz] [--compress-level 1] [--limit N]
+  (writes output/thumbnails/<tokenId>.png, or output/token_pixels.npz with
+   token_id and 48x48 RGBA pixels arrays)
+"""
+
+import argparse
+import io
+import os
+import struct
+import time
+import zlib
+import numpy as np
+from PIL import Image
+from SVGRenderer import (
+    BG_P_DOWN, BG_P_HORIZONTAL, BG_P_UP, BG_P_VERTICAL, BG_RADIAL, BG_S_DOWN, BG_S_HORIZONTAL, BG_S_UP,
+    BG_S_VERTICAL, STYLE_PATH, STYLE_RECT,
+)
+from TokenURIExport import SPECIAL_ASSET_OFFSET, add_token_source_arguments, load_script_assets, load_tokens
+from TraitsDecoder import (
+    BACKGROUND_GROUP_INDEX, BG_IMAGE, BG_SOLID, LAYER_FULLRES, LAYER_RECTS_FULLRES, decode_layer_runs, decode_rle,
+    palette_index, resolve_variant,
+)
+from TraitsGenerator import NUM_PRE_RENDERED_SPECIALS, TraitSelectionFailed, generate_traits_context
+
+OUTPUT_DIR = "output"
+THUMBNAILS_DIRNAME = "thumbnails"
+PIXELS_FILENAME = "token_pixels.npz"
+
+CANVAS = 48
+DEFAULT_SIZE = 480
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+PNG_COLOR_INDEXED = 3
+PNG_COLOR_RGBA = 6
+PNG_FILTER_SUB = 1
+PNG_FILTER_UP = 2
+
+_FULLRES_LAYERS = (LAYER_FULLRES, LAYER_RECTS_FULLRES)
+
+# Pixel-centre coordinates over the canvas, in [0, 1]
+_CENTRES = (np.arange(CANVAS) + 0.5) / CANVAS
+_X, _Y = np.meshgrid(_CENTRES, _CENTRES)
+
+# Gradient position t in [0, 1] per pixel for each linear background type
+_GRADIENT_T = {
+    BG_S_VERTICAL: _Y, BG_P_VERTICAL: _Y,
+    BG_S_HORIZONTAL: _X, BG_P_HORIZONTAL: _X,
+    BG_S_DOWN: (_X + _Y) / 2, BG_P_DOWN: (_X + _Y) / 2,
+    BG_S_UP: (_X + 1 - _Y) / 2, BG_P_UP: (_X + 1 - _Y) / 2,
+    BG_RADIAL: np.minimum(np.hypot(_X - 0.5, _Y - 0.5) / 0.5, 1.0),
+}
+
+def rgba_bytes(rgba: int, opaque: bool = False) -> tuple:
+    """0xRRGGBBAA -> (r, g, b, a); opaque forces a = 0xFF, as the RGB-only path style does."""
+    return (rgba >> 24) & 0xFF, (rgba >> 16) & 0xFF, (rgba >> 8) & 0xFF, 0xFF if opaque else rgba & 0xFF
+
+# ============================================================================
+# LAYERS
+# ============================================================================
+
+class RasterLayer:
+    """A rasterized layer as flat canvas indices: opaque pixels are stored, translucent ones blended."""
+
+    __slots__ = ("opaque_index", "opaque_rgba", "blend_index", "blend_rgba")
+
+    def __init__(self, pixels: np.ndarray):
+        flat = pixels.reshape(-1, 4)
+        alpha = flat[:, 3]
+        self.opaque_index = np.flatnonzero(alpha == 0xFF)
+        self.opaque_rgba = flat[self.opaque_index]
+        self.blend_index = np.flatnonzero((alpha > 0) & (alpha < 0xFF))
+        self.blend_rgba = flat[self.blend_index].astype(np.float64)
+
+    def draw(self, canvas: np.ndarray):
+        """Composite onto a (CANVAS * CANVAS, 4) uint8 canvas in place, source-over."""
+        canvas[self.opaque_index] = self.opaque_rgba
+        if len(self.blend_index):
+            dst = canvas[self.blend_index].astype(np.float64)
+            src_a = self.blend_rgba[:, 3:] / 255
+            dst_a = dst[:, 3:] / 255
+            out_a = src_a + dst_a * (1 - src_a)
+            rgb = (self.blend_rgba[:, :3] * src_a + dst[:, :3] * dst_a * (1 - src_a)) / np.maximum(out_a, 1e-9)
+            canvas[self.blend_index, :3] = np.rint(rgb)
+            canvas[self.blend_index, 3:] = np.rint(out_a * 255)
+
+# ============================================================================
+# RASTERIZER
+# ============================================================================
+
+class PixelRasterizer:
+    """Rasterizes tokens from a {E_TraitsGroup: TraitGroup} map (see TraitsDecoder)."""
+
+    def __init__(self, groups: dict, style: str = STYLE_RECT, raw_assets: dict = None):
+        if style not in (STYLE_RECT, STYLE_PATH):
+            raise ValueError(f"unknown style: {style}")
+        self.groups = groups
+        self.style = style
+        self.raw_assets = raw_assets or {}
+        self._layers = {}
+        self._backgrounds = {}
+        self._specials = {}
+
+    def render(self, traits_to_render: list, background: int) -> np.ndarray:
+        """(48, 48, 4) uint8 RGBA: background group, then every non-background layer and its filler."""
+        canvas = self.background(background).copy()
+        flat = canvas.reshape(-1, 4)
+        for t in traits_to_render:
+            if t.trait_group == BACKGROUND_GROUP_INDEX:
+                continue
+            self.layer(t.trait_group, t.trait_index).draw(flat)
+            if t.filler is not None:
+                self.layer(*t.filler).draw(flat)
+        return canvas
+
+    def render_context(self, ctx) -> np.ndarray:
+        """A TraitsContext as tokenURI draws it, pre-rendered specials included."""
+        if 0 < ctx.special_id <= NUM_PRE_RENDERED_SPECIALS:
+            return self.special(ctx.special_id)
+        return self.render(ctx.traits_to_render, ctx.background)
+
+    def layer(self, group_index: int, trait_index: int) -> RasterLayer:
+        """One trait rasterized and cached."""
+        key = (group_index, trait_index)
+        layer = self._layers.get(key)
+        if layer is None:
+            layer = RasterLayer(self._rasterize(self.groups[group_index], self.groups[group_index].traits[trait_index]))
+            self._layers[key] = layer
+        return layer
+
+    def background(self, background: int) -> np.ndarray:
+        """The E_Background canvas, cached; never modified in place."""
+        canvas = self._backgrounds.get(background)
+        if canvas is None:
+            canvas = self._render_background(background)
+            canvas.flags.writeable = False
+            self._backgrounds[background] = canvas
+        return canvas
+
+    def special(self, special_id: int) -> np.ndarray:
+        """A pre-rendered special's uploaded PNG as RGBA."""
+        pixels = self._specials.get(special_id)
+        if pixels is None:
+            image = Image.open(io.BytesIO(self.raw_assets[special_id + SPECIAL_ASSET_OFFSET])).convert("RGBA")
+            if image.size != (CANVAS, CANVAS):
+                image = image.resize((CANVAS, CANVAS), Image.NEAREST)
+            pixels = np.asarray(image)
+            self._specials[special_id] = pixels
+        return pixels.copy()
+
+    # ────────────────────────────── Trait layers ──────────────────────────────
+
+    def _rasterize(self, group, trait) -> np.ndarray:
+        pixels = np.zeros((CANVAS, CANVAS, 4), dtype=np.uint8)
+        if len(trait.trait_data) == 0:
+            return pixels
+        if self.style == STYLE_RECT:
+            runs, unit = decode_rle(trait.trait_data, group.palette_index_byte_size), 1
+        else:
+            source, _ = resolve_variant(group, trait)
+            runs, unit = decode_layer_runs(group, trait), 1 if source.layer_type in _FULLRES_LAYERS else 2
+
+        opaque = self.style == STYLE_PATH
+        palette = group.palette_rgba
+        for y, x, width, idx in zip(runs.ys, runs.xs, runs.lengths, runs.palette_indices):
+            if idx >= len(palette):
+                raise IndexError(f"palette index {idx} out of range")
+            rgba = palette[idx]
+            if not opaque and rgba & 0xFF == 0:
+                continue
+            pixels[y * unit:(y + 1) * unit, x * unit:(x + width) * unit] = rgba_bytes(rgba, opaque)
+        return pixels
+
+    # ─────────────────────────────── Background ───────────────────────────────
+
+    def _render_background(self, background: int) -> np.ndarray:
+        canvas = np.zeros((CANVAS, CANVAS, 4), dtype=np.uint8)
+        group = self.groups[BACKGROUND_GROUP_INDEX]
+        trait = group.traits[background]
+        bg = trait.layer_type
+        opaque = self.style == STYLE_PATH
+
+        if bg == BG_SOLID:
+            canvas[:] = rgba_bytes(group.palette_rgba[palette_index(group, trait, 0)], opaque)
+        elif bg == BG_IMAGE:
+            self.layer(BACKGROUND_GROUP_INDEX, background).draw(canvas.reshape(-1, 4))
+        elif bg in _GRADIENT_T:
+            palette = group.palette_rgba
+            color1 = np.array(rgba_bytes(palette[palette_index(group, trait, 0)], opaque), dtype=np.float64)
+            color2 = np.array(rgba_bytes(palette[palette_index(group, trait, 1)], opaque), dtype=np.float64)
+            t = _GRADIENT_T[bg][..., None]
+            canvas[:] = np.rint(color1 + (color2 - color1) * t)
+        return canvas
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def upscale(pixels: np.ndarray, size: int) -> np.ndarray:
+    """Nearest-neighbour resize of a square (n, n, 4) array to (size, size, 4)."""
+    n = pixels.shape[0]
+    if size % n == 0:
+        scale = size // n
+        return np.repeat(np.repeat(pixels, scale, axis=0), scale, axis=1)
+    index = np.arange(size) * n // size
+    return pixels[index[:, None], index[None, :]]
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+def _png_scanlines(rows: np.ndarray, bytes_per_pixel: int) -> bytes:
+    """
+    Filtered PNG scanlines: Up (all zeros) for a row repeating the one above,
+    which is most rows of a nearest-neighbour upscale, Sub otherwise, so runs
+    of one color also filter to zeros.
+    """
+    height, width = rows.shape
+    raw = np.empty((height, width + 1), dtype=np.uint8)
+    raw[:, 0] = PNG_FILTER_SUB
+    raw[:, 1:bytes_per_pixel + 1] = rows[:, :bytes_per_pixel]
+    np.subtract(rows[:, bytes_per_pixel:], rows[:, :-bytes_per_pixel], out=raw[:, bytes_per_pixel + 1:])
+    repeated = np.flatnonzero((rows[1:] == rows[:-1]).all(axis=1)) + 1
+    raw[repeated, 0] = PNG_FILTER_UP
+    raw[repeated, 1:] = 0
+    return raw.tobytes()
+
+def encode_png(pixels: np.ndarray, size: int = None, compress_level: int = 1) -> bytes:
+    """
+    (n, n, 4) RGBA -> PNG bytes, nearest-neighbour upscaled to size x size.
+    Tokens use far fewer than 256 colors, so the PNG is indexed (PLTE, plus
+    tRNS for alpha) and the upscale runs on one byte per pixel; anything with
+    more colors is written as 8-bit RGBA.
+    """
+    n = pixels.shape[0]
+    size = size or n
+    colors, inverse = np.unique(np.ascontiguousarray(pixels).view(">u4").reshape(-1), return_inverse=True)
+    if len(colors) <= 256:
+        indices = upscale(inverse.astype(np.uint8).reshape(n, n, 1), size)
+        palette = colors.astype(">u4").view(np.uint8).reshape(-1, 4)
+        header = struct.pack(">IIBBBBB", size, size, 8, PNG_COLOR_INDEXED, 0, 0, 0)
+        chunks = [_png_chunk(b"IHDR", header), _png_chunk(b"PLTE", palette[:, :3].tobytes())]
+        if (palette[:, 3] != 0xFF).any():
+            chunks.append(_png_chunk(b"tRNS", palette[:, 3].tobytes()))
+        data = _png_scanlines(indices.reshape(size, size), 1)
+    else:
+        header = struct.pack(">IIBBBBB", size, size, 8, PNG_COLOR_RGBA, 0, 0, 0)
+        chunks = [_png_chunk(b"IHDR", header)]
+        data = _png_scanlines(upscale(pixels, size).reshape(size, size * 4), 4)
+    chunks += [_png_chunk(b"IDAT", zlib.compress(data, compress_level)), _png_chunk(b"IEND", b"")]
+    return PNG_SIGNATURE + b"".join(chunks)
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Rasterize RetroPunks tokens to PNG thumbnails or pixel arrays.")
+    add_token_source_arguments(parser)
+    parser.add_argument("--size", type=int, default=DEFAULT_SIZE, help=f"PNG width and height (default: {DEFAULT_SIZE})")
+    parser.add_argument("--format", choices=("png", "npz"), default="png",
+                        help="one PNG per token, or every 48x48 array in one npz (default: png)")
+    parser.add_argument("--compress-level", type=int, default=1, choices=range(10), metavar="0-9",
+                        help="PNG zlib level; higher is smaller and slower (default: 1)")
+    parser.add_argument("--limit", type=int, default=None, help="only the first N tokens")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("RetroPunks Pixel Rasterizer")
+    print("=" * 70)
+
+    tokens = load_tokens(args, parser)
+    tokens = tokens[:args.limit]
+
+    groups, raw_assets = load_script_assets(args.assets)
+    rasterizer = PixelRasterizer(groups, STYLE_RECT, raw_assets)
+
+    out_dir = os.path.join(OUTPUT_DIR, THUMBNAILS_DIRNAME)
+    os.makedirs(out_dir if args.format == "png" else OUTPUT_DIR, exist_ok=True)
+    token_ids, stack = [], []
+    failed = 0
+    start = time.perf_counter()
+    for token_id, seed, background, _, _ in tokens:
+        try:
+            ctx = generate_traits_context(seed, background, args.global_seed)
+        except TraitSelectionFailed:
+            failed += 1
+            continue
+        pixels = rasterizer.render_context(ctx)
+        if args.format == "png":
+            with open(os.path.join(out_dir, f"{token_id}.png"), 'wb') as f:
+                f.write(encode_png(pixels, args.size, args.compress_level))
+        else:
+            token_ids.append(token_id)
+            stack.append(pixels)
+    if args.format == "npz":
+        out_file = os.path.join(OUTPUT_DIR, PIXELS_FILENAME)
+        pixels = np.stack(stack) if stack else np.zeros((0, CANVAS, CANVAS, 4), dtype=np.uint8)
+        np.savez(out_file, token_id=np.array(token_ids, dtype=np.uint32), pixels=pixels)
+    elapsed = time.perf_counter() - start
+
+    done = len(tokens) - failed
+    print(f"Tokens:   {done:,} in {elapsed:.1f}s ({done / max(elapsed, 1e-9):,.0f}/s, 1 core)"
+          + (f", {args.size}x{args.size} PNG" if args.format == "png" else ""))
+    if failed:
+        print(f"⊗ {failed} token(s) revert with TraitSelectionFailed")
+    print(f"Output written to: {out_dir if args.format == 'png' else out_file}")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Rarity Weight Table Compiler for RetroPunks
+
+Compiles a human-readable weights spec into the packed `bytes private
+constant` tables of src/Rarities.sol, after checking it against Enums.sol,
+the artwork folders and the totalWeight literals the select functions roll
+against. Each table is one uint16 big-endian weight per enum member, in enum
+order; the first value is the weight of member 0 (None), not a total.
+
+Spec (python/rarity_weights.json), one entry per constant:
+  "M_CHAIN": {
+    "enum": "E_Male_Chain",
+    "total": 10000,                 totalWeight passed to selectRandomTrait
+    "weights": {"None": 9000, "Chain_Amethyst": 250, ...}
+  }
+Members left out of "weights" get weight 0. A constant shorter than its enum
+keeps its length unless the spec weights a member past its end.
+
+Checks (any error blocks --write unless --force):
+  - every weight names a member of its enum and fits in a uint16
+  - the enum matches its artwork folder: None, then one member per PNG in
+    sorted filename order (spaces become "_", a leading digit gets "_")
+  - the weights sum to "total", and "total" is what Rarities.sol rolls
+    against; a shortfall reverts with TraitSelectionFailed
+  - the constant in Rarities.sol has one weight per enum member
+
+Each table is also emitted as a cumulative array (running uint16 sums), so
+the linear scan in selectRandomTrait can become a binary search. The gas
+report compares both layouts per selection: expected loop iterations under
+the table's own distribution times an opcode-count estimate per iteration.
+The estimates are only a guide; measure on anvil before switching.
+
+Usage:
+  python3 RarityCompiler.py --extract            (write the spec from the current Rarities.sol)
+  python3 RarityCompiler.py [SPEC] [--write] [--force]
+  (writes output/rarity_constants.sol, output/rarity_cumulative.sol and
+   output/reports/rarity_gas_report.txt; --write patches the constants in src/Rarities.sol)
+"""
+
+import argparse
+import json
+import os
+import re
+from pathlib import Path
+from RarityDistribution import REVERT, weights_distribution
+from TraitsGenerator import ENUMS, RARITIES_PATH, TOTALS, WEIGHTS
+
+ROOT = Path(__file__).resolve().parents[1]
+SPEC_PATH = Path(__file__).resolve().parent / "rarity_weights.json"
+ARTWORK_DIR = ROOT / "artwork"
+
+OUTPUT_DIR = "output"
+REPORTS_DIR = os.path.join(OUTPUT_DIR, "reports")
+CONSTANTS_FILENAME = "rarity_constants.sol"
+CUMULATIVE_FILENAME = "rarity_cumulative.sol"
+GAS_REPORT_FILENAME = "rarity_gas_report.txt"
+
+UINT16_MAX = 0xFFFF
+
+# Opcode-count estimates per loop iteration (condition, body, increment)
+LINEAR_ITERATION_GAS = 90
+BINARY_ITERATION_GAS = 110
+SELECT_OVERHEAD_GAS = 120
+
+_CONSTANT_PATTERN = r"(bytes\s+private\s+constant\s+{name}\s*=\s*hex\")([0-9A-Fa-f]*)(\")"
+
+# ============================================================================
+# SPEC
+# ============================================================================
+
+def enum_for_table(table: str) -> str:
+    """M_FACE_B -> E_Male_Face, F_EYEWEAR -> E_Female_Eye_Wear, MOUTH_C -> E_Mouth."""
+    if table.startswith("MOUTH_"):
+        return "E_Mouth"
+    sex, slot = ("Male", table[2:]) if table.startswith("M_") else ("Female", table[2:])
+    slot = re.sub(r"^(FACE|FACIAL_HAIR)_[A-Z]$", r"\1", slot).replace("EYEWEAR", "EYE_WEAR")
+    return f"E_{sex}_" + "_".join(word.title() for word in slot.split("_"))
+
+def extract_spec() -> dict:
+    """The spec that reproduces the current Rarities.sol tables."""
+    spec = {}
+    for table, weights in WEIGHTS.items():
+        enum_name = enum_for_table(table)
+        members = ENUMS[enum_name]
+        spec[table] = {
+            "enum": enum_name,
+            "total": TOTALS[table],
+            "weights": {members[i]: w for i, w in enumerate(weights) if i < len(members)},
+        }
+    return spec
+
+def compile_table(entry: dict) -> list:
+    """Weights in enum order, one per member."""
+    members = ENUMS[entry["enum"]]
+    return [entry["weights"].get(member, 0) for member in members]
+
+def current_weights(table: str, length: int) -> list:
+    """The Rarities.sol constant zero-padded to `length`, or None if it is not declared."""
+    current = WEIGHTS.get(table)
+    return None if current is None else list(current) + [0] * (length - len(current))
+
+def keep_current_length(table: str, weights: list) -> list:
+    """
+    Cut a compiled table back to its Rarities.sol length when the extra
+    entries are all zero: a short constant and trailing zero weights draw the
+    same members, so an unchanged spec compiles to the bytes already deployed.
+    """
+    current = WEIGHTS.get(table)
+    if current is not None and len(current) < len(weights) and not any(weights[len(current):]):
+        return weights[:len(current)]
+    return weights
+
+def pack(weights: list) -> str:
+    return "".join(f"{w:04X}" for w in weights)
+
+def cumulative(weights: list) -> list:
+    running, out = 0, []
+    for w in weights:
+        running += w
+        out.append(running)
+    return out
+
+# ============================================================================
+# VALIDATION
+# ============================================================================
+
+def artwork_members(enum_name: str) -> list:
+    """Enum members implied by the artwork folder, or None if there is no folder."""
+    folder = ARTWORK_DIR / enum_name[2:].replace("_", " ")
+    if not folder.is_dir():
+        return None
+    names = [f[:-4].replace(" ", "_") for f in sorted(os.listdir(folder)) if f.endswith(".png")]
+    return ["None"] + ["_" + n if n[0].isdigit() else n for n in names]
+
+def validate(spec: dict) -> tuple:
+    """(errors, warnings) as lists of strings."""
+    errors, warnings = [], []
+    for table, entry in spec.items():
+        enum_name = entry.get("enum")
+        if enum_name not in ENUMS:
+            errors.append(f"{table}: unknown enum {enum_name!r}")
+            continue
+        members = ENUMS[enum_name]
+
+        unknown = [name for name in entry["weights"] if name not in members]
+        if unknown:
+            errors.append(f"{table}: not in {enum_name}: {', '.join(unknown)}")
+        bad = [f"{name}={w}" for name, w in entry["weights"].items() if not 0 <= w <= UINT16_MAX]
+        if bad:
+            errors.append(f"{table}: weights outside uint16: {', '.join(bad)}")
+
+        art = artwork_members(enum_name)
+        if art is None:
+            warnings.append(f"{table}: no artwork folder for {enum_name}")
+        elif art != members:
+            missing = sorted(set(members) - set(art))
+            extra = sorted(set(art) - set(members))
+            detail = f"missing art {missing}, not in enum {extra}" if missing or extra else "order differs"
+            errors.append(f"{table}: {enum_name} does not match its artwork folder ({detail})")
+
+        weights = compile_table(entry)
+        total = entry["total"]
+        if sum(weights) != total:
+            errors.append(f"{table}: weights sum to {sum(weights)} but total is {total}; "
+                          f"{abs(total - sum(weights))}/{total} of rolls "
+                          + ("revert with TraitSelectionFailed" if sum(weights) < total else "can never land"))
+        if total > UINT16_MAX:
+            errors.append(f"{table}: total {total} does not fit the uint16 cumulative layout")
+        if table in TOTALS and TOTALS[table] != total:
+            errors.append(f"{table}: Rarities.sol rolls against {TOTALS[table]}, spec says {total}")
+        elif table not in TOTALS:
+            warnings.append(f"{table}: not rolled anywhere in Rarities.sol")
+
+        current = WEIGHTS.get(table)
+        if current is not None and len(current) != len(members):
+            warnings.append(f"{table}: Rarities.sol has {len(current)} weights for {len(members)} "
+                            f"{enum_name} members; the last {len(members) - len(current)} can never be drawn")
+    return errors, warnings
+
+# ============================================================================
+# GAS
+# ============================================================================
+
+def _binary_iterations(n: int, target: int) -> int:
+    """Loop iterations of a lower-bound binary search over n cumulative entries ending at target."""
+    lo, hi, steps = 0, n, 0
+    while lo < hi:
+        mid = (lo + hi) // 2
+        steps += 1
+        if target <= mid:
+            hi = mid
+        else:
+            lo = mid + 1
+    return steps
+
+def gas_comparison(table: str, weights: list, total: int) -> dict:
+    """Expected selection gas for the linear scan and for binary search over the cumulative array."""
+    dist = weights_distribution(weights, total)
+    n = len(weights)
+    linear = sum(float(p) * (n if i == REVERT else i + 1) for i, p in dist.items())
+    binary = sum(float(p) * _binary_iterations(n, n if i == REVERT else i) for i, p in dist.items())
+    return {
+        "table": table,
+        "entries": n,
+        "linear_iterations": linear,
+        "binary_iterations": binary,
+        "linear_gas": SELECT_OVERHEAD_GAS + linear * LINEAR_ITERATION_GAS,
+        "binary_gas": SELECT_OVERHEAD_GAS + binary * BINARY_ITERATION_GAS,
+    }
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def _constant_line(name: str, hex_data: str) -> str:
+    return f'    bytes private constant {name} = hex"{hex_data}";'
+
+def write_constants(compiled: dict) -> str:
+    out_file = os.path.join(OUTPUT_DIR, CONSTANTS_FILENAME)
+    with open(out_file, 'w') as f:
+        f.write("\n".join(_constant_line(t, pack(w)) for t, w in compiled.items()) + "\n")
+    return out_file
+
+_BINARY_SEARCH = '''
+    /// @dev Drop-in for selectRandomTrait over a *_CUM table: first index whose running sum exceeds the roll.
+    function selectRandomTraitCumulative(LibPRNG.PRNG memory prng, bytes memory cumulative, uint256 totalWeight) internal pure returns (uint256 idx) {
+        uint256 r = LibPRNG.uniform(prng, totalWeight);
+        uint256 n = cumulative.length >> 1;
+        uint256 hi = n;
+        assembly {
+            let base := add(cumulative, 32)
+            for { } lt(idx, hi) { } {
+                let mid := shr(1, add(idx, hi))
+                switch lt(r, shr(240, mload(add(base, shl(1, mid)))))
+                case 1 { hi := mid }
+                default { idx := add(mid, 1) }
+            }
+        }
+        if (idx == n) {
+            revert TraitSelectionFailed();
+        }
+    }
+'''
+
+def write_cumulative(compiled: dict) -> str:
+    out_file = os.path.join(OUTPUT_DIR, CUMULATIVE_FILENAME)
+    lines = [_constant_line(f"{t}_CUM", pack(cumulative(w))) for t, w in compiled.items()]
+    with open(out_file, 'w') as f:
+        f.write("\n".join(lines) + "\n" + _BINARY_SEARCH)
+    return out_file
+
+def write_gas_report(rows: list) -> str:
+    lines = [f"{'Table':<18} {'N':>4} {'Linear it':>10} {'Binary it':>10} {'Linear gas':>11} {'Binary gas':>11} {'Delta':>8}"]
+    for r in rows:
+        lines.append(f"{r['table']:<18} {r['entries']:>4} {r['linear_iterations']:>10.2f} {r['binary_iterations']:>10.2f} "
+                     f"{r['linear_gas']:>11.0f} {r['binary_gas']:>11.0f} {r['binary_gas'] - r['linear_gas']:>+8.0f}")
+    lines.append("")
+    lines.append(f"Per-iteration estimates: linear {LINEAR_ITERATION_GAS}, binary {BINARY_ITERATION_GAS}, "
+                 f"fixed {SELECT_OVERHEAD_GAS} gas")
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    out_file = os.path.join(REPORTS_DIR, GAS_REPORT_FILENAME)
+    with open(out_file, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+    return out_file
+
+def patch_rarities(compiled: dict, path=RARITIES_PATH) -> list:
+    """Rewrite the hex of every compiled constant in Rarities.sol; returns the names that changed."""
+    source = Path(path).read_text()
+    changed = []
+    for table, weights in compiled.items():
+        pattern = re.compile(_CONSTANT_PATTERN.format(name=re.escape(table)))
+        match = pattern.search(source)
+        if match is None:
+            raise ValueError(f"{table} is not declared in {path}")
+        if match.group(2).upper() != pack(weights):
+            source = source[:match.start(2)] + pack(weights) + source[match.end(2):]
+            changed.append(table)
+    Path(path).write_text(source)
+    return changed
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile and validate the Rarities.sol weight tables.")
+    parser.add_argument("spec", nargs="?", default=str(SPEC_PATH), help=f"weights spec (default: {SPEC_PATH.name})")
+    parser.add_argument("--extract", action="store_true", help="write the spec from the current Rarities.sol")
+    parser.add_argument("--write", action="store_true", help="patch the compiled constants into src/Rarities.sol")
+    parser.add_argument("--force", action="store_true", help="write even if validation fails")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("Rarity Weight Table Compiler")
+    print("=" * 70)
+
+    if args.extract:
+        with open(args.spec, 'w') as f:
+            json.dump(extract_spec(), f, indent=2)
+            f.write("\n")
+        print(f"Spec extracted from {RARITIES_PATH.name} to: {args.spec}")
+        print("=" * 70)
+        return
+
+    with open(args.spec) as f:
+        spec = json.load(f)
+    errors, warnings = validate(spec)
+    compiled = {table: keep_current_length(table, compile_table(entry))
+                for table, entry in spec.items() if entry.get("enum") in ENUMS}
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    constants_file = write_constants(compiled)
+    cumulative_file = write_cumulative(compiled)
+    rows = [gas_comparison(t, w, spec[t]["total"]) for t, w in compiled.items()]
+    report_file = write_gas_report(rows)
+
+    differs = [t for t, w in compiled.items()
+               if current_weights(t, len(ENUMS[spec[t]["enum"]])) != compile_table(spec[t])]
+    for message in warnings:
+        print(f"  ⚠ {message}")
+    for message in errors:
+        print(f"  ⊗ {message}")
+    print(f"Tables:   {len(compiled)} ({len(errors)} errors, {len(warnings)} warnings)")
+    print(f"Changed:  {', '.join(differs) if differs else 'none'} (vs {RARITIES_PATH.name})")
+    cheaper = [r["table"] for r in rows if r["binary_gas"] < r["linear_gas"]]
+    print(f"Binary search estimated cheaper for: {', '.join(cheaper) if cheaper else 'none'}")
+
+    if args.write:
+        if errors and not args.force:
+            print(f"⊗ Not writing {RARITIES_PATH.name}: fix the errors above or pass --force")
+        else:
+            changed = patch_rarities(compiled)
+            print(f"✓ Patched {len(changed)} constant(s) in {RARITIES_PATH}")
+
+    print("=" * 70)
+    print(f"Constants written to:  {constants_file}")
+    print(f"Cumulative tables:     {cumulative_file}")
+    print(f"Gas report written to: {report_file}")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
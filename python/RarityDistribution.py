@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+Exact Rarity Distribution for RetroPunks
+
+Propagates the Rarities.sol weight tables through the selection logic
+analytically, so published rarity tables follow any weight change instantly
+and without sampling. Weights and the totalWeight each table is rolled
+against are parsed from src/Rarities.sol (see TraitsGenerator); the branching
+mirrors TraitsGenerator._select_male / _select_female.
+
+Every LibPRNG.uniform roll is exactly uniform, so given (sex, skin) each slot
+is an independent categorical distribution. A token is a mixture over
+(sex, skin) branches; probabilities are exact Fractions.
+
+Two kinds of attribute are reported:
+
+  selected   a TraitsContext enum field as drawn (male_mask, mouth, ...),
+             including values TraitLogic hides
+  rendered   a trait group as it appears in the tokenURI attributes, i.e.
+             traitsToRender: masks under facial hair, mouths under masks,
+             hair under headwear and hat hair without headwear are absent
+
+Rolls that run past the end of a table (M_HAIR sums to 9554 of 9579) revert
+with TraitSelectionFailed; those tokens have no metadata, so every
+probability is conditioned on the token not reverting and the revert rate is
+reported separately. Specials (tokenIdSeed < NUM_SPECIAL_1S) are fixed and
+only enter the expected counts.
+
+Usage:
+  python3 RarityDistribution.py [--supply 10000] [--joint ATTR ATTR]
+  (writes output/rarity_distribution.csv; --joint also writes
+   output/rarity_joint.csv for two attributes, e.g. Male_Facial_Hair_Group Mouth_Group)
+"""
+
+import argparse
+import csv
+import math
+import os
+import time
+from collections import defaultdict
+from fractions import Fraction
+from itertools import product
+from TraitsGenerator import (
+    DEFAULT_SUPPLY, ENUMS, F, FIELD_ENUMS, M, NUM_SPECIAL_1S, SEX_FEMALE, SEX_MALE, TOTALS, WEIGHTS, _human,
+    enum_index,
+)
+
+OUTPUT_DIR = "output"
+DISTRIBUTION_FILENAME = "rarity_distribution.csv"
+JOINT_FILENAME = "rarity_joint.csv"
+
+REVERT = "TraitSelectionFailed"
+MALE_SHARE = Fraction(7000, 10000)          # generateTraitsContext: uniform(10000) < 7000
+
+# ============================================================================
+# SLOT DISTRIBUTIONS
+# ============================================================================
+
+def table_distribution(table: str) -> dict:
+    """{index: P} for selectRandomTrait over a Rarities.sol table; any uncovered roll maps to REVERT."""
+    return weights_distribution(WEIGHTS[table], TOTALS[table])
+
+def weights_distribution(weights: tuple, total: int) -> dict:
+    """{index: P} for selectRandomTrait(prng, weights, total)."""
+    dist = {}
+    cumulative = 0
+    for idx, weight in enumerate(weights):
+        covered = min(cumulative + weight, total) - min(cumulative, total)
+        if covered > 0:
+            dist[idx] = Fraction(covered, total)
+        cumulative += weight
+    if cumulative < total:
+        dist[REVERT] = Fraction(total - cumulative, total)
+    return dist
+
+def _with_none(table: str, excluded: bool, none_weight: int) -> dict:
+    """_select_with_none: a None pre-roll against table total + none_weight, then the table."""
+    if excluded:
+        return {0: Fraction(1)}
+    p_none = Fraction(none_weight, TOTALS[table] + none_weight)
+    dist = {k: (1 - p_none) * p for k, p in table_distribution(table).items()}
+    dist[0] = dist.get(0, 0) + p_none
+    return dist
+
+def _ghost_eyes(enum_name: str) -> dict:
+    half = Fraction(5000, 10000)
+    return {enum_index(enum_name, "Ghost_Left"): half, enum_index(enum_name, "Ghost_Right"): 1 - half}
+
+def male_fields(skin: int) -> dict:
+    """Per-field distributions for a male of the given skin, as _select_male."""
+    human, zombie, ghost = _human(skin, M), skin == M.ZOMBIE, skin == M.GHOST
+    if human or zombie:
+        face = table_distribution("M_FACE_A")
+    elif skin in (M.APE, M.YETI, M.ZOMBIE_APE):
+        face = table_distribution("M_FACE_B")
+    elif skin in (M.ALIEN, M.DEMON, M.GHOST, M.GLITCH, M.GOBLIN, M.PUMPKIN, M.SKELETON, M.VAMPIRE):
+        face = table_distribution("M_FACE_C")
+    else:
+        face = {0: Fraction(1)}
+
+    if not human and not zombie and not ghost:
+        facial_hair = {0: Fraction(1)}
+    elif ghost:
+        facial_hair = table_distribution("M_FACIAL_HAIR_A")
+    else:
+        facial_hair = table_distribution("M_FACIAL_HAIR_B")
+
+    no_hair = skin in (M.ROBOT, M.MUMMY, M.VAMPIRE)
+    return {
+        "male_skin": {skin: Fraction(1)},
+        "male_eyes": _ghost_eyes("E_Male_Eyes") if ghost else table_distribution("M_EYES"),
+        "male_face": face,
+        "male_chain": table_distribution("M_CHAIN"),
+        "male_earring": table_distribution("M_EARRING"),
+        "male_facial_hair": facial_hair,
+        "male_mask": table_distribution("M_MASK"),
+        "male_scarf": table_distribution("M_SCARF"),
+        "male_hair": _with_none("M_HAIR", no_hair, 400 if human or zombie else 1200),
+        "male_hat_hair": _with_none("M_HAT_HAIR", no_hair, 400 if human or zombie else 800),
+        "male_headwear": table_distribution("M_HEADWEAR"),
+        "male_eye_wear": table_distribution("M_EYEWEAR"),
+        # selectMouth runs before facial hair is stored, so males always use MOUTH_C
+        "mouth": table_distribution("MOUTH_C"),
+    }
+
+def female_fields(skin: int) -> dict:
+    """Per-field distributions for a female of the given skin, as _select_female."""
+    human, zombie = _human(skin, F), skin == F.ZOMBIE
+    if human or zombie:
+        face = table_distribution("F_FACE_A")
+    elif skin in (F.APE, F.ZOMBIE_APE):
+        face = table_distribution("F_FACE_B")
+    elif skin in (F.ALIEN, F.DEMON, F.GHOST, F.GLITCH, F.GOBLIN, F.SKELETON, F.VAMPIRE):
+        face = table_distribution("F_FACE_C")
+    else:
+        face = {0: Fraction(1)}
+
+    no_hair = skin in (F.ROBOT, F.MUMMY, F.VAMPIRE)
+    return {
+        "female_skin": {skin: Fraction(1)},
+        "female_eyes": _ghost_eyes("E_Female_Eyes") if skin == F.GHOST else table_distribution("F_EYES"),
+        "female_face": face,
+        "female_chain": table_distribution("F_CHAIN"),
+        "female_earring": table_distribution("F_EARRING"),
+        "female_mask": table_distribution("F_MASK"),
+        "female_scarf": table_distribution("F_SCARF"),
+        "female_hair": _with_none("F_HAIR", no_hair, 400 if human or zombie else 1200),
+        "female_hat_hair": _with_none("F_HAT_HAIR", no_hair, 400 if human or zombie else 1200),
+        "female_headwear": table_distribution("F_HEADWEAR"),
+        "female_eye_wear": table_distribution("F_EYEWEAR"),
+        "mouth": table_distribution("MOUTH_A"),
+    }
+
+# ============================================================================
+# BRANCHES
+# ============================================================================
+
+def _as_integers(dist: dict) -> tuple:
+    """{value: Fraction} as ({value: numerator}, common denominator)."""
+    den = math.lcm(*(p.denominator for p in dist.values()))
+    return {k: p.numerator * (den // p.denominator) for k, p in dist.items()}, den
+
+class Branch:
+    """
+    One (sex, skin) mixture component: its probability and per-field
+    distributions, each held as integer numerators over a common denominator.
+    """
+
+    __slots__ = ("sex", "skin", "weight", "fields")
+
+    def __init__(self, sex: int, skin: int, weight: Fraction, fields: dict):
+        self.sex = sex
+        self.skin = skin
+        self.weight = weight
+        self.fields = fields
+
+def branches() -> tuple:
+    """
+    ([Branch], revert probability). Branch weights and field distributions are
+    conditioned on the token not reverting.
+    """
+    result = []
+    revert = Fraction(0)
+    for sex, share, table, fields_for in ((SEX_MALE, MALE_SHARE, "M_SKIN", male_fields),
+                                          (SEX_FEMALE, 1 - MALE_SHARE, "F_SKIN", female_fields)):
+        skins = table_distribution(table)
+        revert += share * skins.pop(REVERT, 0)
+        for skin, p_skin in skins.items():
+            fields = fields_for(skin)
+            survive = Fraction(1)
+            for name, dist in fields.items():
+                p_revert = dist.pop(REVERT, 0)
+                if p_revert:
+                    survive *= 1 - p_revert
+                    fields[name] = {k: p / (1 - p_revert) for k, p in dist.items()}
+            revert += share * p_skin * (1 - survive)
+            fields = {name: _as_integers(dist) for name, dist in fields.items()}
+            result.append(Branch(sex, skin, share * p_skin * survive, fields))
+
+    for branch in result:
+        branch.weight /= 1 - revert
+    return result, revert
+
+# ============================================================================
+# ATTRIBUTES
+# ============================================================================
+
+def _nonzero(v: int) -> bool:
+    return v != 0
+
+def _present(v: int):
+    return v if v != 0 else None
+
+class Attribute:
+    """
+    A value derived from a few context fields. `deps` pairs each field with a
+    projection (None = the value itself); `fn` receives the projected values.
+    Branches of the other sex see the attribute as None.
+    """
+
+    __slots__ = ("name", "enum_name", "sex", "deps", "fn")
+
+    def __init__(self, name: str, enum_name: str, sex, deps: tuple, fn):
+        self.name = name
+        self.enum_name = enum_name
+        self.sex = sex
+        self.deps = deps
+        self.fn = fn
+
+def _selected_attributes() -> list:
+    attrs = [Attribute("sex", "E_Sex", None, (), None)]
+    for field, enum_name in FIELD_ENUMS.items():
+        if field in ("sex", "background"):
+            continue
+        sex = SEX_MALE if field.startswith("male_") else SEX_FEMALE if field.startswith("female_") else None
+        attrs.append(Attribute(field, enum_name, sex, ((field, None),), lambda v: v))
+    return attrs
+
+def _rendered_attributes() -> list:
+    attrs = []
+    for sex, prefix in ((SEX_MALE, "male"), (SEX_FEMALE, "female")):
+        group = prefix.title()
+
+        def simple(part, enum_part):
+            return Attribute(f"{group}_{part}_Group", f"E_{group}_{enum_part}", sex,
+                             ((f"{prefix}_{part.lower()}", None),), _present)
+
+        attrs.append(Attribute(f"{group}_Skin_Group", f"E_{group}_Skin", sex,
+                               ((f"{prefix}_skin", None),), lambda v: v))
+        attrs.extend(simple(p, p) for p in ("Eyes", "Face", "Chain", "Earring", "Scarf"))
+        attrs.append(simple("Eye_Wear", "Eye_Wear"))
+        attrs.append(simple("Headwear", "Headwear"))
+        attrs.append(Attribute(f"{group}_Hat_Hair_Group", f"E_{group}_Hat_Hair", sex,
+                               ((f"{prefix}_headwear", _nonzero), (f"{prefix}_hat_hair", None)),
+                               lambda hw, hh: _present(hh) if hw else None))
+        attrs.append(Attribute(f"{group}_Hair_Group", f"E_{group}_Hair", sex,
+                               ((f"{prefix}_headwear", _nonzero), (f"{prefix}_hair", None)),
+                               lambda hw, h: None if hw else _present(h)))
+
+    attrs.append(Attribute("Male_Facial_Hair_Group", "E_Male_Facial_Hair", SEX_MALE,
+                           (("male_facial_hair", None),), _present))
+    attrs.append(Attribute("Male_Mask_Group", "E_Male_Mask", SEX_MALE,
+                           (("male_facial_hair", _nonzero), ("male_mask", None)),
+                           lambda fh, mask: None if fh else _present(mask)))
+    attrs.append(Attribute("Female_Mask_Group", "E_Female_Mask", SEX_FEMALE,
+                           (("female_mask", None),), _present))
+    attrs.append(Attribute("Mouth_Group", "E_Mouth", None,
+                           (("male_mask", _nonzero), ("female_mask", _nonzero), ("mouth", None)),
+                           lambda male_mask, female_mask, mouth: None if male_mask or female_mask else _present(mouth)))
+    return attrs
+
+SELECTED = _selected_attributes()
+RENDERED = _rendered_attributes()
+ATTRIBUTES = {a.name: a for a in SELECTED + RENDERED}
+
+_CERTAIN = ({0: 1}, 1)
+
+def _projected(branch: Branch, field: str, projections: list) -> dict:
+    """A field's numerators grouped by what every projection in `projections` sees."""
+    nums, _ = branch.fields.get(field, _CERTAIN)
+    grouped = defaultdict(int)
+    for value, n in nums.items():
+        grouped[tuple(value if proj is None else proj(value) for proj in projections)] += n
+    return grouped
+
+def joint(attrs: list, all_branches: list) -> dict:
+    """
+    Exact {(value, ...): P} for one or more attributes over every branch.
+    Each branch is summed in integers over its own denominator; branches are
+    then brought to their least common denominator, so no Fraction arithmetic
+    runs in the inner loop.
+    """
+    terms = []
+    for branch in all_branches:
+        active = [a for a in attrs if a.sex in (None, branch.sex)]
+
+        fields = {}
+        for a in active:
+            for field, proj in a.deps:
+                fields.setdefault(field, []).append(proj)
+        names = list(fields)
+        projected = [_projected(branch, name, fields[name]) for name in names]
+        den = branch.weight.denominator * math.prod(branch.fields.get(name, _CERTAIN)[1] for name in names)
+
+        local = defaultdict(int)
+        for combo in product(*(d.items() for d in projected)):
+            n = math.prod(q for _, q in combo)
+            seen = {name: iter(values) for name, (values, _) in zip(names, combo)}
+            key = []
+            for a in attrs:
+                if a.name == "sex":
+                    key.append(branch.sex)
+                elif a not in active:
+                    key.append(None)
+                else:
+                    key.append(a.fn(*(next(seen[field]) for field, _ in a.deps)))
+            local[tuple(key)] += n
+        terms.append((den, branch.weight.numerator, local))
+
+    common = math.lcm(*(den for den, _, _ in terms))
+    result = defaultdict(int)
+    for den, weight, local in terms:
+        scale = weight * (common // den)
+        for key, n in local.items():
+            result[key] += n * scale
+    return {key: Fraction(n, common) for key, n in result.items()}
+
+def value_name(attr: Attribute, value) -> str:
+    if value is None:
+        return "(none)"
+    return ENUMS[attr.enum_name][value]
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def write_distribution(all_branches: list, valid_tokens: Fraction) -> tuple:
+    """Marginals of every attribute; returns (file, rows)."""
+    rows = []
+    for kind, attrs in (("selected", SELECTED), ("rendered", RENDERED)):
+        for attr in attrs:
+            marginal = joint([attr], all_branches)
+            for (value,), p in sorted(marginal.items(), key=lambda kv: -kv[1]):
+                rows.append({
+                    "kind": kind,
+                    "attribute": attr.name,
+                    "value": value_name(attr, value),
+                    "probability": f"{float(p):.10f}",
+                    "fraction": str(p),
+                    "expected_count": f"{float(p * valid_tokens):.3f}",
+                })
+
+    out_file = os.path.join(OUTPUT_DIR, DISTRIBUTION_FILENAME)
+    with open(out_file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    return out_file, rows
+
+def write_joint(attrs: list, table: dict) -> str:
+    out_file = os.path.join(OUTPUT_DIR, JOINT_FILENAME)
+    with open(out_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow([a.name for a in attrs] + ["probability", "fraction"])
+        for key, p in sorted(table.items(), key=lambda kv: -kv[1]):
+            writer.writerow([value_name(a, v) for a, v in zip(attrs, key)] + [f"{float(p):.10f}", str(p)])
+    return out_file
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact RetroPunks trait probabilities from Rarities.sol.")
+    parser.add_argument("--supply", type=int, default=DEFAULT_SUPPLY,
+                        help=f"collection size for expected counts (default: {DEFAULT_SUPPLY})")
+    parser.add_argument("--joint", nargs=2, metavar="ATTR", choices=sorted(ATTRIBUTES),
+                        help="also write the exact joint distribution of two attributes")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("Exact Rarity Distribution (Rarities.sol)")
+    print("=" * 70)
+
+    start = time.perf_counter()
+    all_branches, revert = branches()
+    random_tokens = max(args.supply - NUM_SPECIAL_1S, 0)
+    valid_tokens = random_tokens * (1 - revert)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    out_file, rows = write_distribution(all_branches, valid_tokens)
+    elapsed = time.perf_counter() - start
+
+    print(f"Branches:  {len(all_branches)} (sex, skin)")
+    print(f"Reverts:   {float(revert):.6%} of random tokens ({float(revert * random_tokens):.2f} expected "
+          f"in {random_tokens:,}) [{revert}]")
+    print(f"Rows:      {len(rows)} ({sum(1 for r in rows if r['kind'] == 'rendered')} rendered)")
+    print(f"Time:      {elapsed * 1000:.0f} ms")
+    print(f"Distribution written to: {out_file}")
+
+    if args.joint:
+        attrs = [ATTRIBUTES[name] for name in args.joint]
+        table = joint(attrs, all_branches)
+        joint_file = write_joint(attrs, table)
+        print(f"Joint ({len(table)} cells) written to: {joint_file}")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
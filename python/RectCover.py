@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Minimum Rectangle Partition for RetroPunks Trait Layers
+
+Finds the fewest axis-aligned rectangles that exactly tile each color of a
+trait grid (24x24 logical from load_png_logical, or 48x48 full-res). This is
+the exact optimum for the rect layer format (Traits.py --rects optimal); the
+greedy mode only stacks identical runs, which is far from optimal on
+staircases and blobs.
+
+Method (classic rectilinear polygon partition, per color):
+  1. Every concave lattice vertex (3 of its 4 cells filled) needs one cut,
+     extending one of its two boundary edges into the region.
+  2. A "chord" is a horizontal or vertical segment joining two concave
+     vertices through the interior; one chord resolves two vertices at once.
+  3. The largest set of pairwise non-touching chords is a maximum independent
+     set in the bipartite horizontal/vertical intersection graph, found with a
+     maximum matching (Konig's theorem).
+  4. The chosen chords are cut, every still-unresolved concave vertex gets a
+     horizontal cut to the nearest boundary or cut, and the resulting pieces
+     are the rectangles.
+Regions whose parts touch only at a corner are split there for free, so the
+result is still a valid partition and at worst marginally above the optimum.
+
+Usage:
+  python3 RectCover.py [GROUP ...]
+  (compares runs, greedy rects and optimal rects for every trait in BASE_DIR;
+   writes output/reports/rect_cover_report.txt)
+"""
+
+import argparse
+import os
+import time
+import numpy as np
+
+OUTPUT_DIR = "output"
+REPORTS_DIR = os.path.join(OUTPUT_DIR, "reports")
+REPORT_FILENAME = "rect_cover_report.txt"
+
+# ============================================================================
+# PARTITION
+# ============================================================================
+
+class _Region:
+    """A boolean cell mask plus the cut edges added to it so far."""
+
+    def __init__(self, mask: np.ndarray):
+        self.mask = mask
+        self.height, self.width = mask.shape
+        self.hcuts = set()   # (x, py): edge on line y=py spanning cell column x
+        self.vcuts = set()   # (px, y): edge on line x=px spanning cell row y
+
+    def h_interior(self, x: int, py: int) -> bool:
+        return 0 < py < self.height and 0 <= x < self.width \
+            and self.mask[py - 1, x] and self.mask[py, x]
+
+    def v_interior(self, px: int, y: int) -> bool:
+        return 0 < px < self.width and 0 <= y < self.height \
+            and self.mask[y, px - 1] and self.mask[y, px]
+
+    def walk_h(self, px: int, py: int, step: int) -> int:
+        """Follow interior edges along y=py from (px, py); return the x where they end."""
+        while self.h_interior(px if step > 0 else px - 1, py):
+            px += step
+        return px
+
+    def walk_v(self, px: int, py: int, step: int) -> int:
+        while self.v_interior(px, py if step > 0 else py - 1):
+            py += step
+        return py
+
+def _concave_vertices(mask: np.ndarray) -> dict:
+    """
+    Map each concave lattice vertex (px, py) to its extension directions
+    (dx, dy): the horizontal and vertical ways its boundary edges continue
+    into the region.
+    """
+    padded = np.pad(mask, 1)
+    tl, tr = padded[:-1, :-1], padded[:-1, 1:]
+    bl, br = padded[1:, :-1], padded[1:, 1:]
+    filled = tl.astype(np.uint8) + tr + bl + br
+
+    vertices = {}
+    for py, px in zip(*np.nonzero(filled == 3)):
+        missing_left = not (tl[py, px] and bl[py, px])
+        missing_top = not (tl[py, px] and tr[py, px])
+        vertices[(int(px), int(py))] = (1 if missing_left else -1, 1 if missing_top else -1)
+    return vertices
+
+def _find_chords(region: _Region, vertices: dict) -> tuple:
+    """Horizontal chords (py, x1, x2) and vertical chords (px, y1, y2) between concave vertices."""
+    h_chords, v_chords = [], []
+    for (px, py), (dx, dy) in vertices.items():
+        if dx > 0:
+            end = region.walk_h(px, py, 1)
+            if vertices.get((end, py), (0, 0))[0] < 0:
+                h_chords.append((py, px, end))
+        if dy > 0:
+            end = region.walk_v(px, py, 1)
+            if vertices.get((px, end), (0, 0))[1] < 0:
+                v_chords.append((px, py, end))
+    return h_chords, v_chords
+
+def _max_independent_chords(h_chords: list, v_chords: list) -> tuple:
+    """Largest non-touching chord subset via maximum bipartite matching and Konig's theorem."""
+    adjacency = [
+        [j for j, (vx, y1, y2) in enumerate(v_chords) if x1 <= vx <= x2 and y1 <= hy <= y2]
+        for hy, x1, x2 in h_chords
+    ]
+    match_v = [-1] * len(v_chords)
+    match_h = [-1] * len(h_chords)
+
+    def augment(i: int, seen: list) -> bool:
+        for j in adjacency[i]:
+            if not seen[j]:
+                seen[j] = True
+                if match_v[j] < 0 or augment(match_v[j], seen):
+                    match_v[j], match_h[i] = i, j
+                    return True
+        return False
+
+    for i in range(len(h_chords)):
+        augment(i, [False] * len(v_chords))
+
+    # Konig: walk alternating paths from unmatched horizontal chords. Reached
+    # horizontals and unreached verticals form the maximum independent set.
+    reached_h = [match_h[i] < 0 for i in range(len(h_chords))]
+    reached_v = [False] * len(v_chords)
+    stack = [i for i, r in enumerate(reached_h) if r]
+    while stack:
+        i = stack.pop()
+        for j in adjacency[i]:
+            if not reached_v[j]:
+                reached_v[j] = True
+                k = match_v[j]
+                if k >= 0 and not reached_h[k]:
+                    reached_h[k] = True
+                    stack.append(k)
+
+    return ([c for c, r in zip(h_chords, reached_h) if r],
+            [c for c, r in zip(v_chords, reached_v) if not r])
+
+def _is_resolved(region: _Region, px: int, py: int, dx: int, dy: int) -> bool:
+    h_edge = (px if dx > 0 else px - 1, py)
+    v_edge = (px, py if dy > 0 else py - 1)
+    return h_edge in region.hcuts or v_edge in region.vcuts
+
+def _extend_cut(region: _Region, px: int, py: int, dx: int):
+    """Cut horizontally from a concave vertex until a boundary or an existing cut."""
+    while True:
+        x = px if dx > 0 else px - 1
+        if not region.h_interior(x, py) or (x, py) in region.hcuts:
+            return
+        region.hcuts.add((x, py))
+        px += dx
+        if (px, py - 1) in region.vcuts or (px, py) in region.vcuts:
+            return
+
+def _extract_rects(region: _Region) -> list:
+    """Read the rectangles off a fully cut region, top-left corners in row-major order."""
+    mask = region.mask
+    taken = np.zeros_like(mask)
+    rects = []
+    for y, x in zip(*np.nonzero(mask)):
+        y, x = int(y), int(x)
+        if taken[y, x]:
+            continue
+        w = 1
+        while x + w < region.width and mask[y, x + w] and not taken[y, x + w] \
+                and (x + w, y) not in region.vcuts:
+            w += 1
+        h = 1
+        while y + h < region.height and all(
+            mask[y + h, c] and not taken[y + h, c] and (c, y + h) not in region.hcuts
+            for c in range(x, x + w)
+        ):
+            h += 1
+        taken[y:y + h, x:x + w] = True
+        rects.append((x, y, w, h))
+    return rects
+
+def min_rect_partition(mask: np.ndarray) -> list:
+    """Partition the True cells of a 2D bool mask into the fewest (x, y, w, h) rectangles."""
+    region = _Region(np.asarray(mask, dtype=bool))
+    vertices = _concave_vertices(region.mask)
+
+    h_chords, v_chords = _max_independent_chords(*_find_chords(region, vertices))
+    for py, x1, x2 in h_chords:
+        region.hcuts.update((x, py) for x in range(x1, x2))
+    for px, y1, y2 in v_chords:
+        region.vcuts.update((px, y) for y in range(y1, y2))
+
+    for (px, py), (dx, dy) in sorted(vertices.items(), key=lambda v: (v[0][1], v[0][0])):
+        if not _is_resolved(region, px, py, dx, dy):
+            _extend_cut(region, px, py, dx)
+
+    return _extract_rects(region)
+
+def cover_grid(grid: np.ndarray) -> list:
+    """
+    Minimum rectangle partition of every opaque color in an RGBA grid.
+
+    Returns [x, y, w, h, color] lists (color is packed 0xRRGGBB), the same
+    shape as Traits.merge_runs_into_rects, so either can feed encode_rects.
+    """
+    g = grid.astype(np.uint32)
+    rgb = (g[..., 0] << 16) | (g[..., 1] << 8) | g[..., 2]
+    opaque = grid[..., 3] > 0
+
+    rects = []
+    for color in np.unique(rgb[opaque]).tolist():
+        rects.extend([x, y, w, h, color] for x, y, w, h in min_rect_partition(opaque & (rgb == color)))
+    rects.sort(key=lambda r: (r[1], r[0]))
+    return rects
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def compare_group(trait_dir: str) -> list:
+    """(trait_name, runs, greedy_rects, optimal_rects) for every PNG in a group folder."""
+    from Traits import (
+        FULL_RES_TRAITS, compute_bounds, find_runs, load_png_fullres, load_png_logical,
+        merge_runs_into_rects,
+    )
+    rows = []
+    for f in sorted(f for f in os.listdir(trait_dir) if f.endswith('.png')):
+        raw_name = os.path.splitext(f)[0]
+        load = load_png_fullres if raw_name in FULL_RES_TRAITS else load_png_logical
+        grid = load(os.path.join(trait_dir, f))
+        if not (grid[..., 3] > 0).any():
+            rows.append((raw_name, 0, 0, 0))
+            continue
+        runs = find_runs(grid, compute_bounds(grid))
+        rows.append((raw_name, len(runs[0]), len(merge_runs_into_rects(*runs)), len(cover_grid(grid))))
+    return rows
+
+def main():
+    from Traits import ENUM_ORDER, TRAITS_DIR, enum_to_display_name
+
+    parser = argparse.ArgumentParser(description="Compare run, greedy and optimal rect counts per trait.")
+    parser.add_argument("groups", nargs="*", metavar="GROUP", help="E_TraitsGroup names (default: all)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("Minimum Rectangle Partition — runs vs greedy vs optimal")
+    print("=" * 70)
+
+    lines = [f"{'Group':<24} {'Trait':<40} {'Runs':>6} {'Greedy':>6} {'Optimal':>7}"]
+    totals = [0, 0, 0]
+    start = time.perf_counter()
+    for enum_name in args.groups or ENUM_ORDER:
+        trait_dir = os.path.join(TRAITS_DIR, enum_to_display_name(enum_name))
+        if not os.path.isdir(trait_dir):
+            print(f"{enum_name}: ⊗ SKIPPED (not found)")
+            continue
+
+        rows = compare_group(trait_dir)
+        group_totals = [sum(r[i] for r in rows) for i in (1, 2, 3)]
+        totals = [a + b for a, b in zip(totals, group_totals)]
+        lines.extend(f"{enum_name:<24} {name:<40} {runs:>6} {greedy:>6} {optimal:>7}"
+                     for name, runs, greedy, optimal in rows if runs)
+        print(f"{enum_name:<24} runs {group_totals[0]:>6}  greedy {group_totals[1]:>6}  optimal {group_totals[2]:>6}")
+
+    lines.append(f"{'TOTAL':<24} {'':<40} {totals[0]:>6} {totals[1]:>6} {totals[2]:>7}")
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    report_file = os.path.join(REPORTS_DIR, REPORT_FILENAME)
+    with open(report_file, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+
+    runs, greedy, optimal = totals
+    print("=" * 70)
+    print(f"Runs:    {runs}")
+    print(f"Greedy:  {greedy} ({(runs - greedy) / max(runs, 1):.1%} fewer than runs)")
+    print(f"Optimal: {optimal} ({(runs - optimal) / max(runs, 1):.1%} fewer than runs)")
+    print(f"Time:    {time.perf_counter() - start:.1f}s")
+    print(f"Report written to: {report_file}")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Offline SVG Renderer for RetroPunks
+
+Reproduces PathSVGRenderer.renderToSvg byte-for-byte from local trait group
+blobs, with no chain or RPC involved. Two styles, matching the two on-chain
+libraries:
+
+  STYLE_RECT  src/libraries/PathSVGRenderer.sol   (RGBA palettes, 48x48 data)
+              one <rect x y width height="1"> per run, fill "#RRGGBB[AA]"
+              (alpha omitted when 0xFF), fully transparent runs skipped
+  STYLE_PATH  src/libraries/PathSVGRenderer2.sol  (RGB palettes, 24x24 data)
+              one <path fill="#RRGGBB" d="..."> per palette color, runs scaled
+              by unit=2, or unit=1 for LAYER_FULLRES (0xFF) layers; rect layers
+              (LAYER_RECTS 0xFE / LAYER_RECTS_FULLRES 0xFD) emit one subpath per rect;
+              LAYER_VARIANT (0xFC) layers draw another trait through a palette remap
+
+Every layer is deterministic per (group, trait), so its SVG fragment is built
+once and reused; a token render is then a join over cached fragments.
+
+Usage:
+  python3 SVGRenderer.py GROUP:TRAIT [GROUP:TRAIT ...] [--background N] [--style rect|path]
+  (layers are E_TraitsGroup:traitIndex pairs, in render order; SVG goes to stdout)
+"""
+
+import argparse
+import os
+from TraitsDecoder import (
+    BACKGROUND_GROUP_INDEX, BG_IMAGE, BG_SOLID, LAYER_FULLRES, LAYER_RECTS_FULLRES, RECT_LAYERS,
+    decode_rects, decode_rle, load_trait_groups, palette_index, resolve_variant,
+)
+from TraitsGenerator import TraitToRender
+
+OUTPUT_DIR = "output"
+
+STYLE_RECT = "rect"
+STYLE_PATH = "path"
+
+# E_Background_Type gradient members
+BG_S_VERTICAL, BG_P_VERTICAL = 3, 4
+BG_S_HORIZONTAL, BG_P_HORIZONTAL = 5, 6
+BG_S_DOWN, BG_P_DOWN = 7, 8
+BG_S_UP, BG_P_UP = 9, 10
+BG_RADIAL = 11
+
+SVG_HEADER = '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 48 48" shape-rendering="crispEdges">'
+
+# Linear gradient direction per background type: (x1, y1, x2, y2)
+_GRADIENT_DIRECTIONS = {
+    BG_S_VERTICAL: ("0%", "0%", "0%", "100%"),
+    BG_P_VERTICAL: ("0%", "0%", "0%", "100%"),
+    BG_S_HORIZONTAL: ("0%", "0%", "100%", "0%"),
+    BG_P_HORIZONTAL: ("0%", "0%", "100%", "0%"),
+    BG_S_DOWN: ("0%", "0%", "100%", "100%"),
+    BG_P_DOWN: ("0%", "0%", "100%", "100%"),
+    BG_S_UP: ("0%", "100%", "100%", "0%"),
+    BG_P_UP: ("0%", "100%", "100%", "0%"),
+}
+
+# ============================================================================
+# COLOR EMISSION
+# ============================================================================
+
+def rgba_color(rgba: int) -> str:
+    """PathSVGRenderer._emitRgbaColor: #RRGGBB, plus AA unless fully opaque."""
+    if rgba & 0xFF == 0xFF:
+        return f"#{rgba >> 8:06X}"
+    return f"#{rgba:08X}"
+
+def rgb_color(rgba: int) -> str:
+    """PathSVGRenderer2._emitRgbColor: always #RRGGBB."""
+    return f"#{rgba >> 8:06X}"
+
+# ============================================================================
+# RENDERER
+# ============================================================================
+
+class SVGRenderer:
+    """Renders tokens from a {E_TraitsGroup: TraitGroup} map (see TraitsDecoder)."""
+
+    def __init__(self, groups: dict, style: str = STYLE_PATH):
+        if style not in (STYLE_RECT, STYLE_PATH):
+            raise ValueError(f"unknown style: {style}")
+        self.groups = groups
+        self.style = style
+        self.emit_color = rgb_color if style == STYLE_PATH else rgba_color
+        self._layers = {}
+        self._backgrounds = {}
+
+    def render(self, traits_to_render: list, background: int) -> str:
+        """renderToSvg: background group, then every non-background layer and its filler."""
+        parts = [SVG_HEADER, '<g id="Background">', self.background(background), '</g><g id="Traits">']
+        for t in traits_to_render:
+            if t.trait_group == BACKGROUND_GROUP_INDEX:
+                continue
+            parts.append(self.layer(t.trait_group, t.trait_index))
+            if t.filler is not None:
+                parts.append(self.layer(*t.filler))
+        parts.append("</g></svg>")
+        return "".join(parts)
+
+    def layer(self, group_index: int, trait_index: int) -> str:
+        """_renderTraitLayer for one trait, cached."""
+        key = (group_index, trait_index)
+        svg = self._layers.get(key)
+        if svg is None:
+            group = self.groups[group_index]
+            trait = group.traits[trait_index]
+            if self.style == STYLE_PATH:
+                svg = self._render_path_layer(group, trait)
+            else:
+                svg = self._render_rect_layer(group, trait)
+            self._layers[key] = svg
+        return svg
+
+    def background(self, background: int) -> str:
+        """_renderBackground for one E_Background value, cached."""
+        svg = self._backgrounds.get(background)
+        if svg is None:
+            svg = self._render_background(background)
+            self._backgrounds[background] = svg
+        return svg
+
+    # ────────────────────────────── Trait layers ──────────────────────────────
+
+    def _render_rect_layer(self, group, trait) -> str:
+        if len(trait.trait_data) == 0:
+            return ""
+        palette = group.palette_rgba
+        runs = decode_rle(trait.trait_data, group.palette_index_byte_size)
+        parts = []
+        for y, x, width, idx in zip(runs.ys, runs.xs, runs.lengths, runs.palette_indices):
+            rgba = palette[idx]
+            if rgba & 0xFF:
+                parts.append(f'<rect x="{x}" y="{y}" width="{width}" height="1" fill="{rgba_color(rgba)}"/>')
+        return "".join(parts)
+
+    def _render_path_layer(self, group, trait) -> str:
+        if len(trait.trait_data) == 0:
+            return ""
+        trait, remap = resolve_variant(group, trait)
+        if len(trait.trait_data) == 0:
+            return ""
+        if trait.layer_type in RECT_LAYERS:
+            return self._render_rects_layer(group, trait, remap)
+        palette = group.palette_rgba
+        unit = 1 if trait.layer_type == LAYER_FULLRES else 2
+        runs = decode_rle(trait.trait_data, group.palette_index_byte_size)
+
+        # One path-command bucket per palette color, emitted in palette order
+        buckets = {}
+        for y, x, width, idx in zip(runs.ys, runs.xs, runs.lengths, runs.palette_indices):
+            if remap is not None:
+                idx = remap[idx]
+            if idx >= len(palette):
+                raise IndexError(f"palette index {idx} out of range")
+            w = width * unit
+            buckets.setdefault(idx, []).append(f"M{x * unit} {y * unit}h{w}v{unit}h-{w}z")
+
+        return "".join(
+            f'<path fill="{rgb_color(palette[idx])}" d="{"".join(buckets[idx])}"/>'
+            for idx in sorted(buckets)
+        )
+
+    def _render_rects_layer(self, group, trait, remap: dict = None) -> str:
+        """PathSVGRenderer._renderRectLayer: rects are stored grouped by color, in output order."""
+        palette = group.palette_rgba
+        unit = 1 if trait.layer_type == LAYER_RECTS_FULLRES else 2
+        rects = decode_rects(trait.trait_data, group.palette_index_byte_size)
+
+        parts = []
+        current = None
+        for x, y, w, h, idx in zip(rects.xs, rects.ys, rects.widths, rects.heights, rects.palette_indices):
+            if idx != current:
+                if current is not None:
+                    parts.append('"/>')
+                parts.append(f'<path fill="{rgb_color(palette[remap[idx] if remap is not None else idx])}" d="')
+                current = idx
+            parts.append(f"M{x * unit} {y * unit}h{w * unit}v{h * unit}h-{w * unit}z")
+        if current is not None:
+            parts.append('"/>')
+        return "".join(parts)
+
+    # ─────────────────────────────── Background ───────────────────────────────
+
+    def _render_background(self, background: int) -> str:
+        group = self.groups[BACKGROUND_GROUP_INDEX]
+        trait = group.traits[background]
+        bg = trait.layer_type
+
+        if bg == BG_SOLID:
+            color = group.palette_rgba[palette_index(group, trait, 0)]
+            return f'<rect width="48" height="48" fill="{self.emit_color(color)}"/>'
+        if bg == BG_IMAGE:
+            return self.layer(BACKGROUND_GROUP_INDEX, background)
+
+        if bg == BG_RADIAL:
+            color1, color2 = self._gradient_colors(group, trait)
+            return (
+                f'<defs><radialGradient id="rg"><stop offset="0%" stop-color="{color1}"/>'
+                f'<stop offset="100%" stop-color="{color2}"/></radialGradient></defs>'
+                '<rect width="48" height="48" fill="url(#rg)"/>'
+            )
+        if bg in _GRADIENT_DIRECTIONS:
+            color1, color2 = self._gradient_colors(group, trait)
+            x1, y1, x2, y2 = _GRADIENT_DIRECTIONS[bg]
+            return (
+                f'<defs><linearGradient id="lg" x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}">'
+                f'<stop offset="0%" stop-color="{color1}"/>'
+                f'<stop offset="100%" stop-color="{color2}"/></linearGradient></defs>'
+                '<rect width="48" height="48" fill="url(#lg)"/>'
+            )
+        return ""
+
+    def _gradient_colors(self, group, trait) -> tuple:
+        palette = group.palette_rgba
+        return (self.emit_color(palette[palette_index(group, trait, 0)]),
+                self.emit_color(palette[palette_index(group, trait, 1)]))
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def default_asset_files() -> list:
+    """The uncompressed asset files the encoders write to output/."""
+    names = ["background_asset.txt", "special_asset.txt", "traits_asset.txt"]
+    return [os.path.join(OUTPUT_DIR, n) for n in names if os.path.exists(os.path.join(OUTPUT_DIR, n))]
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline PathSVGRenderer for RetroPunks.")
+    parser.add_argument("layers", nargs="+", metavar="GROUP:TRAIT",
+                        help="E_TraitsGroup index and trait index, in render order")
+    parser.add_argument("--background", type=int, default=1, help="E_Background index (default: 1)")
+    parser.add_argument("--style", choices=(STYLE_RECT, STYLE_PATH), default=STYLE_PATH)
+    parser.add_argument("--assets", nargs="+", default=None, metavar="FILE",
+                        help="asset files to load (default: output/*_asset.txt)")
+    args = parser.parse_args()
+
+    groups = load_trait_groups(args.assets or default_asset_files())
+    renderer = SVGRenderer(groups, args.style)
+    layers = [TraitToRender(*map(int, spec.split(":"))) for spec in args.layers]
+    print(renderer.render(layers, args.background))
+
+if __name__ == '__main__':
+    main()
@@ -4,12 +4,15 @@
 Generates optimized 2D RLE data for direct SVG rect rendering
 Handles both pre-rendered (PNG) and dynamically rendered (2D RLE) specials
 """
+import argparse
 import os
 import struct
+import numpy as np
 from PIL import Image
-from collections import Counter
 from dotenv import load_dotenv
 from pathlib import Path
+from AssetCache import GroupCache
+from FastLZ import compressed_path, write_compressed
 
 load_dotenv()
 
@@ -63,7 +66,7 @@ def rgba_to_packed(r, g, b, a):
     return (r << 24) | (g << 16) | (b << 8) | a
 
 def load_png_as_rgba(filepath):
-    """Load PNG and return 2D pixel array."""
+    """Load PNG and return a uint32[H, W] array of packed 0xRRGGBBAA pixels."""
     if not os.path.exists(filepath):
         print(f"  Warning: File not found {filepath}")
         return None
@@ -72,40 +75,33 @@ def load_png_as_rgba(filepath):
     if img.size != (CANVAS_WIDTH, CANVAS_HEIGHT):
         img = img.resize((CANVAS_WIDTH, CANVAS_HEIGHT), Image.Resampling.NEAREST)
     
-    pixels = []
-    for y in range(CANVAS_HEIGHT):
-        row = []
-        for x in range(CANVAS_WIDTH):
-            r, g, b, a = img.getpixel((x, y))
-            row.append(0 if a == 0 else rgba_to_packed(r, g, b, a))
-        pixels.append(row)
+    rgba = np.asarray(img, dtype=np.uint32)
+    pixels = rgba_to_packed(rgba[..., 0], rgba[..., 1], rgba[..., 2], rgba[..., 3])
+    # Keep full transparency as 0
+    pixels[rgba[..., 3] == 0] = 0
     
     return pixels
 
 def compute_bounds(pixels):
     """Compute bounding box of non-transparent pixels."""
-    x1, y1, x2, y2 = CANVAS_WIDTH, CANVAS_HEIGHT, -1, -1
+    visible = (pixels & 0xFF) > 0  # alpha > 0
+    rows = np.flatnonzero(visible.any(axis=1))
+    if rows.size == 0:
+        return (0, 0, 0, 0)
+    cols = np.flatnonzero(visible.any(axis=0))
     
-    for y in range(CANVAS_HEIGHT):
-        for x in range(CANVAS_WIDTH):
-            color = pixels[y][x]
-            if (color & 0xFF) > 0:  # alpha > 0
-                x1 = min(x1, x)
-                y1 = min(y1, y)
-                x2 = max(x2, x)
-                y2 = max(y2, y)
-    
-    return (0, 0, 0, 0) if x2 == -1 else (x1, y1, x2, y2)
+    return (int(cols[0]), int(rows[0]), int(cols[-1]), int(rows[-1]))
 
 def build_palette(pixels_list):
     """Build color palette from all non-None pixel arrays."""
-    all_colors = []
-    for pixels in pixels_list:
-        if pixels:
-            for row in pixels:
-                all_colors.extend(row)
+    arrays = [pixels.reshape(-1) for pixels in pixels_list if pixels is not None]
+    if not arrays:
+        return []
+    all_colors = np.concatenate(arrays)
     
-    palette = [color for color, _ in Counter(all_colors).most_common()]
+    # Most common first; ties keep first-seen order
+    colors, first_seen, counts = np.unique(all_colors, return_index=True, return_counts=True)
+    palette = colors[np.lexsort((first_seen, -counts))].tolist()
     if len(palette) > 65535:
         raise ValueError("Too many colors in palette")
     
@@ -127,34 +123,30 @@ def encode_2d_rle(pixels, palette_map, bounds, p_size):
     if x1 > x2:
         return b""
     
+    # Run starts: left edge of each row plus every color change (vectorized)
+    window = pixels[y1:y2 + 1, x1:x2 + 1]
+    starts = np.ones(window.shape, dtype=bool)
+    starts[:, 1:] = window[:, 1:] != window[:, :-1]
+    
+    flat_starts = np.flatnonzero(starts)
+    lengths = np.diff(np.append(flat_starts, window.size))
+    ys, xs = np.divmod(flat_starts, window.shape[1])
+    colors = window.reshape(-1)[flat_starts]
+    
+    # Only store non-transparent runs
+    visible = (colors & 0xFF) > 0  # alpha > 0
+    
+    # Collect non-empty rows (runs are already in row-major order)
     rows_data = []
-    for y in range(y1, y2 + 1):
-        row_runs = []
-        x = x1
-        
-        while x <= x2:
-            color = pixels[y][x]
-            run_start = x
-            
-            # Find run length
-            while x <= x2 and pixels[y][x] == color:
-                x += 1
-            
-            run_length = x - run_start
-            
-            # Only store visible runs
-            if (color & 0xFF) > 0:
-                row_runs.append({
-                    'x': run_start,
-                    'length': run_length,
-                    'color': color
-                })
-        
-        if row_runs:
-            rows_data.append({
-                'y': y,
-                'runs': row_runs
-            })
+    for y, x, length, color in zip((ys[visible] + y1).tolist(), (xs[visible] + x1).tolist(),
+                                   lengths[visible].tolist(), colors[visible].tolist()):
+        if not rows_data or rows_data[-1]['y'] != y:
+            rows_data.append({'y': y, 'runs': []})
+        rows_data[-1]['runs'].append({
+            'x': x,
+            'length': length,
+            'color': color
+        })
     
     output = bytearray()
     output.append(len(rows_data))  # numRows
@@ -262,6 +254,21 @@ def encode_special_group():
     return bytes(output)
 
 def main():
+    parser = argparse.ArgumentParser(description="2D RLE asset encoder for RetroPunks Special 1s.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignore the content-hash build cache and re-encode the group")
+    parser.add_argument("--compress", action="store_true",
+                        help="also write a LibZip-compatible FastLZ blob to special_asset_compressed.txt")
+    args = parser.parse_args()
+    
+    cache = GroupCache("special_2drle", {
+        'CANVAS_SIZE': (CANVAS_WIDTH, CANVAS_HEIGHT),
+        'DEFAULT_LAYER_TYPE': DEFAULT_LAYER_TYPE,
+        'INCLUDE_NONE_TRAIT': INCLUDE_NONE_TRAIT,
+        'TRAIT_ORDER': TRAIT_ORDER,
+        'PRE_RENDERED_SPECIALS': PRE_RENDERED_SPECIALS,
+    }, __file__, enabled=not args.no_cache)
+    
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     
     print("=" * 70)
@@ -270,7 +277,16 @@ def main():
     print("=" * 70)
     print(f"Processing: {GROUP_NAME}")
     
-    data = encode_special_group()
+    # Pre-rendered specials are not read from disk, so only dynamic PNGs feed the key
+    key = cache.key(GROUP_NAME, [os.path.join(TRAITS_DIR, f"{name}.png")
+                                 for name in TRAIT_ORDER if name not in PRE_RENDERED_SPECIALS])
+    data = cache.load(key)
+    if data is not None:
+        print("  [Cached] Inputs unchanged, reusing stored blob")
+    else:
+        data = encode_special_group()
+        if data:
+            cache.store(key, data)
     
     if data:
         hex_string = "0x" + data.hex()
@@ -280,6 +296,10 @@ def main():
         print("=" * 70)
         print(f"✓ Success! Asset saved to: {final_path}")
         print(f"  Total size: {len(data)} bytes (no compression)")
+        if args.compress:
+            compressed_file = compressed_path(final_path)
+            (_, _, compressed_size), = write_compressed(compressed_file, [(GROUP_NAME, data)])
+            print(f"  Compressed: {compressed_size} bytes -> {compressed_file}")
         print("=" * 70)
     else:
         print("⊗ Failed: Check configuration or trait folder.")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Offline tokenId -> tokenIdSeed Mapping for RetroPunks
+
+Replays RetroPunks._saveNewSeed for every mint: the shuffler is initialized
+with the max supply when shufflerSeed is revealed, and each minted token takes
+
+  randomness  = keccak256(shufflerSeed, numShuffled)
+  tokenIdSeed = _tokenIdSeedShuffler.next(randomness)
+
+along with the default name "#<tokenId>" packed left-aligned into a bytes32.
+Token ids start at 1 and follow mint order.
+
+The mapping depends on how the supply was minted, not just on the seed:
+batchOwnerMint calls _addInternalMintMetadata for each recipient and then
+_safeMint, whose _mint override calls it again for the same token ids. Owner
+mints therefore draw two seeds per token and keep the second, and the first
+draw is lost for good. With enough owner mints the shuffler runs out before
+the supply does and the mint reverts with LazyShuffleFinished.
+
+Mint order is a comma-separated list of KIND:QUANTITY steps, in order:
+  public:N   SeaDrop mints (mintSeaDrop -> _safeMint), one draw per token
+  owner:N    one batchOwnerMint recipient entry, two draws per token
+
+Usage:
+  python3 TokenSeeds.py --shuffler-seed N [--max-supply 10000] [--mint-order public:10000]
+  (writes output/token_seeds.csv: token_id, token_id_seed, name, name_bytes32)
+"""
+
+import argparse
+import csv
+import os
+from LibPRNG import LazyShuffleFinished, LazyShuffler, keccak_uint
+from TraitsGenerator import DEFAULT_SUPPLY
+
+OUTPUT_DIR = "output"
+SEEDS_FILENAME = "token_seeds.csv"
+
+MINT_PUBLIC = "public"
+MINT_OWNER = "owner"
+_DRAWS_PER_TOKEN = {MINT_PUBLIC: 1, MINT_OWNER: 2}
+
+# ============================================================================
+# MAPPING
+# ============================================================================
+
+def default_name(token_id: int) -> bytes:
+    """_saveNewSeed's bytes32 name: "#<tokenId>" left-aligned, zero padded."""
+    return f"#{token_id}".encode().ljust(32, b"\0")
+
+def parse_mint_order(spec: str) -> list:
+    """"public:9000,owner:1000" -> [("public", 9000), ("owner", 1000)]."""
+    steps = []
+    for part in spec.split(","):
+        kind, _, quantity = part.strip().partition(":")
+        if kind not in _DRAWS_PER_TOKEN or not quantity.isdigit():
+            raise ValueError(f"bad mint step {part!r}: expected public:N or owner:N")
+        steps.append((kind, int(quantity)))
+    return steps
+
+def token_seeds(shuffler_seed: int, max_supply: int = DEFAULT_SUPPLY, mint_order: list = None):
+    """
+    Yield (tokenId, tokenIdSeed) in mint order. Raises ValueError past
+    max_supply (MintQuantityExceedsMaxSupply) and LazyShuffleFinished when
+    owner mints have used up the shuffler.
+    """
+    mint_order = mint_order if mint_order is not None else [(MINT_PUBLIC, max_supply)]
+    shuffler = LazyShuffler(max_supply)
+    seed_bytes = shuffler_seed.to_bytes(32, 'big')
+    minted = 0
+    for kind, quantity in mint_order:
+        if minted + quantity > max_supply:
+            raise ValueError(f"minting {quantity} after {minted} exceeds max supply {max_supply}")
+        for _ in range(_DRAWS_PER_TOKEN[kind]):
+            seeds = [shuffler.next(keccak_uint(seed_bytes + shuffler.num_shuffled.to_bytes(32, 'big')))
+                     for _ in range(quantity)]
+        for i, seed in enumerate(seeds):
+            yield minted + i + 1, seed
+        minted += quantity
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def add_mint_arguments(parser):
+    """--max-supply and --mint-order, shared by every CLI that replays the shuffler."""
+    parser.add_argument("--max-supply", type=int, default=DEFAULT_SUPPLY,
+                        help=f"constructor _maximumSupply, the shuffler length (default: {DEFAULT_SUPPLY})")
+    parser.add_argument("--mint-order", default=None, metavar="KIND:N,...",
+                        help="mint steps in order, e.g. owner:50,public:9950 (default: public:MAX_SUPPLY)")
+
+def mint_order_from_args(args, parser) -> list:
+    """The parsed --mint-order, or None for all public mints; a bad spec is a usage error."""
+    try:
+        return parse_mint_order(args.mint_order) if args.mint_order else None
+    except ValueError as e:
+        parser.error(str(e))
+
+def main():
+    parser = argparse.ArgumentParser(description="Predict RetroPunks tokenId -> tokenIdSeed offline from the shuffler seed.")
+    parser.add_argument("--shuffler-seed", type=lambda s: int(s, 0), required=True, help="revealed shufflerSeed")
+    add_mint_arguments(parser)
+    args = parser.parse_args()
+    mint_order = mint_order_from_args(args, parser)
+
+    print("=" * 70)
+    print("RetroPunks Token Seeds (offline lazy shuffler)")
+    print("=" * 70)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    output_file = os.path.join(OUTPUT_DIR, SEEDS_FILENAME)
+    minted = 0
+    with open(output_file, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(["token_id", "token_id_seed", "name", "name_bytes32"])
+        try:
+            for token_id, seed in token_seeds(args.shuffler_seed, args.max_supply, mint_order):
+                writer.writerow([token_id, seed, f"#{token_id}", "0x" + default_name(token_id).hex()])
+                minted += 1
+        except LazyShuffleFinished:
+            print(f"⊗ LazyShuffleFinished: the shuffler runs out after token #{minted}")
+        except ValueError as e:
+            print(f"⊗ {e}")
+
+    print(f"Tokens:   {minted:,} of {args.max_supply:,}")
+    print(f"Output written to: {output_file}")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Streaming tokenURI Dump Decoder for RetroPunks
+
+Turns a tokenUriBatch.txt dump (script/RetroPunks.s.sol batchQueryTokenURI,
+or TokenURIFetcher.py --format txt) into two outputs: the JSON metadata
+fields and the decoded SVG image, one record per token.
+
+The dump is read in fixed-size chunks into one reusable buffer; every
+data:application/json;base64 line is decoded straight from a view of that
+buffer, and the SVG is decoded from a view of the decoded JSON, so no line
+is copied before decoding and memory stays at about one chunk plus one token
+however large the dump is. Records are written as they are decoded.
+
+_generateDataURI concatenates name and bio into the JSON unescaped, so a
+customized name or bio containing a quote is not valid JSON. The fields are
+therefore split on the fixed layout RetroPunks writes:
+
+  {"name":"..","description":"..","attributes":[..],"image":"data:image/svg+xml;base64,.."}
+
+taking the last "attributes"/"image" keys, which always follow the
+user-controlled text.
+
+Output:
+  attributes  {"token_id", "name", "description", "attributes"}, or
+              {"token_id", "error"} for tokens that did not decode
+              (including the fetcher's "ERROR:" entries)
+  svgs        {"token_id", "svg"}
+  --format parquet writes the same fields as columns, attributes as a JSON
+  string (needs pyarrow)
+
+Usage:
+  python3 TokenURIDecoder.py [--input ../export/tokenUriBatch.txt] [--format ndjson|parquet]
+                             [--chunk-size 1048576] [--no-svg]
+  (writes output/token_attributes.<format> and output/token_svgs.<format>)
+"""
+
+import argparse
+import binascii
+import json
+import os
+import time
+from TraitsGenerator import ROOT
+
+DEFAULT_INPUT = ROOT / "export" / "tokenUriBatch.txt"
+
+OUTPUT_DIR = "output"
+ATTRIBUTES_BASENAME = "token_attributes"
+SVGS_BASENAME = "token_svgs"
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+PARQUET_ROWS_PER_GROUP = 1000
+
+TOKEN_PREFIX = b"Token "
+ERROR_PREFIX = b"ERROR: "
+JSON_URI_PREFIX = b"data:application/json;base64,"
+SVG_URI_PREFIX = b"data:image/svg+xml;base64,"
+
+# _generateDataURI's JSON layout
+_NAME_KEY = b'{"name":"'
+_DESCRIPTION_KEY = b'","description":"'
+_ATTRIBUTES_KEY = b'","attributes":['
+_IMAGE_KEY = b'],"image":"'
+_END = b'"}'
+
+class DecodeError(Exception):
+    pass
+
+# ============================================================================
+# STREAMING
+# ============================================================================
+
+def iter_lines(f, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    Yield every line of a binary file as a memoryview into one reused buffer,
+    without its line ending. A view is only valid until the next line is
+    requested. The buffer doubles when a single line outgrows it.
+    """
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    start = end = 0
+    eof = False
+    while True:
+        newline = buf.find(b"\n", start, end)
+        if newline >= 0:
+            line_end = newline - 1 if newline > start and buf[newline - 1] == 0x0D else newline
+            yield view[start:line_end]
+            start = newline + 1
+            continue
+        if eof:
+            if start < end:
+                yield view[start:end]
+            return
+        # Move the partial line to the front and refill behind it
+        pending = end - start
+        if pending == len(buf):
+            # Earlier views may still be held, so grow into a new buffer rather than resizing
+            grown = bytearray(2 * len(buf))
+            grown[:pending] = view
+            buf, view = grown, memoryview(grown)
+        elif start:
+            buf[:pending] = view[start:end]
+        start, end = 0, pending
+        read = f.readinto(view[end:])
+        eof = not read
+        end += read or 0
+
+def iter_token_uris(f, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """
+    (token_id, line) for each entry of a tokenUriBatch.txt dump: line is the
+    data URI view (or the fetcher's "ERROR: ..." line). Bare URI lines without
+    a "Token N:" header are numbered from 1 in file order.
+    """
+    token_id = None
+    next_id = 1
+    for line in iter_lines(f, chunk_size):
+        if not line:
+            continue
+        if line[:len(TOKEN_PREFIX)] == TOKEN_PREFIX and line[-1:] == b":":
+            token_id = int(bytes(line[len(TOKEN_PREFIX):-1]))
+            continue
+        if token_id is None:
+            token_id = next_id
+        yield token_id, line
+        next_id, token_id = token_id + 1, None
+
+# ============================================================================
+# DECODING
+# ============================================================================
+
+def split_metadata(data: bytes) -> tuple:
+    """(name, description, attributes_json, image_uri) spans of a decoded tokenURI JSON."""
+    if not data.startswith(_NAME_KEY) or not data.endswith(_END):
+        raise DecodeError("not a RetroPunks metadata object")
+    image = data.rfind(_IMAGE_KEY)
+    attributes = data.rfind(_ATTRIBUTES_KEY, 0, image)
+    description = data.find(_DESCRIPTION_KEY, len(_NAME_KEY), attributes)
+    if min(image, attributes, description) < 0:
+        raise DecodeError("missing name, description, attributes or image")
+    return (
+        (len(_NAME_KEY), description),
+        (description + len(_DESCRIPTION_KEY), attributes),
+        (attributes + len(_ATTRIBUTES_KEY) - 1, image + 1),
+        (image + len(_IMAGE_KEY), len(data) - len(_END)),
+    )
+
+def decode_token_uri(line, with_svg: bool = True) -> tuple:
+    """({name, description, attributes}, svg or None) from one data:application/json;base64 line."""
+    if line[:len(ERROR_PREFIX)] == ERROR_PREFIX:
+        raise DecodeError(bytes(line[len(ERROR_PREFIX):]).decode(errors="replace"))
+    if line[:len(JSON_URI_PREFIX)] != JSON_URI_PREFIX:
+        raise DecodeError("not a data:application/json;base64 URI")
+    try:
+        data = binascii.a2b_base64(line[len(JSON_URI_PREFIX):])
+    except binascii.Error as e:
+        raise DecodeError(f"bad base64: {e}")
+
+    name, description, attributes, image = split_metadata(data)
+    fields = {
+        "name": data[name[0]:name[1]].decode(errors="replace"),
+        "description": data[description[0]:description[1]].decode(errors="replace"),
+        "attributes": json.loads(data[attributes[0]:attributes[1]]),
+    }
+    if not with_svg:
+        return fields, None
+    uri = memoryview(data)[image[0]:image[1]]
+    if uri[:len(SVG_URI_PREFIX)] != SVG_URI_PREFIX:
+        raise DecodeError("image is not a data:image/svg+xml;base64 URI")
+    return fields, binascii.a2b_base64(uri[len(SVG_URI_PREFIX):]).decode()
+
+def decode_dump(f, chunk_size: int = DEFAULT_CHUNK_SIZE, with_svg: bool = True):
+    """Yield (attributes record, svg record or None) per token, in file order."""
+    for token_id, line in iter_token_uris(f, chunk_size):
+        try:
+            fields, svg = decode_token_uri(line, with_svg)
+        except (DecodeError, ValueError) as e:
+            yield {"token_id": token_id, "error": str(e)}, None
+            continue
+        yield {"token_id": token_id, **fields}, (None if svg is None else {"token_id": token_id, "svg": svg})
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+class NdjsonWriter:
+    def __init__(self, path: str):
+        self.f = open(path, 'w')
+
+    def write(self, record: dict):
+        self.f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def close(self):
+        self.f.close()
+
+class ParquetWriter:
+    """Buffers PARQUET_ROWS_PER_GROUP records per row group; lists and dicts are stored as JSON strings."""
+
+    def __init__(self, path: str, fields: list):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.schema = pa.schema([(name, pa.uint32() if name == "token_id" else pa.string()) for name in fields])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.rows = []
+
+    def write(self, record: dict):
+        self.rows.append(record)
+        if len(self.rows) >= PARQUET_ROWS_PER_GROUP:
+            self.flush()
+
+    def flush(self):
+        if not self.rows:
+            return
+        columns = {}
+        for name in self.schema.names:
+            values = [r.get(name) for r in self.rows]
+            columns[name] = [json.dumps(v, separators=(",", ":")) if isinstance(v, (list, dict)) else v
+                             for v in values]
+        self.writer.write_table(self.pa.table(columns, schema=self.schema))
+        self.rows = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+def open_writer(basename: str, fmt: str, fields: list):
+    path = os.path.join(OUTPUT_DIR, f"{basename}.{fmt}")
+    return path, (ParquetWriter(path, fields) if fmt == "parquet" else NdjsonWriter(path))
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode a tokenURI dump into metadata and SVG outputs, streaming.")
+    parser.add_argument("--input", default=str(DEFAULT_INPUT),
+                        help=f"tokenUriBatch.txt dump (default: export/{DEFAULT_INPUT.name})")
+    parser.add_argument("--format", choices=("ndjson", "parquet"), default="ndjson",
+                        help="output format; parquet needs pyarrow (default: ndjson)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"read buffer in bytes (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--no-svg", action="store_true", help="skip decoding and writing the SVGs")
+    args = parser.parse_args()
+
+    if args.format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("--format parquet needs pyarrow (pip install pyarrow)")
+    if not os.path.exists(args.input):
+        parser.error(f"{args.input} not found (run batchQueryTokenURI or TokenURIFetcher.py --format txt)")
+
+    print("=" * 70)
+    print("RetroPunks tokenURI Dump Decoder")
+    print("=" * 70)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    attributes_file, attributes_out = open_writer(ATTRIBUTES_BASENAME, args.format,
+                                                  ["token_id", "name", "description", "attributes", "error"])
+    svgs_file, svgs_out = (None, None) if args.no_svg else open_writer(SVGS_BASENAME, args.format, ["token_id", "svg"])
+
+    decoded = failed = 0
+    start = time.perf_counter()
+    try:
+        with open(args.input, 'rb') as f:
+            for record, svg in decode_dump(f, args.chunk_size, not args.no_svg):
+                attributes_out.write(record)
+                if svg is not None:
+                    svgs_out.write(svg)
+                decoded += 1
+                failed += "error" in record
+    finally:
+        attributes_out.close()
+        if svgs_out is not None:
+            svgs_out.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"Tokens:   {decoded:,} in {elapsed:.1f}s ({decoded / max(elapsed, 1e-9):,.0f}/s) from {args.input}")
+    if failed:
+        print(f"⊗ {failed} token(s) did not decode; see the error entries")
+    print(f"Attributes written to: {attributes_file}")
+    if svgs_file:
+        print(f"SVGs written to:       {svgs_file}")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Offline tokenURI Export for RetroPunks
+
+Builds every token's metadata the way RetroPunks.tokenURI does, without any
+RPC: TraitsGenerator replays generateTraitsContext, the trait group blobs are
+decoded from the asset data that AddAssetsBatch.s.sol uploads, SVGRenderer
+draws the image, and the attributes and JSON are assembled exactly like
+Renderer._getTraitsAsJson and RetroPunks._generateDataURI (revealed
+collection, Renderer.sol / PathSVGRenderer.sol, i.e. the rect style).
+
+Per-token inputs come from the batchQueryTokenMetadataJSON export
+(tokenId, tokenIDSeed, background, name, bio). Before or without one,
+--shuffler-seed derives each token's tokenIdSeed with TokenSeeds (same
+--mint-order steps) and uses the mint defaults (background 1, name "#<id>",
+the default bio); --supply exports tokenIdSeeds 0..N-1 with those defaults,
+using the seed as the token id.
+
+Tokens are rendered in chunks on a process pool and written in token order as
+they complete, with a bounded number of chunks in flight, so memory does not
+grow with the collection. Each worker decodes the assets once.
+
+Output, one record per token:
+  ndjson     {"token_id", "token_id_seed", "name", "description",
+              "attributes", "image"}; tokens whose traits revert get
+              {"token_id", "token_id_seed", "error": "TraitSelectionFailed"}
+  parquet    the same fields as columns, attributes as a JSON string
+             (needs pyarrow)
+  --token-uri replaces the metadata fields with "token_uri", the exact
+  data:application/json;base64 string tokenURI returns.
+
+Usage:
+  python3 TokenURIExport.py --global-seed N
+                            (--metadata tokenMetadataBatch.json | --shuffler-seed N | --supply 10000)
+                            [--max-supply 10000] [--mint-order public:10000]
+                            [--format ndjson|parquet] [--token-uri] [--jobs 0] [--chunk-size 250]
+  (writes output/token_metadata.ndjson or output/token_metadata.parquet)
+"""
+
+import argparse
+import base64
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from FastLZ import flz_decompress
+from LibPRNG import LazyShuffleFinished
+from SVGRenderer import STYLE_RECT, SVGRenderer
+from TokenSeeds import add_mint_arguments, mint_order_from_args, token_seeds
+from TraitsDecoder import decode_trait_group, group_index_for
+from TraitsGenerator import (
+    DEFAULT_BACKGROUND, NUM_PRE_RENDERED_SPECIALS, ROOT, TraitSelectionFailed, generate_traits_context,
+)
+
+ASSETS_SCRIPT_PATH = ROOT / "script" / "AddAssetsBatch.s.sol"
+
+OUTPUT_DIR = "output"
+OUTPUT_BASENAME = "token_metadata"
+
+DEFAULT_BIO = "A RetroPunk living on-chain."
+SPECIAL_ASSET_OFFSET = 100          # Renderer._renderPreRenderedSpecial: loadAsset(specialId + 100)
+SPECIAL_1S_GROUP = 1
+
+# Renderer.sol
+MAIN_SVG_HEADER = ('<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 48 48"><g id="GeneratedImage">'
+                   '<foreignObject width="48" height="48"><img xmlns="http://www.w3.org/1999/xhtml" '
+                   'width="100%" height="100%" style="image-rendering: pixelated" src="data:image/png;base64,')
+SVG_FOOTER = '"/></foreignObject></g></svg>'
+
+_ASSET_PATTERN = re.compile(r'Asset\(\{\s*key:\s*(\d+),\s*name:\s*"([^"]*)",\s*data:\s*hex"([0-9A-Fa-f]*)"\s*\}\)')
+
+# ============================================================================
+# ASSETS
+# ============================================================================
+
+def load_script_assets(path=ASSETS_SCRIPT_PATH) -> tuple:
+    """
+    ({E_TraitsGroup: TraitGroup}, {asset key: raw bytes}) from the Asset
+    entries in AddAssetsBatch.s.sol. Trait groups (keys below 100) are stored
+    FastLZ-compressed; everything else is kept as uploaded.
+    """
+    groups, raw = {}, {}
+    with open(path) as f:
+        source = f.read()
+    for key, name, hex_data in _ASSET_PATTERN.findall(source):
+        key, data = int(key), bytes.fromhex(hex_data)
+        if key < SPECIAL_ASSET_OFFSET:
+            index = group_index_for(name)
+            groups[index] = decode_trait_group(flz_decompress(data), index)
+        else:
+            raw[key] = data
+    return groups, raw
+
+# ============================================================================
+# TOKEN METADATA
+# ============================================================================
+
+class TokenRenderer:
+    """Renderer.generateMetadata + RetroPunks._generateDataURI for revealed tokens."""
+
+    def __init__(self, groups: dict, raw_assets: dict, global_seed: int):
+        self.groups = groups
+        self.raw_assets = raw_assets
+        self.global_seed = global_seed
+        self.svg = SVGRenderer(groups, STYLE_RECT)
+
+    def attributes(self, ctx) -> list:
+        """_getTraitsAsJson: birthday, then each rendered layer after the background (fillers excluded)."""
+        attrs = [{"display_type": "date", "trait_type": "birthday", "value": ctx.birthday}]
+        if ctx.special_id > 0:
+            layers = [(SPECIAL_1S_GROUP, ctx.special_id - 1)]
+        else:
+            layers = [(t.trait_group, t.trait_index) for t in ctx.traits_to_render[1:]]
+        for group_index, trait_index in layers:
+            group = self.groups[group_index]
+            if trait_index < len(group.traits):
+                attrs.append({"trait_type": group.trait_group_name.decode(),
+                              "value": group.traits[trait_index].trait_name.decode()})
+        return attrs
+
+    def image(self, ctx) -> str:
+        if 0 < ctx.special_id <= NUM_PRE_RENDERED_SPECIALS:
+            png = self.raw_assets[ctx.special_id + SPECIAL_ASSET_OFFSET]
+            return MAIN_SVG_HEADER + base64.b64encode(png).decode() + SVG_FOOTER
+        return self.svg.render(ctx.traits_to_render, ctx.background)
+
+    def token(self, token_id: int, token_id_seed: int, background: int, name: str, bio: str) -> dict:
+        """Metadata fields for one token; raises TraitSelectionFailed like tokenURI would."""
+        ctx = generate_traits_context(token_id_seed, background, self.global_seed)
+        default_name = f"#{token_id}"
+        return {
+            "token_id": token_id,
+            "token_id_seed": token_id_seed,
+            "name": default_name if name == default_name else f"{default_name}: {name}",
+            "description": bio,
+            "attributes": self.attributes(ctx),
+            "image": "data:image/svg+xml;base64," + base64.b64encode(self.image(ctx).encode()).decode(),
+        }
+
+def token_uri(record: dict) -> str:
+    """The tokenURI string: the JSON is concatenated unescaped, exactly as _generateDataURI builds it."""
+    parts = ['{"display_type":"date","trait_type":"birthday","value":%d}' % record["attributes"][0]["value"]]
+    parts += ['{"trait_type":"%s","value":"%s"}' % (a["trait_type"], a["value"]) for a in record["attributes"][1:]]
+    body = ('{"name":"' + record["name"] + '",' + '"description":"' + record["description"] + '",'
+            + '"attributes":[' + ",".join(parts) + "]," + '"image":"' + record["image"] + '"}')
+    return "data:application/json;base64," + base64.b64encode(body.encode()).decode()
+
+# ============================================================================
+# TOKENS
+# ============================================================================
+
+def load_metadata(path: str) -> list:
+    """
+    [(tokenId, tokenIdSeed, background, name, bio)] from a
+    batchQueryTokenMetadataJSON export (a JSON array) or TokenURIFetcher.py
+    --read metadata NDJSON; fetcher lines without metadata are skipped.
+    """
+    with open(path) as f:
+        text = f.read()
+    if text.lstrip().startswith("["):
+        return [(e["tokenId"], e["tokenIDSeed"], e["background"], e["name"], e["bio"]) for e in json.loads(text)]
+    entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return [(e["token_id"], e["token_id_seed"], e["background"], e["name"], e["bio"])
+            for e in entries if "token_id_seed" in e]
+
+def shuffled_tokens(shuffler_seed: int, max_supply: int, mint_order: list) -> list:
+    """Every minted token with its shuffled tokenIdSeed and the _saveNewSeed defaults."""
+    return [(token_id, seed, DEFAULT_BACKGROUND, f"#{token_id}", DEFAULT_BIO)
+            for token_id, seed in token_seeds(shuffler_seed, max_supply, mint_order)]
+
+def default_tokens(supply: int) -> list:
+    """Every tokenIdSeed with the _saveNewSeed defaults, keyed by the seed itself."""
+    return [(seed, seed, DEFAULT_BACKGROUND, f"#{seed}", DEFAULT_BIO) for seed in range(supply)]
+
+def add_token_source_arguments(parser):
+    """
+    --global-seed, one token source (--metadata | --shuffler-seed | --supply)
+    with the mint arguments, and --assets: the inputs of every CLI that
+    rebuilds tokens offline. load_tokens reads them back.
+    """
+    parser.add_argument("--global-seed", type=lambda s: int(s, 0), required=True, help="revealed globalSeed")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--metadata", help="batchQueryTokenMetadataJSON export, or TokenURIFetcher.py --read metadata NDJSON")
+    source.add_argument("--shuffler-seed", type=lambda s: int(s, 0), help="revealed shufflerSeed (see TokenSeeds.py)")
+    source.add_argument("--supply", type=int, help="tokenIdSeeds 0..N-1 with the mint defaults")
+    add_mint_arguments(parser)
+    parser.add_argument("--assets", default=str(ASSETS_SCRIPT_PATH),
+                        help=f"asset upload script to decode (default: {ASSETS_SCRIPT_PATH.name})")
+
+def load_tokens(args, parser) -> list:
+    """[(tokenId, tokenIdSeed, background, name, bio)] for the source chosen in add_token_source_arguments."""
+    if args.metadata:
+        return load_metadata(args.metadata)
+    if args.shuffler_seed is not None:
+        mint_order = mint_order_from_args(args, parser)
+        try:
+            return shuffled_tokens(args.shuffler_seed, args.max_supply, mint_order)
+        except (ValueError, LazyShuffleFinished) as e:
+            parser.error(f"mint order cannot be replayed: {str(e) or 'the shuffler runs out (LazyShuffleFinished)'}")
+    return default_tokens(args.supply)
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+_worker = None
+
+def _init_worker(global_seed: int, assets_path: str):
+    global _worker
+    groups, raw_assets = load_script_assets(assets_path)
+    _worker = TokenRenderer(groups, raw_assets, global_seed)
+
+def _render_chunk(tokens: list, as_token_uri: bool) -> list:
+    records = []
+    for token_id, seed, background, name, bio in tokens:
+        try:
+            record = _worker.token(token_id, seed, background, name, bio)
+        except TraitSelectionFailed:
+            records.append({"token_id": token_id, "token_id_seed": seed, "error": "TraitSelectionFailed"})
+            continue
+        if as_token_uri:
+            record = {"token_id": token_id, "token_id_seed": seed, "token_uri": token_uri(record)}
+        records.append(record)
+    return records
+
+def render_tokens(tokens: list, global_seed: int, jobs: int, chunk_size: int,
+                  as_token_uri: bool = False, assets_path=ASSETS_SCRIPT_PATH):
+    """Yield record chunks in token order, keeping at most 2 * jobs chunks in flight."""
+    chunks = [tokens[i:i + chunk_size] for i in range(0, len(tokens), chunk_size)]
+    if jobs <= 1:
+        _init_worker(global_seed, assets_path)
+        for chunk in chunks:
+            yield _render_chunk(chunk, as_token_uri)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(global_seed, str(assets_path))) as pool:
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(_render_chunk, chunk, as_token_uri))
+            if len(pending) >= 2 * jobs:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+def write_ndjson(chunks, out_file: str) -> tuple:
+    written = failed = 0
+    with open(out_file, 'w') as f:
+        for records in chunks:
+            for record in records:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+                failed += "error" in record
+            written += len(records)
+    return written, failed
+
+def write_parquet(chunks, out_file: str, as_token_uri: bool) -> tuple:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    fields = [("token_id", pa.uint32()), ("token_id_seed", pa.uint16())]
+    if as_token_uri:
+        fields += [("token_uri", pa.string())]
+    else:
+        fields += [(name, pa.string()) for name in ("name", "description", "attributes", "image")]
+    fields += [("error", pa.string())]
+    schema = pa.schema(fields)
+
+    written = failed = 0
+    with pq.ParquetWriter(out_file, schema) as writer:
+        for records in chunks:
+            columns = {name: [] for name in schema.names}
+            for record in records:
+                for name in schema.names:
+                    value = record.get(name)
+                    columns[name].append(json.dumps(value, separators=(",", ":")) if name == "attributes"
+                                         and value is not None else value)
+                failed += "error" in record
+            writer.write_table(pa.table(columns, schema=schema))
+            written += len(records)
+    return written, failed
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Export every RetroPunks token's metadata offline.")
+    add_token_source_arguments(parser)
+    parser.add_argument("--format", choices=("ndjson", "parquet"), default="ndjson",
+                        help="output format; parquet needs pyarrow (default: ndjson)")
+    parser.add_argument("--token-uri", action="store_true", help="write the exact tokenURI string instead of metadata fields")
+    parser.add_argument("--jobs", "-j", type=int, default=0, metavar="N",
+                        help="worker processes (0 = one per CPU core, default: 0)")
+    parser.add_argument("--chunk-size", type=int, default=250, help="tokens per work item (default: 250)")
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    if args.format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("--format parquet needs pyarrow (pip install pyarrow)")
+
+    print("=" * 70)
+    print("RetroPunks tokenURI Export (offline)")
+    print("=" * 70)
+
+    tokens = load_tokens(args, parser)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    out_file = os.path.join(OUTPUT_DIR, f"{OUTPUT_BASENAME}.{args.format}")
+
+    start = time.perf_counter()
+    chunks = render_tokens(tokens, args.global_seed, jobs, args.chunk_size, args.token_uri, args.assets)
+    if args.format == "parquet":
+        written, failed = write_parquet(chunks, out_file, args.token_uri)
+    else:
+        written, failed = write_ndjson(chunks, out_file)
+    elapsed = time.perf_counter() - start
+
+    print(f"Tokens:   {written:,} in {elapsed:.1f}s ({written / elapsed:,.0f}/s, {jobs} worker(s))")
+    if failed:
+        print(f"⊗ {failed} token(s) revert with TraitSelectionFailed")
+    print(f"Output written to: {out_file}")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,580 @@
+#!/usr/bin/env python3
+"""
+Async Bulk tokenURI Fetcher for RetroPunks
+
+batchQueryTokenURI in script/RetroPunks.s.sol calls tokenURI(i) one token
+at a time inside a forge script. This client does the same over plain
+JSON-RPC eth_call with asyncio:
+
+  - a fixed pool of keep-alive HTTP/1.1 connections, one request in flight
+    per connection, so --concurrency bounds both sockets and load on the node
+  - optional JSON-RPC batching: --batch N puts N eth_calls in one POST
+  - retries with exponential backoff for transport errors, timeouts and
+    HTTP 429/5xx; a revert (JSON-RPC error) is final and recorded per token
+  - every call is pinned to the block number read at startup, so the export
+    is one consistent snapshot even while transactions land
+  - results are written as they arrive (not in token order)
+  - --multicall packs every read for a chunk of tokens into one
+    Multicall3.aggregate3 eth_call (allowFailure, so one reverting token does
+    not sink its batch)
+
+Multicall batches are sized from the node, not guessed: the gas cap is the
+block gas limit (or --gas-cap), and eth_estimateGas of a one-token aggregate3
+on 16 tokens spread over the range gives the per-token cost. Batches aim at
+80% of the cap, allowing for the quadratic memory cost of the return data
+Multicall3 copies. With allowFailure, a batch that runs out of gas still
+succeeds, with every read past that point failing without revert data; those
+tokens are read again under a smaller batch size, which then holds for the
+rest of the run. A batch that fails as a whole (node response limits, HTTP
+413) is split in half. A token is only recorded as failed with its own
+revert data, or after a direct eth_call of it reverts.
+
+--read picks the view(s) per token: tokenURI, globalTokenMetadata (the
+tokenIdSeed, background, name and bio that TokenURIExport.py renders from),
+or both.
+
+The HTTP client is stdlib-only (asyncio streams), so it runs wherever the
+rest of python/ does. Point it at a local anvil (anvil, then deploy with
+script/RetroPunks.s.sol) to test; anvil predeploys Multicall3.
+
+Output:
+  ndjson  {"token_id": N, "token_uri": "data:application/json;base64,..."}
+          plus token_id_seed/background/name/bio with --read metadata|both,
+          and "error": "..." for reads that failed, one token per line
+  txt     the batchQueryTokenURI layout ("Token N:" then the URI), which
+          the export/tokenUriBatch.txt tooling reads (--read uri only)
+
+Usage:
+  python3 TokenURIFetcher.py [--rpc-url URL] [--contract ADDR] [--start 1] [--end N | --ids-file FILE]
+                             [--read uri|metadata|both] [--multicall [--gas-cap GAS]]
+                             [--concurrency 16] [--batch 0] [--retries 5] [--format ndjson|txt]
+  (RPC defaults to $LOCAL_RPC, contract to $RETROPUNKS; --end defaults to totalSupply();
+   writes output/token_uris.ndjson, output/token_metadata_reads.ndjson or output/tokenUriBatch.txt)
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import ssl
+import time
+from urllib.parse import urlsplit
+from dotenv import load_dotenv
+
+load_dotenv()
+
+OUTPUT_DIR = "output"
+NDJSON_FILENAME = "token_uris.ndjson"
+METADATA_FILENAME = "token_metadata_reads.ndjson"
+TXT_FILENAME = "tokenUriBatch.txt"
+
+DEFAULT_RPC_URL = "http://127.0.0.1:8545"
+
+TOKEN_URI_SELECTOR = "c87b56dd"         # tokenURI(uint256)
+TOTAL_SUPPLY_SELECTOR = "18160ddd"      # totalSupply()
+GLOBAL_TOKEN_METADATA_SELECTOR = "db846dbe"     # globalTokenMetadata(uint256)
+AGGREGATE3_SELECTOR = "82ad56cb"        # aggregate3((address,bool,bytes)[])
+
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 0.25
+
+# ============================================================================
+# ABI
+# ============================================================================
+
+def encode_uint_call(selector: str, value: int = None) -> str:
+    return "0x" + selector + ("" if value is None else f"{value:064x}")
+
+def decode_uint(result: str) -> int:
+    return int(result, 16)
+
+def decode_string(data: bytes, head: int = 0) -> str:
+    """A string whose offset word sits at data[head:head + 32], e.g. abi.decode(data, (string)) for head 0."""
+    offset = int.from_bytes(data[head:head + 32], 'big')
+    length = int.from_bytes(data[offset:offset + 32], 'big')
+    return data[offset + 32:offset + 32 + length].decode()
+
+def _word(value: int) -> bytes:
+    return value.to_bytes(32, 'big')
+
+def _padded(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % 32)
+
+def encode_aggregate3(calls: list) -> str:
+    """Multicall3.aggregate3(Call3[]) calldata for [(target, callData)], every call allowFailure=true."""
+    tuples = [_word(int(target, 16)) + _word(1) + _word(0x60) + _word(len(data)) + _padded(data)
+              for target, data in calls]
+    offsets, position = [], 32 * len(tuples)
+    for t in tuples:
+        offsets.append(_word(position))
+        position += len(t)
+    return "0x" + AGGREGATE3_SELECTOR + (_word(0x20) + _word(len(calls)) + b"".join(offsets) + b"".join(tuples)).hex()
+
+def decode_aggregate3(result: str) -> list:
+    """Multicall3.Result[] -> [(success, returnData)]."""
+    data = bytes.fromhex(result[2:])
+    array = int.from_bytes(data[:32], 'big')
+    count = int.from_bytes(data[array:array + 32], 'big')
+    base = array + 32
+    out = []
+    for i in range(count):
+        item = base + int.from_bytes(data[base + 32 * i:base + 32 * (i + 1)], 'big')
+        success = int.from_bytes(data[item:item + 32], 'big') != 0
+        start = item + int.from_bytes(data[item + 32:item + 64], 'big')
+        length = int.from_bytes(data[start:start + 32], 'big')
+        out.append((success, data[start + 32:start + 32 + length]))
+    return out
+
+# ============================================================================
+# HTTP
+# ============================================================================
+
+class HTTPStatusError(Exception):
+    def __init__(self, status: int, body: bytes):
+        super().__init__(f"HTTP {status}: {body[:200]!r}")
+        self.status = status
+
+class _Connection:
+    """One keep-alive HTTP/1.1 connection; POST only."""
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.reader = self.writer = None
+
+    async def post(self, body: bytes) -> tuple:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        self.writer.write(
+            f"POST {self.path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n".encode() + body
+        )
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by server")
+        status = int(status_line.split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while (size := int((await self.reader.readline()).split(b";")[0], 16)) > 0:
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            await self.reader.readline()
+            payload = b"".join(chunks)
+        elif "content-length" in headers:
+            payload = await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            payload = await self.reader.read()
+            headers["connection"] = "close"
+
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, payload
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+# ============================================================================
+# JSON-RPC
+# ============================================================================
+
+class RPCError(Exception):
+    """A JSON-RPC error object, e.g. an eth_call revert; never retried."""
+
+    def __init__(self, error: dict):
+        super().__init__(error.get("message", "JSON-RPC error"))
+        self.code = error.get("code")
+        self.data = error.get("data")
+
+class JsonRpcClient:
+    """JSON-RPC over a pool of `concurrency` keep-alive connections, with retries."""
+
+    def __init__(self, url: str, concurrency: int = 16, retries: int = 5, timeout: float = 30.0):
+        self.concurrency = concurrency
+        self.retries = retries
+        self.timeout = timeout
+        self._pool = asyncio.Queue()
+        for _ in range(concurrency):
+            self._pool.put_nowait(_Connection(url))
+        self._next_id = 0
+        self.requests = 0
+        self.retried = 0
+
+    async def _post(self, payload) -> object:
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        for attempt in range(self.retries + 1):
+            conn = await self._pool.get()
+            try:
+                status, response = await asyncio.wait_for(conn.post(body), self.timeout)
+                if status != 200:
+                    raise HTTPStatusError(status, response)
+                self.requests += 1
+                return json.loads(response)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, HTTPStatusError) as e:
+                conn.close()
+                if attempt == self.retries or (isinstance(e, HTTPStatusError) and e.status not in RETRY_STATUSES):
+                    raise
+                self.retried += 1
+                await asyncio.sleep(BACKOFF_BASE * 2 ** attempt)
+            finally:
+                self._pool.put_nowait(conn)
+
+    def _request(self, method: str, params: list) -> dict:
+        self._next_id += 1
+        return {"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params}
+
+    async def call(self, method: str, params: list):
+        response = await self._post(self._request(method, params))
+        if "error" in response:
+            raise RPCError(response["error"])
+        return response["result"]
+
+    async def batch(self, calls: list) -> list:
+        """[(method, params)] -> [result or RPCError], in call order."""
+        requests = [self._request(method, params) for method, params in calls]
+        responses = await self._post(requests)
+        if isinstance(responses, dict):         # the whole batch was rejected
+            raise RPCError(responses.get("error", {}))
+        by_id = {r.get("id"): r for r in responses}
+        out = []
+        for request in requests:
+            response = by_id.get(request["id"], {"error": {"message": "missing from batch response"}})
+            out.append(RPCError(response["error"]) if "error" in response else response["result"])
+        return out
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+# ============================================================================
+# READS
+# ============================================================================
+
+def _read_uri(result: bytes) -> dict:
+    return {"token_uri": decode_string(result)}
+
+def _read_metadata(result: bytes) -> dict:
+    """globalTokenMetadata(id) -> (uint16 tokenIdSeed, uint8 backgroundIndex, bytes32 name, string bio)"""
+    return {
+        "token_id_seed": int.from_bytes(result[:32], 'big'),
+        "background": int.from_bytes(result[32:64], 'big'),
+        "name": result[64:96].rstrip(b"\0").decode(),
+        "bio": decode_string(result, head=96),
+    }
+
+# read name -> (selector, decoder over the raw return data)
+READS = {
+    "uri": (TOKEN_URI_SELECTOR, _read_uri),
+    "metadata": (GLOBAL_TOKEN_METADATA_SELECTOR, _read_metadata),
+}
+
+def read_calls(token_id: int, reads: list) -> list:
+    return [bytes.fromhex(READS[r][0]) + token_id.to_bytes(32, 'big') for r in reads]
+
+def merge_reads(token_id: int, reads: list, results: list) -> tuple:
+    """(token_id, fields, error) from one raw result or Exception per read; fields keep what succeeded."""
+    fields, errors = {}, []
+    for read, result in zip(reads, results):
+        if isinstance(result, Exception):
+            errors.append(_error_text(result))
+        else:
+            fields.update(READS[read][1](result))
+    return token_id, fields, "; ".join(errors) or None
+
+# ============================================================================
+# FETCH
+# ============================================================================
+
+def _eth_call(to: str, data: str, block: str, gas: int = None) -> tuple:
+    tx = {"to": to, "data": data}
+    if gas is not None:
+        tx["gas"] = hex(gas)
+    return "eth_call", [tx, block]
+
+def _error_text(error: Exception) -> str:
+    text = str(error) or type(error).__name__
+    data = getattr(error, "data", None)
+    return f"{text} ({data})" if isinstance(data, str) and data else text
+
+class DirectFetcher:
+    """One eth_call per token and read, optionally packed into JSON-RPC batches."""
+
+    def __init__(self, contract: str, block: str, reads: list, use_batch: bool):
+        self.contract, self.block, self.reads, self.use_batch = contract, block, reads, use_batch
+
+    async def __call__(self, client: JsonRpcClient, token_ids: list) -> list:
+        calls = [_eth_call(self.contract, "0x" + data.hex(), self.block)
+                 for t in token_ids for data in read_calls(t, self.reads)]
+        if self.use_batch:
+            results = await client.batch(calls)
+        else:
+            results = []
+            for method, params in calls:
+                try:
+                    results.append(await client.call(method, params))
+                except RPCError as e:
+                    results.append(e)
+        raw = [r if isinstance(r, Exception) else bytes.fromhex(r[2:]) for r in results]
+        n = len(self.reads)
+        return [merge_reads(t, self.reads, raw[i * n:(i + 1) * n]) for i, t in enumerate(token_ids)]
+
+async def fetch_all(client: JsonRpcClient, token_ids: list, chunk_size: int, fetch, on_result) -> tuple:
+    """
+    Run every chunk of token ids through `fetch` on `concurrency` workers and
+    hand each (token_id, fields, error) to on_result as soon as its chunk
+    completes. Returns (ok, failed).
+    """
+    queue = asyncio.Queue()
+    for i in range(0, len(token_ids), chunk_size):
+        queue.put_nowait(token_ids[i:i + chunk_size])
+    counts = [0, 0]
+
+    async def worker():
+        while not queue.empty():
+            chunk = queue.get_nowait()
+            try:
+                results = await fetch(client, chunk)
+            except Exception as e:
+                results = [(t, {}, _error_text(e)) for t in chunk]
+            for token_id, fields, error in results:
+                counts[error is not None] += 1
+                on_result(token_id, fields, error)
+
+    await asyncio.gather(*(worker() for _ in range(client.concurrency)))
+    return tuple(counts)
+
+# ============================================================================
+# MULTICALL3
+# ============================================================================
+
+# Share of the gas cap a batch is sized for, and eth_call's intrinsic cost
+MULTICALL_GAS_HEADROOM = 0.8
+TX_BASE_GAS = 21000
+
+# Tokens, evenly spaced over the range, measured to size batches
+SIZING_SAMPLES = 16
+
+class MulticallFetcher:
+    """
+    Every read for a chunk of tokens in one Multicall3.aggregate3 eth_call.
+
+    With allowFailure, running out of gas partway through does not fail the
+    call: every inner call from that point on comes back success=false with
+    empty returnData. So a failure without revert data is never recorded
+    as is. When failures run to the end of the batch, the batch size is
+    shrunk to the tokens that fit (for this and every later chunk) and the
+    rest are read again; an isolated one is re-read directly. A call that
+    fails as a whole (response too large, node limits, HTTP 413) is split in
+    half. A single token is always settled by a direct eth_call, so every
+    recorded error is that token's own revert.
+    """
+
+    def __init__(self, contract: str, block: str, reads: list, gas_cap: int, multicall: str = MULTICALL3_ADDRESS):
+        self.contract, self.block, self.reads = contract, block, reads
+        self.gas_cap, self.multicall = gas_cap, multicall
+        self.direct = DirectFetcher(contract, block, reads, use_batch=False)
+        self.batch_limit = None
+        self.splits = 0
+        self.rereads = 0
+
+    def calldata(self, token_ids: list) -> str:
+        return encode_aggregate3([(self.contract, data) for t in token_ids for data in read_calls(t, self.reads)])
+
+    async def __call__(self, client: JsonRpcClient, token_ids: list) -> list:
+        out, i = [], 0
+        while i < len(token_ids):
+            chunk = token_ids[i:i + (self.batch_limit or len(token_ids))]
+            out += await self._aggregate(client, chunk)
+            i += len(chunk)
+        return out
+
+    def _shrink(self, size: int):
+        self.batch_limit = max(1, min(self.batch_limit or size, size))
+
+    async def _aggregate(self, client: JsonRpcClient, token_ids: list) -> list:
+        if len(token_ids) == 1 and self.batch_limit == 1:
+            return await self.direct(client, token_ids)
+        try:
+            result = await client.call(*_eth_call(self.multicall, self.calldata(token_ids), self.block, self.gas_cap))
+        except (RPCError, HTTPStatusError):
+            if len(token_ids) == 1:
+                return await self.direct(client, token_ids)
+            self.splits += 1
+            half = len(token_ids) // 2
+            return await self._aggregate(client, token_ids[:half]) + await self._aggregate(client, token_ids[half:])
+
+        decoded = decode_aggregate3(result)
+        n = len(self.reads)
+        out, unsettled = [], []
+        for i, token_id in enumerate(token_ids):
+            pairs = decoded[i * n:(i + 1) * n]
+            if any(not ok and not data for ok, data in pairs):
+                unsettled.append(i)
+                continue
+            results = [data if ok else RPCError({"message": "execution reverted", "data": "0x" + data.hex()})
+                       for ok, data in pairs]
+            out.append(merge_reads(token_id, self.reads, results))
+        if not unsettled:
+            return out
+
+        first = unsettled[0]
+        retry = [token_ids[i] for i in unsettled]
+        if len(token_ids) > 1 and unsettled == list(range(first, len(token_ids))):
+            # Out of gas from `first` on: only that many tokens fit a call
+            self.splits += 1
+            self._shrink(first or len(token_ids) // 2)
+            return out + await self(client, retry)
+        self.rereads += len(retry)
+        return out + await self.direct(client, retry)
+
+async def node_gas_cap(client: JsonRpcClient, block: str) -> int:
+    """The block gas limit, which is also anvil's (and most nodes' default) eth_call gas cap."""
+    return decode_uint((await client.call("eth_getBlockByNumber", [block, False]))["gasLimit"])
+
+def sample_ids(token_ids: list, count: int = SIZING_SAMPLES) -> list:
+    """Up to `count` ids spread evenly over token_ids, first and last included."""
+    if len(token_ids) <= count:
+        return list(token_ids)
+    return sorted({token_ids[i * (len(token_ids) - 1) // (count - 1)] for i in range(count)})
+
+async def size_batches(client: JsonRpcClient, fetcher: MulticallFetcher, sample_ids: list) -> tuple:
+    """
+    (tokens per aggregate3, gas per token, return bytes per token), measured
+    on sample_ids. Gas is eth_estimateGas of a one-token aggregate3 less the
+    intrinsic cost. Return data is copied into Multicall3's memory and
+    re-encoded, so a batch also pays quadratic memory expansion on about
+    twice its return size; the batch size solves
+      TX_BASE_GAS + n * gas + (n * words)^2 / 512 <= headroom * gas cap.
+    The most expensive sample sets the size; tokens costlier than any sample
+    are caught by MulticallFetcher shrinking the batch.
+    """
+    async def measure(token_id: int) -> tuple:
+        call = {"to": fetcher.multicall, "data": fetcher.calldata([token_id])}
+        estimate = decode_uint(await client.call("eth_estimateGas", [call, fetcher.block]))
+        returned = sum(len(data) for _, data in decode_aggregate3(await client.call("eth_call", [call, fetcher.block])))
+        return estimate - TX_BASE_GAS, 2 * returned / 32
+
+    measured = await asyncio.gather(*(measure(t) for t in sample_ids))
+    gas = max(g for g, _ in measured)
+    words = max(w for _, w in measured)
+    budget = MULTICALL_GAS_HEADROOM * fetcher.gas_cap - TX_BASE_GAS
+    a = words * words / 512
+    n = budget / gas if a == 0 else (-gas + math.sqrt(gas * gas + 4 * a * budget)) / (2 * a)
+    return max(1, int(n)), gas, int(words * 16)
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def _writer(f, fmt: str):
+    def write(token_id: int, fields: dict, error: str):
+        if fmt == "txt":
+            f.write(f"Token {token_id}:\n{fields['token_uri'] if error is None else 'ERROR: ' + error}\n\n")
+        else:
+            record = {"token_id": token_id, **fields, **({"error": error} if error else {})}
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+    return write
+
+def load_ids(path: str) -> list:
+    with open(path) as f:
+        return [int(line.split()[0], 0) for line in f if line.strip() and not line.startswith("#")]
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+async def run(args) -> None:
+    client = JsonRpcClient(args.rpc_url, args.concurrency, args.retries, args.timeout)
+    reads = ["uri", "metadata"] if args.read == "both" else [args.read]
+    try:
+        block = hex(decode_uint(await client.call("eth_blockNumber", [])))
+        if args.ids_file:
+            token_ids = load_ids(args.ids_file)
+        else:
+            end = args.end
+            if end is None:
+                end = decode_uint(await client.call(*_eth_call(args.contract, encode_uint_call(TOTAL_SUPPLY_SELECTOR), block)))
+            token_ids = list(range(args.start, end + 1))
+        print(f"Tokens:   {len(token_ids):,} at block {int(block, 16):,} ({args.rpc_url}), reading {', '.join(reads)}")
+
+        if args.multicall:
+            gas_cap = args.gas_cap or await node_gas_cap(client, block)
+            fetcher = MulticallFetcher(args.contract, block, reads, gas_cap)
+            samples = sample_ids(token_ids)
+            chunk_size, per_token, returned = await size_batches(client, fetcher, samples) if samples else (1, 0, 0)
+            if args.batch:
+                chunk_size = min(chunk_size, args.batch)
+            print(f"Multicall: {chunk_size} tokens per aggregate3 (gas cap {gas_cap:,}, "
+                  f"~{per_token:,.0f} gas and ~{returned:,} bytes per token)")
+        else:
+            fetcher = DirectFetcher(args.contract, block, reads, use_batch=args.batch > 0)
+            chunk_size = max(1, args.batch)
+
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        filename = {"txt": TXT_FILENAME}.get(args.format, METADATA_FILENAME if reads == ["metadata"] else NDJSON_FILENAME)
+        out_file = os.path.join(OUTPUT_DIR, filename)
+        start = time.perf_counter()
+        with open(out_file, 'w') as f:
+            ok, failed = await fetch_all(client, token_ids, chunk_size, fetcher, _writer(f, args.format))
+        elapsed = time.perf_counter() - start
+
+        print(f"Fetched:  {ok:,} in {elapsed:.1f}s ({ok / max(elapsed, 1e-9):,.0f}/s), "
+              f"{client.requests:,} HTTP requests, {client.retried} retries"
+              + (f", {fetcher.splits} batch splits, {fetcher.rereads} direct re-reads" if args.multicall else ""))
+        if args.multicall and fetcher.batch_limit is not None and fetcher.batch_limit < chunk_size:
+            print(f"⚠ Batches shrank to {fetcher.batch_limit} tokens: some tokens cost more gas than the sampled ones")
+        if failed:
+            print(f"⊗ {failed} token(s) failed; see the error entries")
+        print(f"Output written to: {out_file}")
+    finally:
+        client.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Fetch RetroPunks tokenURIs over JSON-RPC with bounded concurrency.")
+    parser.add_argument("--rpc-url", default=os.getenv("LOCAL_RPC") or DEFAULT_RPC_URL,
+                        help=f"JSON-RPC endpoint (default: $LOCAL_RPC or {DEFAULT_RPC_URL})")
+    parser.add_argument("--contract", default=os.getenv("RETROPUNKS"), help="RetroPunks address (default: $RETROPUNKS)")
+    parser.add_argument("--start", type=int, default=1, help="first token id (default: 1)")
+    ids = parser.add_mutually_exclusive_group()
+    ids.add_argument("--end", type=int, default=None, help="last token id (default: totalSupply())")
+    ids.add_argument("--ids-file", default=None, help="token ids to fetch, one per line (e.g. after setTokenMetadata)")
+    parser.add_argument("--read", choices=("uri", "metadata", "both"), default="uri",
+                        help="tokenURI, globalTokenMetadata, or both (default: uri)")
+    parser.add_argument("--multicall", action="store_true", help="pack each chunk into one Multicall3.aggregate3 eth_call")
+    parser.add_argument("--gas-cap", type=int, default=None,
+                        help="eth_call gas cap for --multicall sizing (default: the block gas limit)")
+    parser.add_argument("--concurrency", type=int, default=16, help="connections / requests in flight (default: 16)")
+    parser.add_argument("--batch", type=int, default=0, metavar="N",
+                        help="eth_calls per JSON-RPC batch request, or with --multicall the most tokens "
+                             "per aggregate3 (0 = no batching / auto, default: 0)")
+    parser.add_argument("--retries", type=int, default=5, help="retries per request (default: 5)")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds per HTTP request (default: 30)")
+    parser.add_argument("--format", choices=("ndjson", "txt"), default="ndjson", help="output format (default: ndjson)")
+    args = parser.parse_args()
+    if not args.contract:
+        parser.error("--contract is required (or set RETROPUNKS)")
+    if args.format == "txt" and args.read != "uri":
+        parser.error("--format txt only holds tokenURIs; use ndjson with --read metadata/both")
+
+    print("=" * 70)
+    print("RetroPunks tokenURI Fetcher (async JSON-RPC)")
+    print("=" * 70)
+    asyncio.run(run(args))
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Offline Per-Trait Rendering Cost Model for RetroPunks
+
+script/TokenURIGas.s.sol measures a whole token against an RPC. This script
+prices every trait of every group on its own, by replaying the work
+PathSVGRenderer._renderTraitLayer does for that layer and counting the
+operations that dominate its gas:
+
+  bytes_read        bounds-checked reads of the trait data
+  to_string         Utils.toString calls (+ per emitted digit)
+  concat            DynamicBuffer appends (+ per 32-byte word copied)
+  encode_packed     abi.encodePacked calls (+ per word copied); in the path
+                    style every run re-copies its color's whole path buffer,
+                    so this is where run count turns quadratic
+  hex_chars         hex nibbles written for colors
+  palette_slots     per-palette-color work (path buffer / remap arrays)
+  mem_words         fresh memory words (never freed inside tokenURI)
+
+gas = scale * sum(count * GAS[feature]) + offset. The per-feature constants
+are opcode-level estimates; `scale` and `offset` are meant to be fitted from
+a few local anvil measurements (see --fit). Memory expansion is priced as the
+marginal cost at MEMORY_BASE_WORDS words already in use, because its
+quadratic term depends on everything rendered before the layer.
+
+SVG bytes are exact: each layer is rendered with SVGRenderer.
+
+Usage:
+  python3 TraitCosts.py [--style rect|path] [--assets FILE ...] [--calibration FILE]
+  python3 TraitCosts.py --fit SAMPLES.json
+      SAMPLES.json: [{"layers": ["GROUP:TRAIT", ...], "gas": N}, ...]
+      where N is the measured renderToSvg gas for those layers (e.g. tokenURI
+      gas on anvil minus the same call with an empty trait list). Writes
+      output/trait_cost_calibration.json for later --calibration runs.
+  (writes output/trait_costs.csv)
+"""
+
+import argparse
+import csv
+import json
+import os
+from collections import Counter
+import numpy as np
+from SVGRenderer import STYLE_PATH, STYLE_RECT, SVGRenderer, default_asset_files
+from TraitsDecoder import (
+    BACKGROUND_GROUP_INDEX, BG_IMAGE, BG_NONE, BG_SOLID, LAYER_FULLRES, LAYER_RECTS_FULLRES, LAYER_VARIANT,
+    RECT_LAYERS, decode_rects, decode_rle, load_trait_groups, resolve_variant,
+)
+
+OUTPUT_DIR = "output"
+COSTS_FILENAME = "trait_costs.csv"
+CALIBRATION_FILENAME = "trait_cost_calibration.json"
+
+# Opcode-level estimates per counted operation
+GAS = {
+    "layer": 600,
+    "bytes_read": 60,
+    "to_string": 180,
+    "to_string_digit": 45,
+    "concat": 120,
+    "concat_word": 6,
+    "encode_packed": 250,
+    "encode_packed_word": 12,
+    "hex_chars": 90,
+    "palette_slots": 40,
+    "mem_words": 3,
+}
+
+MEMORY_BASE_WORDS = 4096
+DEFAULT_CALIBRATION = {"scale": 1.0, "offset": 0.0}
+
+# ============================================================================
+# OPERATION COUNTING
+# ============================================================================
+
+def _words(n: int) -> int:
+    return (n + 31) // 32
+
+class _Ops(Counter):
+    """Operation counts for one layer."""
+
+    def to_string(self, *values):
+        for v in values:
+            self["to_string"] += 1
+            self["to_string_digit"] += len(str(v))
+            self["mem_words"] += 5                 # LibString.toString reserves 0xa0 bytes
+
+    def concat(self, *pieces_len):
+        for n in pieces_len:
+            self["concat"] += 1
+            self["concat_word"] += _words(n)
+
+    def literal_concat(self, *pieces_len):
+        """Appending string literals also materializes each literal in memory."""
+        self.concat(*pieces_len)
+        self["mem_words"] += sum(_words(n) + 1 for n in pieces_len)
+
+    def encode_packed(self, n: int):
+        self["encode_packed"] += 1
+        self["encode_packed_word"] += _words(n)
+        self["mem_words"] += _words(n) + 1
+
+def _rect_style_ops(group, trait) -> _Ops:
+    """PathSVGRenderer.sol (rect style): one <rect> per opaque run."""
+    ops = _Ops(layer=1)
+    p_size = group.palette_index_byte_size
+    runs = decode_rle(trait.trait_data, p_size)
+    ops["bytes_read"] += 1 + 2 * len(set(runs.ys)) + len(runs) * (2 + p_size)
+
+    for y, x, width, idx in zip(runs.ys, runs.xs, runs.lengths, runs.palette_indices):
+        rgba = group.palette_rgba[idx]
+        if rgba & 0xFF == 0:
+            continue
+        ops.to_string(x, y, width)
+        ops.literal_concat(9, 5, 9, 19)            # <rect x=" / " y=" / " width=" / " height="1" fill="
+        ops.concat(len(str(x)), len(str(y)), len(str(width)))
+        hex_bytes = 3 if rgba & 0xFF == 0xFF else 4
+        ops.literal_concat(1, 3)                   # "#" and "/>
+        ops.concat(*[2] * hex_bytes)
+        ops["hex_chars"] += 2 * hex_bytes
+        ops["mem_words"] += 4 * hex_bytes          # hexChars literal + new bytes(2) per byte
+    return ops
+
+def _path_style_ops(group, trait) -> _Ops:
+    """PathSVGRenderer2.sol (path style): per-color path buffers, rect and variant layers."""
+    ops = _Ops(layer=1)
+    p_size = group.palette_index_byte_size
+    colors = len(group.palette_rgba)
+
+    source, remap = resolve_variant(group, trait)
+    if remap is not None:
+        ops["bytes_read"] += 2 + 2 * p_size * len(remap)
+        ops["palette_slots"] += colors
+        ops["mem_words"] += colors + 1
+    if len(source.trait_data) == 0:
+        return ops
+
+    def emit_color(path_len: int = None):
+        ops.literal_concat(13, 5, 3)               # <path fill=" / " d=" / "/>
+        ops.concat(7)
+        if path_len is not None:
+            ops.concat(path_len)
+        ops["hex_chars"] += 6
+        ops["mem_words"] += 2                      # new bytes(7)
+
+    if source.layer_type in RECT_LAYERS:
+        unit = 1 if source.layer_type == LAYER_RECTS_FULLRES else 2
+        rects = decode_rects(source.trait_data, p_size)
+        ops["bytes_read"] += 1 + len(set(rects.palette_indices)) * (p_size + 1) + 4 * len(rects)
+        current = None
+        for x, y, w, h, idx in zip(rects.xs, rects.ys, rects.widths, rects.heights, rects.palette_indices):
+            if idx != current:
+                if current is not None:
+                    emit_color()
+                current = idx
+            cmd = f"M{x * unit} {y * unit}h{w * unit}v{h * unit}h-{w * unit}z"
+            ops.to_string(x * unit, w * unit, y * unit, h * unit)
+            ops.encode_packed(len(cmd))
+            ops.concat(len(cmd))
+        if current is not None:
+            emit_color()
+        return ops
+
+    unit = 1 if source.layer_type == LAYER_FULLRES else 2
+    runs = decode_rle(source.trait_data, p_size)
+    ops["bytes_read"] += 1 + 2 * len(set(runs.ys)) + len(runs) * (2 + p_size)
+    ops["palette_slots"] += colors
+    ops["mem_words"] += colors + 1                 # bytes[] pathBufs
+
+    buckets = {}
+    for y, x, width, idx in zip(runs.ys, runs.xs, runs.lengths, runs.palette_indices):
+        if remap is not None:
+            idx = remap[idx]
+        w = width * unit
+        cmd_len = len(f"M{x * unit} {y * unit}h{w}v{unit}h-{w}z")
+        ops.to_string(x * unit, y * unit, w, w)
+        ops.encode_packed(buckets.get(idx, 0) + cmd_len)
+        buckets[idx] = buckets.get(idx, 0) + cmd_len
+    for path_len in buckets.values():
+        emit_color(path_len)
+    return ops
+
+def _background_ops(group, trait, style: str) -> _Ops:
+    """Solid and gradient backgrounds: a handful of literals and one or two colors."""
+    ops = _Ops(layer=1)
+    hex_per_color = 6 if style == STYLE_PATH else 8
+    if trait.layer_type == BG_SOLID:
+        ops.literal_concat(34, 3)
+        ops["hex_chars"] += hex_per_color
+        ops["bytes_read"] += group.palette_index_byte_size
+    elif trait.layer_type != BG_NONE:
+        ops.literal_concat(60, 40, 80)
+        ops["hex_chars"] += 2 * hex_per_color
+        ops["bytes_read"] += 2 * group.palette_index_byte_size
+    return ops
+
+def layer_ops(group, trait, style: str = STYLE_RECT) -> _Ops:
+    if group.trait_group_index == BACKGROUND_GROUP_INDEX and trait.layer_type != BG_IMAGE:
+        return _background_ops(group, trait, style)
+    if len(trait.trait_data) == 0:
+        return _Ops(layer=1)
+    return _path_style_ops(group, trait) if style == STYLE_PATH else _rect_style_ops(group, trait)
+
+# ============================================================================
+# GAS
+# ============================================================================
+
+def raw_gas(ops: _Ops) -> float:
+    """Uncalibrated gas: linear terms plus marginal memory expansion at MEMORY_BASE_WORDS."""
+    gas = sum(count * GAS[name] for name, count in ops.items())
+    words = ops["mem_words"]
+    gas += ((MEMORY_BASE_WORDS + words) ** 2 - MEMORY_BASE_WORDS ** 2) // 512
+    return gas
+
+def estimate_gas(ops: _Ops, calibration: dict) -> int:
+    return int(round(calibration["scale"] * raw_gas(ops) + calibration["offset"]))
+
+def fit_calibration(groups: dict, samples: list, style: str) -> dict:
+    """Least-squares scale/offset from measured samples; scale only if there is just one."""
+    model = []
+    for sample in samples:
+        total = _Ops()
+        for spec in sample["layers"]:
+            g, t = map(int, spec.split(":"))
+            total.update(layer_ops(groups[g], groups[g].traits[t], style))
+        model.append(raw_gas(total))
+    measured = np.array([s["gas"] for s in samples], dtype=float)
+    model = np.array(model, dtype=float)
+
+    if len(samples) == 1:
+        return {"scale": float(measured[0] / model[0]), "offset": 0.0}
+    (scale, offset), *_ = np.linalg.lstsq(np.column_stack([model, np.ones_like(model)]), measured, rcond=None)
+    return {"scale": float(scale), "offset": float(offset)}
+
+def load_calibration(path: str) -> dict:
+    """Read scale/offset and any GAS / MEMORY_BASE_WORDS overrides from a JSON file."""
+    global MEMORY_BASE_WORDS
+    with open(path) as f:
+        data = json.load(f)
+    GAS.update({k: v for k, v in data.get("gas", {}).items() if k in GAS})
+    MEMORY_BASE_WORDS = data.get("memory_base_words", MEMORY_BASE_WORDS)
+    return {k: float(data.get(k, v)) for k, v in DEFAULT_CALIBRATION.items()}
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def trait_costs(groups: dict, style: str, calibration: dict) -> list:
+    """One row per trait of every group, in E_TraitsGroup order."""
+    from Traits import ENUM_ORDER
+    group_names = ["Background_Group", "Special_1s_Group"] + ENUM_ORDER
+    renderer = SVGRenderer(groups, style)
+
+    rows = []
+    for g in sorted(groups):
+        group = groups[g]
+        for t, trait in enumerate(group.traits):
+            ops = layer_ops(group, trait, style)
+            if g == BACKGROUND_GROUP_INDEX:
+                svg = renderer.background(t)
+            else:
+                svg = renderer.layer(g, t)
+            source = trait if g == BACKGROUND_GROUP_INDEX else resolve_variant(group, trait)[0]
+            shapes = ops["encode_packed"] if style == STYLE_PATH else svg.count("<rect")
+            rows.append({
+                "group": group_names[g] if 0 <= g < len(group_names) else str(g),
+                "group_index": g,
+                "trait_index": t,
+                "trait": bytes(trait.trait_name).decode('utf-8', 'replace'),
+                "layer_type": f"0x{trait.layer_type:02X}",
+                "storage": "variant" if trait.layer_type == LAYER_VARIANT
+                           else "rects" if source.layer_type in RECT_LAYERS else "rle",
+                "shapes": shapes,
+                "svg_bytes": len(svg),
+                "mem_words": ops["mem_words"],
+                "gas": estimate_gas(ops, calibration),
+            })
+    return rows
+
+def write_costs(rows: list) -> str:
+    costs_file = os.path.join(OUTPUT_DIR, COSTS_FILENAME)
+    with open(costs_file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    return costs_file
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-trait SVG size and rendering gas estimator.")
+    parser.add_argument("--style", choices=(STYLE_RECT, STYLE_PATH), default=STYLE_RECT,
+                        help="renderer to model: rect is the deployed PathSVGRenderer.sol, "
+                             "path the unwired PathSVGRenderer2.sol (default: rect)")
+    parser.add_argument("--assets", nargs="+", default=None, metavar="FILE",
+                        help="asset files to load (default: output/*_asset.txt)")
+    parser.add_argument("--calibration", metavar="FILE", help="calibration JSON (scale/offset, gas overrides)")
+    parser.add_argument("--fit", metavar="SAMPLES", help="fit scale/offset from measured samples and save them")
+    parser.add_argument("--top", type=int, default=10, help="costliest layers to list (default: 10)")
+    args = parser.parse_args()
+
+    groups = load_trait_groups(args.assets or default_asset_files(), copy=False)
+    calibration = load_calibration(args.calibration) if args.calibration else dict(DEFAULT_CALIBRATION)
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    print("=" * 70)
+    print(f"Per-Trait Rendering Cost Model ({args.style} style)")
+    print("=" * 70)
+
+    if args.fit:
+        with open(args.fit) as f:
+            calibration = fit_calibration(groups, json.load(f), args.style)
+        calibration_file = os.path.join(OUTPUT_DIR, CALIBRATION_FILENAME)
+        with open(calibration_file, 'w') as f:
+            json.dump({**calibration, "gas": GAS, "memory_base_words": MEMORY_BASE_WORDS}, f, indent=2)
+        print(f"Fitted scale {calibration['scale']:.4f}, offset {calibration['offset']:.0f}")
+        print(f"Calibration written to: {calibration_file}")
+
+    rows = trait_costs(groups, args.style, calibration)
+    costs_file = write_costs(rows)
+
+    print(f"{'Group':<24} {'Traits':>6} {'Avg gas':>9} {'Max gas':>9} {'Avg SVG':>8}")
+    for name in dict.fromkeys(r["group"] for r in rows):
+        group_rows = [r for r in rows if r["group"] == name]
+        print(f"{name:<24} {len(group_rows):>6} {sum(r['gas'] for r in group_rows) // len(group_rows):>9} "
+              f"{max(r['gas'] for r in group_rows):>9} {sum(r['svg_bytes'] for r in group_rows) // len(group_rows):>8}")
+
+    print(f"\nCostliest {args.top} layers:")
+    for r in sorted(rows, key=lambda r: -r["gas"])[:args.top]:
+        print(f"  {r['gas']:>8} gas  {r['svg_bytes']:>6} B  {r['group']}:{r['trait_index']} {r['trait']}")
+
+    print("=" * 70)
+    print(f"Cost table written to: {costs_file}")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -31,17 +31,66 @@ Blob layout per trait group (identical to previous except palette entry size):
       [rowY:1][numRuns:1]
       Per opaque run:
         [x:1][length:1][paletteIndex: pSize bytes, big-endian]
+
+Rect mode (--rects [greedy|optimal]):
+  greedy:  same-color runs with identical x and length on consecutive rows are
+           stacked into w x h rectangles.
+  optimal: each color is split into the fewest possible rectangles
+           (RectCover.min_rect_partition); slower, offline only.
+  Any trait where that lowers the rect count is written in the rect format
+  instead, marked by its layerType:
+    0xFE = rects, 24x24 logical      0xFD = rects, 48x48 full-res
+    [numColors:1]
+    Per color, in palette order:
+      [paletteIndex: pSize bytes][numRects:1]
+      Per rect: [x:1][y:1][w:1][h:1]
+  All other traits keep the 2D RLE format, so the two can be mixed freely.
+  A per-trait report of rects saved is written to output/reports/traits_rects_report.txt.
+  Only the v2 libraries (PathSVGRenderer2.sol / TraitsLoader2.sol) decode
+  rect layers, and no contract imports them: Renderer.sol ships
+  PathSVGRenderer.sol / TraitsLoader.sol with the RGBA blobs from
+  TraitsAsset2DRLE.py. The gas and SVG-size savings only apply once the v2
+  pipeline is wired in.
+
+Color variant mode (--variants):
+  Traits whose pixels match an earlier trait in the group up to a one-to-one
+  color swap (Afro Black / Afro Blonde / ...) store no geometry of their own:
+    layerType 0xFC
+    [baseTraitIndex:1][numColors:1]
+    Per base color: [from: pSize bytes][to: pSize bytes]   palette indices
+  The renderer draws the base trait's runs or rects through the remap. The
+  base is always the first trait with that shape, so variants never chain.
+  Like rect layers, 0xFC is only understood by the unwired v2 libraries;
+  the deployed TraitsLoader.sol would misparse it, so the storage and
+  loadAsset savings do not reach anything that ships today.
 """
 
+import argparse
 import os
 import struct
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from PIL import Image
-from collections import Counter
 from dotenv import load_dotenv
 from pathlib import Path
+import FastLZ
+import RectCover
+import TraitsDecoder
+from AssetCache import GroupCache
+from FastLZ import compressed_path, write_compressed
+from RectCover import cover_grid
+from TraitsDecoder import (
+    LAYER_FULLRES, LAYER_LOGICAL, LAYER_RECTS, LAYER_RECTS_FULLRES, LAYER_VARIANT, RECT_LAYERS,
+    PALETTE_RGB, decode_layer_runs, decode_rects, decode_trait_group, resolve_variant,
+)
 
 load_dotenv()
 
+# Every module whose code shapes the encoded group bytes, hashed into the build cache key
+CACHE_SOURCES = [__file__, RectCover.__file__, FastLZ.__file__, TraitsDecoder.__file__]
+
 # ============================================================================
 # CONFIGURATION
 # ============================================================================
@@ -49,7 +98,12 @@ load_dotenv()
 BASE_PATH = Path(os.getenv("BASE_DIR", "."))
 TRAITS_DIR = BASE_PATH
 OUTPUT_DIR = "output"
+REPORTS_DIR = os.path.join(OUTPUT_DIR, "reports")
 COMBINED_FILENAME = "traits_asset.txt"
+RECTS_REPORT_FILENAME = "traits_rects_report.txt"
+
+RECTS_GREEDY = "greedy"
+RECTS_OPTIMAL = "optimal"
 
 # Source images are 48x48, drawn in 2x2 blocks.
 # We sample at 24x24 logical resolution (one sample per 2x2 block).
@@ -119,43 +173,42 @@ def normalize_trait_name(name: str) -> str:
             break
     return current
 
-def load_png_logical(filepath: str) -> list:
+def _load_png_rgba(filepath: str) -> np.ndarray:
+    """Decode a PNG into a contiguous uint8[48, 48, 4] RGBA array."""
+    img = Image.open(filepath).convert('RGBA')
+    if img.size != (SOURCE_WIDTH, SOURCE_HEIGHT):
+        img = img.resize((SOURCE_WIDTH, SOURCE_HEIGHT), Image.Resampling.NEAREST)
+    return np.asarray(img, dtype=np.uint8)
+
+def load_png_logical(filepath: str) -> np.ndarray:
     """
     Load a 48x48 PNG and sample it down to 24x24 logical resolution.
 
-    Reads the pixel at (lx*2, ly*2) for each logical position (lx, ly).
-    Since artwork is drawn in 2x2 blocks, all four pixels in each block are
-    the same color, so sampling the top-left corner is perfectly lossless.
+    Takes the pixel at (lx*2, ly*2) for each logical position (lx, ly) with a
+    single strided slice. Since artwork is drawn in 2x2 blocks, all four pixels
+    in each block are the same color, so sampling the top-left corner is
+    perfectly lossless.
 
-    Returns: 2D list [row][col] of (r, g, b, a) tuples at 24x24 resolution.
+    Returns: contiguous uint8[24, 24, 4] array of RGBA values, indexed [row, col].
     """
-    img = Image.open(filepath).convert('RGBA')
-    if img.size != (SOURCE_WIDTH, SOURCE_HEIGHT):
-        img = img.resize((SOURCE_WIDTH, SOURCE_HEIGHT), Image.Resampling.NEAREST)
-    pixels = img.load()
-    return [
-        [pixels[lx * 2, ly * 2] for lx in range(LOGICAL_WIDTH)]
-        for ly in range(LOGICAL_HEIGHT)
-    ]
+    return np.ascontiguousarray(_load_png_rgba(filepath)[::2, ::2])
 
-def load_png_fullres(filepath: str) -> list:
+def load_png_fullres(filepath: str) -> np.ndarray:
     """
     Load a 48x48 PNG at full resolution.
 
     Only used for the ~5 exception layers that have genuine single-pixel detail.
 
-    Returns: 2D list [row][col] of (r, g, b, a) tuples at 48x48 resolution.
+    Returns: contiguous uint8[48, 48, 4] array of RGBA values, indexed [row, col].
     """
-    img = Image.open(filepath).convert('RGBA')
-    if img.size != (SOURCE_WIDTH, SOURCE_HEIGHT):
-        img = img.resize((SOURCE_WIDTH, SOURCE_HEIGHT), Image.Resampling.NEAREST)
-    pixels = img.load()
-    return [
-        [pixels[x, y] for x in range(SOURCE_WIDTH)]
-        for y in range(SOURCE_HEIGHT)
-    ]
+    return np.ascontiguousarray(_load_png_rgba(filepath))
+
+def pack_rgba(grid: np.ndarray) -> np.ndarray:
+    """Pack a uint8[H, W, 4] RGBA grid into uint32[H, W] values of 0xRRGGBBAA."""
+    g = grid.astype(np.uint32)
+    return (g[..., 0] << 24) | (g[..., 1] << 16) | (g[..., 2] << 8) | g[..., 3]
 
-def compute_bounds(grid: list) -> tuple:
+def compute_bounds(grid: np.ndarray) -> tuple:
     """
     Compute the bounding box of all non-transparent pixels in a pixel grid.
 
@@ -163,23 +216,39 @@ def compute_bounds(grid: list) -> tuple:
     Returns (x1, y1, x2, y2) in the grid's own coordinate space.
     Returns (0, 0, 0, 0) for a fully transparent / empty image.
     """
-    height = len(grid)
-    width = len(grid[0]) if height > 0 else 0
-    x1, y1 = width, height
-    x2, y2 = -1, -1
-
-    for y in range(height):
-        for x in range(width):
-            _, _, _, a = grid[y][x]
-            if a > 0:
-                if x < x1: x1 = x
-                if y < y1: y1 = y
-                if x > x2: x2 = x
-                if y > y2: y2 = y
-
-    return (0, 0, 0, 0) if x2 == -1 else (x1, y1, x2, y2)
-
-def encode_2d_rle(grid: list, palette_map: dict, bounds: tuple, p_size: int) -> bytes:
+    opaque = grid[..., 3] > 0
+    rows = np.flatnonzero(opaque.any(axis=1))
+    if rows.size == 0:
+        return (0, 0, 0, 0)
+    cols = np.flatnonzero(opaque.any(axis=0))
+    return (int(cols[0]), int(rows[0]), int(cols[-1]), int(rows[-1]))
+
+def find_runs(grid: np.ndarray, bounds: tuple) -> tuple:
+    """
+    Locate every opaque horizontal run inside `bounds` in one vectorized pass.
+
+    A run is a maximal span of identical RGBA values within a row of the
+    bounding box. Transparent runs are dropped.
+
+    Returns (ys, xs, lengths, colors) as parallel int arrays in row-major order,
+    where colors are packed 0xRRGGBB values.
+    """
+    x1, y1, x2, y2 = bounds
+    packed = pack_rgba(grid[y1:y2 + 1, x1:x2 + 1])
+
+    # A run starts at the left edge of each row and wherever the color changes.
+    starts = np.ones(packed.shape, dtype=bool)
+    starts[:, 1:] = packed[:, 1:] != packed[:, :-1]
+
+    flat_starts = np.flatnonzero(starts)
+    lengths = np.diff(np.append(flat_starts, packed.size))
+    ys, xs = np.divmod(flat_starts, packed.shape[1])
+    values = packed.reshape(-1)[flat_starts]
+
+    opaque = (values & 0xFF) > 0
+    return (ys[opaque] + y1, xs[opaque] + x1, lengths[opaque], values[opaque] >> 8)
+
+def encode_2d_rle(grid: np.ndarray, palette_map: dict, bounds: tuple, p_size: int) -> bytes:
     """
     Encode 2D RLE from a pixel grid (24x24 logical or 48x48 full-res).
 
@@ -195,6 +264,7 @@ def encode_2d_rle(grid: list, palette_map: dict, bounds: tuple, p_size: int) ->
 
     All coordinates are in the grid's own space. For 24x24 logical grids the
     renderer multiplies by 2. For 48x48 full-res grids coordinates are used as-is.
+    `palette_map` is keyed by packed 0xRRGGBB values.
     """
     x1, y1, x2, y2 = bounds
 
@@ -202,40 +272,23 @@ def encode_2d_rle(grid: list, palette_map: dict, bounds: tuple, p_size: int) ->
     if x2 < x1:
         return bytes([0])
 
-    rows_data = []
-
-    for y in range(y1, y2 + 1):
-        runs = []
-        x = x1
-
-        while x <= x2:
-            r, g, b, a = grid[y][x]
-
-            # Extend this run as far as it goes (same RGBA value)
-            run_start = x
-            while x <= x2 and grid[y][x] == (r, g, b, a):
-                x += 1
-            run_length = x - run_start
-
-            # Only store opaque runs — transparent runs are silently skipped
-            if a > 0:
-                runs.append((run_start, run_length, (r, g, b)))
+    ys, xs, lengths, colors = find_runs(grid, bounds)
 
-        if runs:
-            rows_data.append((y, runs))
+    # Group runs by row; runs are already in row-major order.
+    row_ys, row_starts, row_counts = np.unique(ys, return_index=True, return_counts=True)
 
     output = bytearray()
-    output.append(len(rows_data))  # numRows
+    output.append(len(row_ys))  # numRows
 
-    for (row_y, runs) in rows_data:
+    for row_y, start, count in zip(row_ys.tolist(), row_starts.tolist(), row_counts.tolist()):
         output.append(row_y)        # rowY
-        output.append(len(runs))    # numRuns
+        output.append(count)        # numRuns
 
-        for (x_pos, length, rgb) in runs:
-            output.append(x_pos)    # x
-            output.append(length)   # run length (in grid units)
+        for i in range(start, start + count):
+            output.append(int(xs[i]))       # x
+            output.append(int(lengths[i]))  # run length (in grid units)
 
-            color_idx = palette_map[rgb]
+            color_idx = palette_map[int(colors[i])]
             if p_size == 2:
                 output.extend(struct.pack('>H', color_idx))
             else:
@@ -243,12 +296,115 @@ def encode_2d_rle(grid: list, palette_map: dict, bounds: tuple, p_size: int) ->
 
     return bytes(output)
 
+def merge_runs_into_rects(ys, xs, lengths, colors) -> list:
+    """
+    Greedily stack identical runs (same x, length and color) on consecutive
+    rows into rectangles. Takes the row-major output of find_runs and returns
+    [x, y, w, h, color] lists ordered by their top row.
+    """
+    rects = []
+    open_rects = {}   # (x, length, color) -> rect whose bottom row is the previous row
+    next_open = {}
+    current_y = None
+
+    for y, x, w, color in zip(ys.tolist(), xs.tolist(), lengths.tolist(), colors.tolist()):
+        if y != current_y:
+            open_rects, next_open, current_y = (next_open if current_y == y - 1 else {}), {}, y
+        key = (x, w, color)
+        rect = open_rects.get(key)
+        if rect is not None:
+            rect[3] += 1
+        else:
+            rect = [x, y, w, 1, color]
+            rects.append(rect)
+        next_open[key] = rect
+
+    return rects
+
+def encode_rects(rects: list, palette_map: dict, p_size: int):
+    """
+    Encode merged rectangles in the rect layer format, one block per color in
+    palette order. Returns None if a count does not fit its 1-byte field.
+    """
+    by_color = {}
+    for x, y, w, h, color in rects:
+        by_color.setdefault(palette_map[color], []).append((x, y, w, h))
+    if len(by_color) > 255 or any(len(r) > 255 for r in by_color.values()):
+        return None
+
+    output = bytearray()
+    output.append(len(by_color))  # numColors
+    for color_idx in sorted(by_color):
+        color_rects = by_color[color_idx]
+        if p_size == 2:
+            output.extend(struct.pack('>H', color_idx))
+        else:
+            output.append(color_idx)
+        output.append(len(color_rects))
+        for rect in color_rects:
+            output.extend(rect)
+    return bytes(output)
+
+def color_shape(grid: np.ndarray) -> tuple:
+    """
+    Split a grid into a color-free shape key and its colors.
+
+    Opaque colors are relabelled in order of first appearance (row-major), so
+    two grids get the same key exactly when one is a one-to-one recoloring of
+    the other. Returns (key, colors) with colors[label] as packed 0xRRGGBB.
+    """
+    opaque = grid[..., 3] > 0
+    rgb = (pack_rgba(grid) >> 8).astype(np.int64)
+    values, first_seen, inverse = np.unique(
+        np.where(opaque, rgb, -1).reshape(-1), return_index=True, return_inverse=True
+    )
+    order = np.argsort(first_seen)
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    labels = rank[inverse].astype(np.int16).reshape(grid.shape[:2])
+
+    colors = [int(v) for v in values[order] if v >= 0]
+    key = (grid.shape, labels.tobytes(), opaque.tobytes())
+    return key, colors
+
+def encode_variant(base_index: int, base_colors: list, colors: list, palette_map: dict, p_size: int):
+    """Encode a LAYER_VARIANT remap onto trait `base_index`, or None if it cannot be expressed."""
+    if len(colors) > 255:
+        return None
+    output = bytearray([base_index, len(colors)])
+    for base_rgb, rgb in zip(base_colors, colors):
+        if p_size == 2:
+            output.extend(struct.pack('>HH', palette_map[base_rgb], palette_map[rgb]))
+        else:
+            output.extend([palette_map[base_rgb], palette_map[rgb]])
+    return bytes(output)
+
+def build_palette(grids: list) -> list:
+    """
+    Build a shared palette of packed 0xRRGGBB values from the opaque pixels of
+    every grid, ordered by frequency so the most common colors get the lowest
+    indices. Ties keep first-seen order (row-major, grid by grid).
+    """
+    opaque = [pack_rgba(g)[g[..., 3] > 0] >> 8 for g in grids]
+    all_rgb = np.concatenate(opaque) if opaque else np.zeros(0, dtype=np.uint32)
+    if all_rgb.size == 0:
+        return []
+
+    colors, first_seen, counts = np.unique(all_rgb, return_index=True, return_counts=True)
+    order = np.lexsort((first_seen, -counts))
+    return colors[order].tolist()
+
 # ============================================================================
 # GROUP ENCODER
 # ============================================================================
 
-def encode_trait_group(trait_dir: str, display_name: str):
-    """Encode an entire trait group into the binary blob format."""
+def encode_trait_group(trait_dir: str, display_name: str, rects: str = None, variants: bool = False):
+    """
+    Encode an entire trait group into the binary blob format. With `rects` set
+    to RECTS_GREEDY or RECTS_OPTIMAL, traits that merge into fewer rectangles
+    than runs use the rect format. With `variants`, recolorings of an earlier
+    trait are stored as LAYER_VARIANT palette remaps.
+    """
     if not os.path.exists(trait_dir):
         return None
 
@@ -274,15 +430,7 @@ def encode_trait_group(trait_dir: str, display_name: str):
 
     # Build a shared palette from ALL opaque pixels across all traits in this group.
     # Only RGB values are stored — transparent pixels are excluded completely.
-    all_rgb = []
-    for t in traits_data:
-        for row in t['grid']:
-            for (r, g, b, a) in row:
-                if a > 0:
-                    all_rgb.append((r, g, b))
-
-    # Order by frequency so the most common colors get the lowest indices.
-    palette = [c for c, _ in Counter(all_rgb).most_common()]
+    palette = build_palette([t['grid'] for t in traits_data])
     palette_map = {rgb: idx for idx, rgb in enumerate(palette)}
     p_size = 2 if len(palette) > 255 else 1
 
@@ -295,8 +443,8 @@ def encode_trait_group(trait_dir: str, display_name: str):
 
     # ── 2. Palette (RGB only, 3 bytes per entry — was 4 bytes RGBA) ────────────
     output.extend(struct.pack('>H', len(palette)))  # big-endian uint16 count
-    for (r, g, b) in palette:
-        output.extend([r, g, b])
+    for rgb in palette:
+        output.extend([(rgb >> 16) & 0xFF, (rgb >> 8) & 0xFF, rgb & 0xFF])
 
     # ── 3. Settings ────────────────────────────────────────────────────────────
     output.append(p_size)  # paletteIndexByteSize: 1 or 2
@@ -311,12 +459,31 @@ def encode_trait_group(trait_dir: str, display_name: str):
         output.append(0)             # numRows = 0 (empty RLE data)
 
     # ── 5. Real traits ─────────────────────────────────────────────────────────
-    for t in traits_data:
+    shapes = {}  # color_shape key -> (trait index, colors) of the first trait with that shape
+    first_index = 1 if INCLUDE_NONE_TRAIT else 0
+    for trait_index, t in enumerate(traits_data, start=first_index):
         bounds = compute_bounds(t['grid'])
         rle_data = encode_2d_rle(t['grid'], palette_map, bounds, p_size)
 
         # layerType: 0xFF = full-res 48x48 exception, 0 = normal 24x24 logical
-        layer_type = 0xFF if t['full_res'] else 0
+        layer_type = LAYER_FULLRES if t['full_res'] else LAYER_LOGICAL
+
+        if rects and bounds[2] >= bounds[0]:
+            runs = find_runs(t['grid'], bounds)
+            merged = cover_grid(t['grid']) if rects == RECTS_OPTIMAL else merge_runs_into_rects(*runs)
+            rect_data = encode_rects(merged, palette_map, p_size) if len(merged) < len(runs[0]) else None
+            if rect_data is not None:
+                rle_data = rect_data
+                layer_type = LAYER_RECTS_FULLRES if t['full_res'] else LAYER_RECTS
+
+        if variants:
+            key, colors = color_shape(t['grid'])
+            base_index, base_colors = shapes.setdefault((key, t['full_res']), (trait_index, colors))
+            if base_index != trait_index:
+                variant_data = encode_variant(base_index, base_colors, colors, palette_map, p_size)
+                if variant_data is not None and len(variant_data) < len(rle_data):
+                    rle_data = variant_data
+                    layer_type = LAYER_VARIANT
 
         output.extend([bounds[0], bounds[1], bounds[2], bounds[3]])  # x1 y1 x2 y2
         output.append(layer_type)
@@ -333,35 +500,260 @@ def encode_trait_group(trait_dir: str, display_name: str):
 # MAIN
 # ============================================================================
 
+def make_group_cache(enabled: bool = True, rects: str = None, variants: bool = False) -> GroupCache:
+    """Build cache keyed on every setting that changes the encoded bytes."""
+    settings = {
+        'RECTS': rects,
+        'VARIANTS': variants,
+        'FULL_RES_TRAITS': sorted(FULL_RES_TRAITS),
+        'INCLUDE_NONE_TRAIT': INCLUDE_NONE_TRAIT,
+        'SOURCE_SIZE': (SOURCE_WIDTH, SOURCE_HEIGHT),
+        'LOGICAL_SIZE': (LOGICAL_WIDTH, LOGICAL_HEIGHT),
+    }
+    return GroupCache("traits", settings, CACHE_SOURCES, enabled=enabled)
+
+def encode_enum_group(enum_name: str, use_cache: bool = True, rects: str = None, variants: bool = False):
+    """
+    Encode the trait group for one ENUM_ORDER entry. Safe to run in a worker process.
+
+    Returns (data, cached): data is None when the folder is missing or empty,
+    cached is True when the blob came from the content-hash build cache.
+    """
+    folder_display_name = enum_to_display_name(enum_name)
+    trait_group_name = strip_gender_prefix(folder_display_name)
+    trait_dir = os.path.join(TRAITS_DIR, folder_display_name)
+
+    if not os.path.isdir(trait_dir):
+        return None, False
+
+    cache = make_group_cache(use_cache, rects, variants)
+    png_paths = [os.path.join(trait_dir, f) for f in sorted(os.listdir(trait_dir)) if f.endswith('.png')]
+    key = cache.key(trait_group_name, png_paths)
+
+    data = cache.load(key)
+    if data is not None:
+        return data, True
+
+    data = encode_trait_group(trait_dir, trait_group_name, rects, variants)
+    if data:
+        cache.store(key, data)
+    return data, False
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="2D RLE asset encoder for RetroPunks trait groups.")
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1, metavar="N",
+        help="encode trait groups in N worker processes (0 = one per CPU core, default: 1)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="ignore the content-hash build cache and re-encode every group",
+    )
+    parser.add_argument(
+        "--compress", action="store_true",
+        help="also write LibZip-compatible FastLZ blobs to traits_asset_compressed.txt",
+    )
+    parser.add_argument(
+        "--rects", nargs="?", const=RECTS_GREEDY, choices=(RECTS_GREEDY, RECTS_OPTIMAL), default=None,
+        help="merge runs into w x h rects where it saves rects (rect layer format) and report savings; "
+             "'optimal' solves the minimum rectangle partition per color (default: greedy). "
+             "v2 libraries only, not decoded by the deployed TraitsLoader.sol",
+    )
+    parser.add_argument(
+        "--variants", action="store_true",
+        help="store traits that are recolorings of an earlier trait as palette remaps (LAYER_VARIANT); "
+             "v2 libraries only, not decoded by the deployed TraitsLoader.sol",
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="after the full build, poll BASE_DIR and re-encode only the groups that change",
+    )
+    parser.add_argument(
+        "--interval", type=float, default=0.5, metavar="SECONDS",
+        help="polling interval for --watch (default: 0.5)",
+    )
+    return parser.parse_args()
+
+# ============================================================================
+# RECT REPORT
+# ============================================================================
+
+def rect_counts(data: bytes) -> list:
+    """
+    Return (trait_name, runs, rects) for every trait in an encoded group. Runs
+    are what the 2D RLE format would store; rects are what the blob renders.
+    """
+    group = decode_trait_group(data, palette_format=PALETTE_RGB, copy=False)
+    counts = []
+    for trait in group.traits:
+        runs = len(decode_layer_runs(group, trait))
+        source, _ = resolve_variant(group, trait)
+        if source.layer_type in RECT_LAYERS:
+            rects = len(decode_rects(source.trait_data, group.palette_index_byte_size))
+        else:
+            rects = runs
+        counts.append((bytes(trait.trait_name).decode('utf-8'), runs, rects))
+    return counts
+
+def write_rect_report(blobs: dict) -> tuple:
+    """Write the per-trait runs vs rects table. Returns (report_file, total_runs, total_rects)."""
+    lines = [f"{'Group':<24} {'Trait':<36} {'Runs':>6} {'Rects':>6} {'Saved':>6}"]
+    total_runs = total_rects = 0
+    for enum_name in ENUM_ORDER:
+        if enum_name not in blobs:
+            continue
+        for trait_name, runs, rects in rect_counts(blobs[enum_name]):
+            total_runs += runs
+            total_rects += rects
+            if runs:
+                lines.append(f"{enum_name:<24} {trait_name:<36} {runs:>6} {rects:>6} {runs - rects:>6}")
+    lines.append(f"{'TOTAL':<24} {'':<36} {total_runs:>6} {total_rects:>6} {total_runs - total_rects:>6}")
+
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    report_file = os.path.join(REPORTS_DIR, RECTS_REPORT_FILENAME)
+    with open(report_file, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+    return report_file, total_runs, total_rects
+
+# ============================================================================
+# WATCH MODE
+# ============================================================================
+
+def snapshot_group(enum_name: str) -> dict:
+    """Return {filename: (mtime_ns, size)} for every PNG in one group folder."""
+    trait_dir = os.path.join(TRAITS_DIR, enum_to_display_name(enum_name))
+    state = {}
+    try:
+        entries = os.scandir(trait_dir)
+    except FileNotFoundError:
+        return state
+    with entries:
+        for entry in entries:
+            if entry.name.endswith('.png') and entry.is_file():
+                st = entry.stat()
+                state[entry.name] = (st.st_mtime_ns, st.st_size)
+    return state
+
+def write_combined(blobs: dict, compress: bool = False) -> str:
+    """
+    Write every encoded group to traits_asset.txt in ENUM_ORDER. Atomic.
+    With `compress`, also write the FastLZ form to traits_asset_compressed.txt.
+    """
+    entries = [(name, blobs[name]) for name in ENUM_ORDER if name in blobs]
+    output_file = os.path.join(OUTPUT_DIR, COMBINED_FILENAME)
+    tmp_file = f"{output_file}.tmp"
+    with open(tmp_file, 'w') as f:
+        f.write("\n\n".join(f"{name}: 0x{data.hex()}" for name, data in entries))
+    os.replace(tmp_file, output_file)
+
+    if compress:
+        write_compressed(compressed_path(output_file), entries)
+    return output_file
+
+def watch(blobs: dict, interval: float, use_cache: bool, compress: bool, rects: str = None,
+          variants: bool = False):
+    """
+    Poll every ENUM_ORDER folder under BASE_DIR. When a group's PNG set or any
+    file's mtime/size changes, re-encode just that group and rewrite its line
+    in traits_asset.txt; all other lines are left untouched.
+    """
+    snapshots = {name: snapshot_group(name) for name in ENUM_ORDER}
+
+    print(f"Watching {TRAITS_DIR} (every {interval}s, Ctrl+C to stop)...")
+    try:
+        while True:
+            time.sleep(interval)
+            changed = []
+            for enum_name in ENUM_ORDER:
+                state = snapshot_group(enum_name)
+                if state != snapshots[enum_name]:
+                    snapshots[enum_name] = state
+                    changed.append(enum_name)
+
+            if not changed:
+                continue
+
+            for enum_name in changed:
+                start = time.perf_counter()
+                data, cached = encode_enum_group(enum_name, use_cache=use_cache, rects=rects, variants=variants)
+                elapsed = (time.perf_counter() - start) * 1000
+                print(f"  {enum_to_display_name(enum_name)}:", end=" ")
+                if data:
+                    blobs[enum_name] = data
+                    print(f"✓ {'CACHED' if cached else 'DONE'} ({len(data)} bytes, {elapsed:.0f} ms)")
+                else:
+                    blobs.pop(enum_name, None)
+                    print("⊗ REMOVED (not found or empty)")
+
+            write_combined(blobs, compress)
+            if rects:
+                write_rect_report(blobs)
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
 def main():
+    args = parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
     os.makedirs(OUTPUT_DIR, exist_ok=True)
-    combined_output = []
+    blobs = {}
 
     print("=" * 70)
     print("2D RLE Asset Encoder for RetroPunks — 24x24 logical / RGB palette")
+    if jobs > 1:
+        print(f"Parallel mode: {jobs} worker processes")
     print("=" * 70)
 
-    for enum_name in ENUM_ORDER:
-        folder_display_name = enum_to_display_name(enum_name)
-        trait_group_name = strip_gender_prefix(folder_display_name)
-        trait_dir = os.path.join(TRAITS_DIR, folder_display_name)
-
-        print(f"Processing: {folder_display_name} (as '{trait_group_name}')...", end=" ")
+    # Groups are independent, so they can be encoded in any order. Results are
+    # always consumed in ENUM_ORDER so traits_asset.txt stays deterministic.
+    encode = partial(encode_enum_group, use_cache=not args.no_cache, rects=args.rects, variants=args.variants)
+    if jobs > 1:
+        pool = ProcessPoolExecutor(max_workers=jobs)
+        results = pool.map(encode, ENUM_ORDER)
+    else:
+        pool = None
+        results = map(encode, ENUM_ORDER)
+
+    try:
+        for enum_name, (data, cached) in zip(ENUM_ORDER, results):
+            folder_display_name = enum_to_display_name(enum_name)
+            trait_group_name = strip_gender_prefix(folder_display_name)
+
+            print(f"Processing: {folder_display_name} (as '{trait_group_name}')...", end=" ")
+
+            if data:
+                blobs[enum_name] = data
+                print(f"✓ {'CACHED' if cached else 'DONE'} ({len(data)} bytes)")
+            else:
+                print("⊗ SKIPPED (not found or empty)")
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
-        data = encode_trait_group(trait_dir, trait_group_name)
-        if data:
-            combined_output.append(f"{enum_name}: 0x{data.hex()}")
-            print(f"✓ DONE ({len(data)} bytes)")
-        else:
-            print("⊗ SKIPPED (not found or empty)")
-
-    output_file = os.path.join(OUTPUT_DIR, COMBINED_FILENAME)
-    with open(output_file, 'w') as f:
-        f.write("\n\n".join(combined_output))
+    output_file = write_combined(blobs, args.compress)
 
     print("=" * 70)
     print(f"Output written to: {output_file}")
+    if args.compress:
+        print(f"Compressed output: {compressed_path(output_file)}")
+    if args.variants:
+        variants = sum(
+            t.layer_type == LAYER_VARIANT
+            for data in blobs.values()
+            for t in decode_trait_group(data, palette_format=PALETTE_RGB, copy=False).traits
+        )
+        print(f"Color variants:    {variants} traits stored as palette remaps "
+              f"({sum(map(len, blobs.values()))} bytes total)")
+    if args.rects:
+        report_file, total_runs, total_rects = write_rect_report(blobs)
+        saved = total_runs - total_rects
+        print(f"Rect report:       {report_file} ({total_runs} runs -> {total_rects} rects, "
+              f"{saved} saved, {saved / max(total_runs, 1):.1%})")
     print("=" * 70)
 
+    if args.watch:
+        watch(blobs, args.interval, use_cache=not args.no_cache, compress=args.compress, rects=args.rects,
+              variants=args.variants)
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
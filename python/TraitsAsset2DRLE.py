@@ -4,12 +4,15 @@
 Generates optimized 2D RLE data for direct SVG rect rendering (no bitmap, no PNG)
 Gas optimized: no LZ77 compression, row-based RLE for efficient rect emission
 """
+import argparse
 import os
 import struct
+import numpy as np
 from PIL import Image
-from collections import Counter
 from dotenv import load_dotenv
 from pathlib import Path
+from AssetCache import GroupCache
+from FastLZ import compressed_path, write_compressed
 
 load_dotenv()
 
@@ -87,36 +90,27 @@ def normalize_trait_name(name: str) -> str:
     return current
 
 def load_png_as_rgba(filepath):
-    """Load PNG and return 2D pixel array."""
+    """Load PNG and return a uint32[H, W] array of packed 0xRRGGBBAA pixels."""
     img = Image.open(filepath).convert('RGBA')
     if img.size != (CANVAS_WIDTH, CANVAS_HEIGHT):
         img = img.resize((CANVAS_WIDTH, CANVAS_HEIGHT), Image.Resampling.NEAREST)
     
-    pixels = []
-    for y in range(CANVAS_HEIGHT):
-        row = []
-        for x in range(CANVAS_WIDTH):
-            r, g, b, a = img.getpixel((x, y))
-            # Keep full transparency as 0
-            row.append(0 if a == 0 else rgba_to_packed(r, g, b, a))
-        pixels.append(row)
+    rgba = np.asarray(img, dtype=np.uint32)
+    pixels = rgba_to_packed(rgba[..., 0], rgba[..., 1], rgba[..., 2], rgba[..., 3])
+    # Keep full transparency as 0
+    pixels[rgba[..., 3] == 0] = 0
     
     return pixels
 
 def compute_bounds(pixels):
     """Compute bounding box of non-transparent pixels."""
-    x1, y1, x2, y2 = CANVAS_WIDTH, CANVAS_HEIGHT, -1, -1
-    
-    for y in range(CANVAS_HEIGHT):
-        for x in range(CANVAS_WIDTH):
-            color = pixels[y][x]
-            if (color & 0xFF) > 0:  # Check alpha > 0
-                x1 = min(x1, x)
-                y1 = min(y1, y)
-                x2 = max(x2, x)
-                y2 = max(y2, y)
-    
-    return (0, 0, 0, 0) if x2 == -1 else (x1, y1, x2, y2)
+    visible = (pixels & 0xFF) > 0  # alpha > 0
+    rows = np.flatnonzero(visible.any(axis=1))
+    if rows.size == 0:
+        return (0, 0, 0, 0)
+    cols = np.flatnonzero(visible.any(axis=0))
+    
+    return (int(cols[0]), int(rows[0]), int(cols[-1]), int(rows[-1]))
 
 def encode_2d_rle(pixels, palette_map, bounds, p_size):
     """
@@ -137,36 +131,30 @@ def encode_2d_rle(pixels, palette_map, bounds, p_size):
     if x1 > x2:
         return b""
     
-    # Collect non-empty rows
+    # Run starts: left edge of each row plus every color change (vectorized)
+    window = pixels[y1:y2 + 1, x1:x2 + 1]
+    starts = np.ones(window.shape, dtype=bool)
+    starts[:, 1:] = window[:, 1:] != window[:, :-1]
+    
+    flat_starts = np.flatnonzero(starts)
+    lengths = np.diff(np.append(flat_starts, window.size))
+    ys, xs = np.divmod(flat_starts, window.shape[1])
+    colors = window.reshape(-1)[flat_starts]
+    
+    # Only store non-transparent runs
+    visible = (colors & 0xFF) > 0  # alpha > 0
+    
+    # Collect non-empty rows (runs are already in row-major order)
     rows_data = []
-    for y in range(y1, y2 + 1):
-        row_runs = []
-        x = x1
-        
-        while x <= x2:
-            color = pixels[y][x]
-            
-            # Find run length for this color
-            run_start = x
-            while x <= x2 and pixels[y][x] == color:
-                x += 1
-            
-            run_length = x - run_start
-            
-            # Only store non-transparent runs
-            if (color & 0xFF) > 0:  # alpha > 0
-                row_runs.append({
-                    'x': run_start,
-                    'length': run_length,
-                    'color': color
-                })
-        
-        # Only store rows that have visible pixels
-        if row_runs:
-            rows_data.append({
-                'y': y,
-                'runs': row_runs
-            })
+    for y, x, length, color in zip((ys[visible] + y1).tolist(), (xs[visible] + x1).tolist(),
+                                   lengths[visible].tolist(), colors[visible].tolist()):
+        if not rows_data or rows_data[-1]['y'] != y:
+            rows_data.append({'y': y, 'runs': []})
+        rows_data[-1]['runs'].append({
+            'x': x,
+            'length': length,
+            'color': color
+        })
     
     # Encode to bytes
     output = bytearray()
@@ -208,13 +196,11 @@ def encode_trait_group(trait_dir, display_name):
             'pixels': load_png_as_rgba(os.path.join(trait_dir, f))
         })
     
-    # Build palette from all colors
-    all_colors = []
-    for t in traits_data:
-        for row in t['pixels']:
-            all_colors.extend(row)
-    
-    palette = [c for c, _ in Counter(all_colors).most_common()]
+    # Build palette from all colors (most common first, ties keep first-seen order)
+    all_colors = np.concatenate([t['pixels'].reshape(-1) for t in traits_data]) \
+                 if traits_data else np.zeros(0, dtype=np.uint32)
+    colors, first_seen, counts = np.unique(all_colors, return_index=True, return_counts=True)
+    palette = colors[np.lexsort((first_seen, -counts))].tolist()
     palette_map = {color: idx for idx, color in enumerate(palette)}
     p_size = 2 if len(palette) > 255 else 1
     
@@ -267,9 +253,38 @@ def encode_trait_group(trait_dir, display_name):
     
     return bytes(output)
 
+def encode_trait_group_cached(cache, trait_dir, display_name):
+    """Encode a trait group, reusing the cached blob if no input changed."""
+    if not os.path.exists(trait_dir):
+        return None, False
+    
+    png_paths = [os.path.join(trait_dir, f) for f in sorted(os.listdir(trait_dir)) if f.endswith('.png')]
+    key = cache.key(display_name, png_paths)
+    data = cache.load(key)
+    if data is not None:
+        return data, True
+    
+    data = encode_trait_group(trait_dir, display_name)
+    if data:
+        cache.store(key, data)
+    return data, False
+
 def main():
+    parser = argparse.ArgumentParser(description="2D RLE asset encoder for RetroPunks trait groups.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignore the content-hash build cache and re-encode every group")
+    parser.add_argument("--compress", action="store_true",
+                        help="also write LibZip-compatible FastLZ blobs to traits_asset_compressed.txt")
+    args = parser.parse_args()
+    
+    cache = GroupCache("traits_2drle", {
+        'CANVAS_SIZE': (CANVAS_WIDTH, CANVAS_HEIGHT),
+        'INCLUDE_NONE_TRAIT': INCLUDE_NONE_TRAIT,
+    }, __file__, enabled=not args.no_cache)
+    
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     combined_output = []
+    entries = []
     
     print("=" * 70)
     print("2D RLE Asset Encoder for RetroPunks")
@@ -284,10 +299,11 @@ def main():
         print(f"Processing: {folder_display_name}", end=" ")
         print(f"(encoding as '{trait_group_name}')...", end=" ")
         
-        data = encode_trait_group(trait_dir, trait_group_name)
+        data, cached = encode_trait_group_cached(cache, trait_dir, trait_group_name)
         if data:
             combined_output.append(f"{enum_name}: 0x{data.hex()}")
-            print(f"✓ DONE ({len(data)} bytes, no compression)")
+            entries.append((enum_name, data))
+            print(f"✓ {'CACHED' if cached else 'DONE'} ({len(data)} bytes, no compression)")
         else:
             print("⊗ SKIPPED (not found)")
     
@@ -298,6 +314,11 @@ def main():
     
     print("=" * 70)
     print(f"Output written to: {output_file}")
+    if args.compress:
+        compressed_file = compressed_path(output_file)
+        sizes = write_compressed(compressed_file, entries)
+        total, compressed_total = sum(size[1] for size in sizes), sum(size[2] for size in sizes)
+        print(f"Compressed: {total} -> {compressed_total} bytes -> {compressed_file}")
     print("=" * 70)
 
 if __name__ == '__main__':
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Trait Group Blob Decoder for RetroPunks
+
+Reads back what the asset encoders write, walking the blob exactly like
+TraitsLoader.loadAndCacheTraitGroup (src/libraries/TraitsLoader.sol and
+TraitsLoader2.sol), so format bugs show up here instead of on-chain.
+
+Palette variants:
+  PALETTE_RGBA (4 bytes/entry)   TraitsLoader  — BackgroundAssetGen.py,
+                                 TraitsAsset2DRLE.py, SpecialAsset2DRLE.py
+  PALETTE_RGB  (3 bytes/entry)   TraitsLoader2 — Traits.py; alpha rebuilt as 0xFF
+If no variant is given, both are tried and the one that consumes the blob
+exactly is used.
+
+Per-trait data is kept as a slice of the blob, like TraitInfo.traitData. With
+copy=False every slice is a zero-copy memoryview, which keeps bulk checks of
+all 27 groups cheap; call decode_rle() only on the traits you need.
+
+Usage:
+  python3 TraitsDecoder.py              verify every output/*_asset.txt (and *_asset_compressed.txt) file
+  python3 TraitsDecoder.py FILE ...     verify the given asset files
+  (*_compressed.txt files are FastLZ-decompressed first)
+"""
+
+import os
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, field
+from FastLZ import ASSET_SUFFIX, COMPRESSED_SUFFIX, compressed_path, flz_decompress, read_asset_lines
+
+OUTPUT_DIR = "output"
+
+PALETTE_RGBA = 4
+PALETTE_RGB = 3
+
+# E_TraitsGroup.Background_Group
+BACKGROUND_GROUP_INDEX = 0
+
+# E_Background_Type
+BG_NONE = 0
+BG_IMAGE = 1
+BG_SOLID = 2
+BG_GRADIENTS = range(3, 12)   # S_Vertical .. Radial
+
+# Trait layerType for every other group
+LAYER_LOGICAL = 0x00          # 2D RLE, 24x24 logical
+LAYER_FULLRES = 0xFF          # 2D RLE, 48x48
+LAYER_RECTS = 0xFE            # w x h rects, 24x24 logical
+LAYER_RECTS_FULLRES = 0xFD    # w x h rects, 48x48
+LAYER_VARIANT = 0xFC          # another trait's geometry with a palette remap
+RECT_LAYERS = (LAYER_RECTS, LAYER_RECTS_FULLRES)
+
+# ============================================================================
+# STRUCTURES
+# ============================================================================
+
+@dataclass
+class TraitInfo:
+    """Mirror of the Solidity TraitInfo struct."""
+    trait_name: bytes
+    layer_type: int
+    x1: int
+    y1: int
+    x2: int
+    y2: int
+    trait_data: bytes          # memoryview when decoded with copy=False
+
+@dataclass
+class TraitGroup:
+    """Mirror of the Solidity TraitGroup struct. Palette entries are 0xRRGGBBAA."""
+    trait_group_index: int
+    trait_group_name: bytes
+    palette_rgba: array = field(default_factory=lambda: array('I'))
+    palette_index_byte_size: int = 0
+    traits: list = field(default_factory=list)
+
+@dataclass
+class RLERuns:
+    """2D RLE runs as parallel columns, one entry per opaque run in row order."""
+    ys: array
+    xs: array
+    lengths: array
+    palette_indices: array
+
+    def __len__(self):
+        return len(self.xs)
+
+@dataclass
+class Rects:
+    """Rect-encoded layer as parallel columns, grouped by palette index in storage order."""
+    xs: array
+    ys: array
+    widths: array
+    heights: array
+    palette_indices: array
+
+    def __len__(self):
+        return len(self.xs)
+
+# ============================================================================
+# DECODING
+# ============================================================================
+
+def _parse_2d_rle_length(data, index: int, p_size: int) -> int:
+    """Return the index just past the 2D RLE block starting at `index`."""
+    num_rows = data[index]
+    index += 1
+    for _ in range(num_rows):
+        num_runs = data[index + 1]   # skip rowY
+        index += 2 + num_runs * (2 + p_size)
+    return index
+
+def _parse_rects_length(data, index: int, p_size: int) -> int:
+    """Return the index just past the rect block starting at `index`."""
+    num_colors = data[index]
+    index += 1
+    for _ in range(num_colors):
+        num_rects = data[index + p_size]
+        index += p_size + 1 + num_rects * 4
+    return index
+
+def _decode_palette(data, index: int, palette_format: int) -> tuple:
+    palette_size = (data[index] << 8) | data[index + 1]
+    index += 2
+    end = index + palette_size * palette_format
+    if end > len(data):
+        raise ValueError(f"palette of {palette_size} entries runs past end of blob")
+
+    raw = bytes(data[index:end])
+    if palette_format == PALETTE_RGBA:
+        palette = array('I', struct.unpack(f">{palette_size}I", raw))
+    else:
+        palette = array('I', (
+            (raw[i] << 24) | (raw[i + 1] << 16) | (raw[i + 2] << 8) | 0xFF
+            for i in range(0, len(raw), 3)
+        ))
+    return palette, end
+
+def _decode(blob, group_index: int, palette_format: int, copy: bool) -> TraitGroup:
+    data = memoryview(blob).toreadonly()
+    group = TraitGroup(trait_group_index=group_index, trait_group_name=b"")
+
+    name_length = data[0]
+    group.trait_group_name = bytes(data[1:1 + name_length])
+    index = 1 + name_length
+
+    group.palette_rgba, index = _decode_palette(data, index, palette_format)
+
+    group.palette_index_byte_size = data[index]
+    trait_count = data[index + 1]
+    index += 2
+    p_size = group.palette_index_byte_size
+
+    for _ in range(trait_count):
+        x1, y1, x2, y2, layer_type, trait_name_length = data[index:index + 6]
+        index += 6
+
+        trait_name = data[index:index + trait_name_length]
+        index += trait_name_length
+
+        start_of_data = index
+        if group_index == BACKGROUND_GROUP_INDEX:
+            if layer_type == BG_SOLID:
+                index += p_size
+            elif layer_type in BG_GRADIENTS:
+                index += p_size * 2
+            elif layer_type == BG_IMAGE:
+                index = _parse_2d_rle_length(data, index, p_size)
+        elif layer_type in RECT_LAYERS:
+            index = _parse_rects_length(data, index, p_size)
+        elif layer_type == LAYER_VARIANT:
+            index += 2 + data[index + 1] * 2 * p_size
+        else:
+            index = _parse_2d_rle_length(data, index, p_size)
+
+        if index > len(data):
+            raise ValueError(f"trait {bytes(trait_name)!r} runs past end of blob")
+
+        trait_data = data[start_of_data:index]
+        if copy:
+            trait_name, trait_data = bytes(trait_name), bytes(trait_data)
+        group.traits.append(TraitInfo(trait_name, layer_type, x1, y1, x2, y2, trait_data))
+
+    if index != len(data):
+        raise ValueError(f"{len(data) - index} trailing bytes after last trait")
+    return group
+
+def decode_trait_group(blob, group_index: int = -1, palette_format: int = None,
+                       copy: bool = True) -> TraitGroup:
+    """
+    Decode one trait group blob (already FastLZ-decompressed).
+
+    group_index is the E_TraitsGroup value; only Background_Group (0) changes
+    how trait data is delimited. palette_format is PALETTE_RGB, PALETTE_RGBA or
+    None to detect it. With copy=False, trait names and data are memoryviews
+    into `blob` instead of copies.
+
+    Raises ValueError if the blob is truncated or has trailing bytes, i.e.
+    whenever TraitsLoader would revert or silently misread it.
+    """
+    formats = (palette_format,) if palette_format else (PALETTE_RGB, PALETTE_RGBA)
+    errors = []
+    for fmt in formats:
+        try:
+            return _decode(blob, group_index, fmt, copy)
+        except (ValueError, IndexError) as e:
+            errors.append(f"{fmt}-byte palette: {e or 'truncated blob'}")
+    raise ValueError("; ".join(errors))
+
+def decode_rle(trait_data, p_size: int) -> RLERuns:
+    """Expand a trait's 2D RLE block into parallel run columns."""
+    runs = RLERuns(array('B'), array('B'), array('B'), array('H'))
+    if len(trait_data) == 0:
+        return runs
+
+    data = memoryview(trait_data)
+    index = 1
+    for _ in range(data[0]):
+        row_y, num_runs = data[index], data[index + 1]
+        index += 2
+        for _ in range(num_runs):
+            runs.ys.append(row_y)
+            runs.xs.append(data[index])
+            runs.lengths.append(data[index + 1])
+            if p_size == 2:
+                runs.palette_indices.append((data[index + 2] << 8) | data[index + 3])
+            else:
+                runs.palette_indices.append(data[index + 2])
+            index += 2 + p_size
+    return runs
+
+def decode_rects(trait_data, p_size: int) -> Rects:
+    """
+    Expand a rect-encoded layer (LAYER_RECTS / LAYER_RECTS_FULLRES):
+      [numColors:1]
+      Per color: [paletteIndex:pSize][numRects:1] then numRects * [x:1][y:1][w:1][h:1]
+    """
+    rects = Rects(array('B'), array('B'), array('B'), array('B'), array('H'))
+    if len(trait_data) == 0:
+        return rects
+
+    data = memoryview(trait_data)
+    index = 1
+    for _ in range(data[0]):
+        palette_index = int.from_bytes(data[index:index + p_size], 'big')
+        num_rects = data[index + p_size]
+        index += p_size + 1
+        for _ in range(num_rects):
+            x, y, w, h = data[index:index + 4]
+            rects.xs.append(x)
+            rects.ys.append(y)
+            rects.widths.append(w)
+            rects.heights.append(h)
+            rects.palette_indices.append(palette_index)
+            index += 4
+    return rects
+
+def rects_to_runs(rects: Rects) -> RLERuns:
+    """
+    Re-split rects into maximal same-color runs per row. This matches what
+    encode_2d_rle stores for the same pixels, except where the source image
+    split a run on alpha alone.
+    """
+    rows = {}
+    for x, y, w, h, idx in zip(rects.xs, rects.ys, rects.widths, rects.heights, rects.palette_indices):
+        for row in range(y, y + h):
+            cells = rows.setdefault(row, {})
+            for col in range(x, x + w):
+                cells[col] = idx
+
+    runs = RLERuns(array('B'), array('B'), array('B'), array('H'))
+    for y in sorted(rows):
+        cells = rows[y]
+        for x in sorted(cells):
+            idx = cells[x]
+            if runs.ys and runs.ys[-1] == y and runs.palette_indices[-1] == idx \
+                    and runs.xs[-1] + runs.lengths[-1] == x:
+                runs.lengths[-1] += 1
+            else:
+                runs.ys.append(y)
+                runs.xs.append(x)
+                runs.lengths.append(1)
+                runs.palette_indices.append(idx)
+    return runs
+
+def decode_variant(trait_data, p_size: int) -> tuple:
+    """
+    Expand a LAYER_VARIANT layer into (base_trait_index, {base_index: variant_index}):
+      [baseTraitIndex:1][numColors:1]
+      Per color: [from: pSize][to: pSize]   palette indices, big-endian
+    """
+    data = memoryview(trait_data)
+    remap = {}
+    index = 2
+    for _ in range(data[1]):
+        remap[int.from_bytes(data[index:index + p_size], 'big')] = \
+            int.from_bytes(data[index + p_size:index + 2 * p_size], 'big')
+        index += 2 * p_size
+    return data[0], remap
+
+def resolve_variant(group: TraitGroup, trait: TraitInfo) -> tuple:
+    """(trait whose data is drawn, palette remap or None) for any non-background layer."""
+    if trait.layer_type != LAYER_VARIANT:
+        return trait, None
+    base_index, remap = decode_variant(trait.trait_data, group.palette_index_byte_size)
+    return group.traits[base_index], remap
+
+def palette_index(group: TraitGroup, trait: TraitInfo, slot: int) -> int:
+    """The slot-th big-endian palette index in a background trait's data (solid color, gradient stops)."""
+    p_size = group.palette_index_byte_size
+    return int.from_bytes(trait.trait_data[slot * p_size:(slot + 1) * p_size], 'big')
+
+def decode_layer_runs(group: TraitGroup, trait: TraitInfo) -> RLERuns:
+    """Per-row runs for a non-background layer, whatever its storage format."""
+    p_size = group.palette_index_byte_size
+    source, remap = resolve_variant(group, trait)
+    if source.layer_type in RECT_LAYERS:
+        runs = rects_to_runs(decode_rects(source.trait_data, p_size))
+    else:
+        runs = decode_rle(source.trait_data, p_size)
+    if remap is not None:
+        runs.palette_indices = array('H', (remap[i] for i in runs.palette_indices))
+    return runs
+
+# ============================================================================
+# VERIFICATION
+# ============================================================================
+
+def group_index_for(key: str) -> int:
+    """Map an asset file key ("Male_Hair_Group", "Background", ...) to E_TraitsGroup."""
+    from Traits import ENUM_ORDER
+    groups = ["Background_Group", "Special_1s_Group"] + ENUM_ORDER
+    name = key.replace(" ", "_")
+    if not name.endswith("_Group"):
+        name += "_Group"
+    return groups.index(name) if name in groups else -1
+
+def load_trait_groups(paths: list, copy: bool = True) -> dict:
+    """
+    Decode every group in the given asset files into {E_TraitsGroup: TraitGroup},
+    the offline equivalent of CachedTraitGroups with everything loaded.
+    """
+    groups = {}
+    for path in paths:
+        compressed = COMPRESSED_SUFFIX in os.path.basename(path)
+        for key, blob in read_asset_lines(path):
+            if compressed:
+                blob = flz_decompress(blob)
+            index = group_index_for(key)
+            groups[index] = decode_trait_group(blob, index, copy=copy)
+    return groups
+
+def verify_trait_group(group: TraitGroup) -> list:
+    """Return a list of problems: palette indices out of range, runs outside the bounding box."""
+    problems = []
+    palette_size = len(group.palette_rgba)
+    p_size = group.palette_index_byte_size
+    if p_size not in (1, 2):
+        return [f"paletteIndexByteSize is {p_size}"]
+
+    for trait in group.traits:
+        name = bytes(trait.trait_name).decode('utf-8', 'replace')
+        if group.trait_group_index == BACKGROUND_GROUP_INDEX and trait.layer_type != BG_IMAGE:
+            indices = [int.from_bytes(trait.trait_data[i:i + p_size], 'big')
+                       for i in range(0, len(trait.trait_data), p_size)]
+        else:
+            if trait.layer_type == LAYER_VARIANT:
+                base_index = trait.trait_data[0]
+                if base_index >= len(group.traits) or group.traits[base_index].layer_type == LAYER_VARIANT:
+                    problems.append(f"{name}: bad variant base trait {base_index}")
+                    continue
+            runs = decode_layer_runs(group, trait)
+            indices = runs.palette_indices
+            for y, x, length in zip(runs.ys, runs.xs, runs.lengths):
+                if not (trait.y1 <= y <= trait.y2 and trait.x1 <= x and x + length - 1 <= trait.x2):
+                    problems.append(f"{name}: run ({x},{y}) len {length} outside bounds")
+                    break
+        if any(i >= palette_size for i in indices):
+            problems.append(f"{name}: palette index out of range ({palette_size} colors)")
+    return problems
+
+def main():
+    if len(sys.argv) > 1:
+        files = sys.argv[1:]
+    else:
+        if not os.path.isdir(OUTPUT_DIR):
+            print("No output directory found.")
+            return
+        suffixes = (ASSET_SUFFIX, compressed_path(ASSET_SUFFIX))
+        files = [os.path.join(OUTPUT_DIR, f) for f in sorted(os.listdir(OUTPUT_DIR)) if f.endswith(suffixes)]
+
+    print("=" * 70)
+    print("Trait Group Blob Decoder / Verifier")
+    print("=" * 70)
+
+    failures = 0
+    for path in files:
+        compressed = COMPRESSED_SUFFIX in os.path.basename(path)
+        print(f"\nProcessing: {path}")
+        for key, blob in read_asset_lines(path):
+            if compressed:
+                blob = flz_decompress(blob)
+            try:
+                group = decode_trait_group(blob, group_index_for(key), copy=False)
+                problems = verify_trait_group(group)
+            except ValueError as e:
+                problems = [str(e)]
+                group = None
+
+            if problems:
+                failures += 1
+                print(f"  ⊗ {key}: {problems[0]}" + (f" (+{len(problems) - 1} more)" if len(problems) > 1 else ""))
+            else:
+                print(f"  ✓ {key}: {len(group.traits)} traits, {len(group.palette_rgba)} colors")
+
+    print("\n" + "=" * 70)
+    print("All groups decoded cleanly." if not failures else f"{failures} group(s) failed to decode.")
+    print("=" * 70)
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Cross-Group Duplicate Layer Finder for RetroPunks
+
+Every trait group is stored, loaded and decompressed on its own, so a layer
+that appears in two groups (Male/Female Mask, Hair/Hat Hair, ...) costs
+storage and loadAsset gas twice. This script hashes every encoded trait
+payload across all groups in an asset file and reports what is shared:
+
+  byte-identical   same layerType and trait data; could point at one stored
+                   copy as-is
+  pixel-identical  same pixels and colors, but the bytes differ because the
+                   two groups index their palettes differently; sharing needs
+                   a palette remap (see LAYER_VARIANT) or an aligned palette
+
+Only the second and later copies count as duplicate bytes; the first
+occurrence in ENUM_ORDER is the canonical copy.
+
+Outputs:
+  output/reports/traits_dedup_report.txt   duplicate bytes per pair of groups, then every duplicate
+  output/traits_dedup_table.json           shared-asset reference table:
+                                           {"Group:traitIndex": {"source": "Group:traitIndex", "match": "bytes"|"pixels"}}
+
+Usage:
+  python3 TraitsDedup.py [FILE ...]    (default: output/traits_asset.txt)
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from collections import defaultdict
+from FastLZ import COMPRESSED_SUFFIX, flz_decompress, read_asset_lines
+from TraitsDecoder import (
+    LAYER_FULLRES, LAYER_RECTS_FULLRES, decode_layer_runs, decode_trait_group, group_index_for,
+    resolve_variant,
+)
+
+OUTPUT_DIR = "output"
+REPORTS_DIR = os.path.join(OUTPUT_DIR, "reports")
+DEFAULT_ASSET_FILE = os.path.join(OUTPUT_DIR, "traits_asset.txt")
+REPORT_FILENAME = "traits_dedup_report.txt"
+TABLE_FILENAME = "traits_dedup_table.json"
+
+MATCH_BYTES = "bytes"
+MATCH_PIXELS = "pixels"
+
+# ============================================================================
+# HASHING
+# ============================================================================
+
+def payload_hash(trait) -> bytes:
+    """Hash of what the loader copies for a trait: layerType plus trait data."""
+    h = hashlib.sha256(bytes([trait.layer_type]))
+    h.update(trait.trait_data)
+    return h.digest()
+
+def pixel_hash(group, trait) -> bytes:
+    """Hash of the rendered layer: resolution class plus every run with its RGB color."""
+    runs = decode_layer_runs(group, trait)
+    full_res = resolve_variant(group, trait)[0].layer_type in (LAYER_FULLRES, LAYER_RECTS_FULLRES)
+    h = hashlib.sha256(bytes([full_res]))
+    for y, x, length, idx in zip(runs.ys, runs.xs, runs.lengths, runs.palette_indices):
+        h.update(bytes([y, x, length]) + group.palette_rgba[idx].to_bytes(4, 'big'))
+    return h.digest()
+
+def find_duplicates(groups: dict) -> list:
+    """
+    Return (group, trait_index, size, source_group, source_index, match) for every
+    trait whose payload or pixels already appeared earlier. `groups` maps asset
+    keys to TraitGroups in file order; empty traits are ignored.
+    """
+    by_payload, by_pixels = {}, {}
+    duplicates = []
+    for key, group in groups.items():
+        for index, trait in enumerate(group.traits):
+            if len(trait.trait_data) <= 1:
+                continue
+            size = len(trait.trait_data)
+            ref = (key, index)
+
+            source = by_payload.setdefault(payload_hash(trait), ref)
+            if source != ref:
+                duplicates.append((key, index, size, *source, MATCH_BYTES))
+                continue
+
+            source = by_pixels.setdefault(pixel_hash(group, trait), ref)
+            if source != ref:
+                duplicates.append((key, index, size, *source, MATCH_PIXELS))
+    return duplicates
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def _trait_name(groups: dict, key: str, index: int) -> str:
+    return bytes(groups[key].traits[index].trait_name).decode('utf-8', 'replace')
+
+def write_report(groups: dict, duplicates: list) -> str:
+    pairs = defaultdict(lambda: {MATCH_BYTES: [0, 0], MATCH_PIXELS: [0, 0]})
+    for key, _, size, source_key, _, match in duplicates:
+        totals = pairs[(source_key, key)][match]
+        totals[0] += 1
+        totals[1] += size
+
+    lines = [f"{'Source group':<24} {'Duplicate group':<24} {'Bytes-eq':>8} {'Bytes':>7} {'Pixels-eq':>9} {'Bytes':>7}"]
+    for (source_key, key), totals in sorted(pairs.items(), key=lambda p: -sum(t[1] for t in p[1].values())):
+        b, p = totals[MATCH_BYTES], totals[MATCH_PIXELS]
+        lines.append(f"{source_key:<24} {key:<24} {b[0]:>8} {b[1]:>7} {p[0]:>9} {p[1]:>7}")
+
+    lines.append("")
+    lines.append(f"{'Duplicate':<52} {'Source':<52} {'Match':<6} {'Bytes':>6}")
+    for key, index, size, source_key, source_index, match in duplicates:
+        dup = f"{key}:{index} {_trait_name(groups, key, index)}"
+        src = f"{source_key}:{source_index} {_trait_name(groups, source_key, source_index)}"
+        lines.append(f"{dup:<52} {src:<52} {match:<6} {size:>6}")
+
+    os.makedirs(REPORTS_DIR, exist_ok=True)
+    report_file = os.path.join(REPORTS_DIR, REPORT_FILENAME)
+    with open(report_file, 'w') as f:
+        f.write("\n".join(lines) + "\n")
+    return report_file
+
+def write_table(duplicates: list) -> str:
+    table = {
+        f"{key}:{index}": {"source": f"{source_key}:{source_index}", "match": match}
+        for key, index, _, source_key, source_index, match in duplicates
+    }
+    table_file = os.path.join(OUTPUT_DIR, TABLE_FILENAME)
+    with open(table_file, 'w') as f:
+        json.dump(table, f, indent=2)
+    return table_file
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def load_groups(paths: list) -> dict:
+    """{asset key: TraitGroup} for every group in the given files, in file order."""
+    groups = {}
+    for path in paths:
+        compressed = COMPRESSED_SUFFIX in os.path.basename(path)
+        for key, blob in read_asset_lines(path):
+            if compressed:
+                blob = flz_decompress(blob)
+            groups[key] = decode_trait_group(blob, group_index_for(key), copy=False)
+    return groups
+
+def main():
+    parser = argparse.ArgumentParser(description="Find trait layers duplicated across trait groups.")
+    parser.add_argument("files", nargs="*", default=[DEFAULT_ASSET_FILE], metavar="FILE",
+                        help=f"asset files to scan (default: {DEFAULT_ASSET_FILE})")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("Cross-Group Duplicate Layer Finder")
+    print("=" * 70)
+
+    groups = load_groups(args.files)
+    duplicates = find_duplicates(groups)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    report_file = write_report(groups, duplicates)
+    table_file = write_table(duplicates)
+
+    total = sum(len(t.trait_data) for g in groups.values() for t in g.traits)
+    for match in (MATCH_BYTES, MATCH_PIXELS):
+        found = [d for d in duplicates if d[5] == match]
+        cross = [d for d in found if d[0] != d[3]]
+        print(f"{match + '-identical:':<17} {len(found):>4} layers, {sum(d[2] for d in found):>6} bytes "
+              f"({len(cross)} across groups, {sum(d[2] for d in cross)} bytes)")
+    print(f"Trait data total: {total} bytes in {len(groups)} groups")
+    print(f"Report written to: {report_file}")
+    print(f"Reference table:   {table_file}")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
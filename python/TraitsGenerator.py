@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""
+Offline Port of Traits.generateTraitsContext for RetroPunks
+
+Replays src/Traits.sol, src/Rarities.sol and src/libraries/TraitLogic.sol in
+Python so the revealed collection can be predicted without any eth_calls.
+Every PRNG draw happens in the same order as on-chain, so the resulting
+TraitsContext (sex, each trait enum, birthday, specialId, traitsToRender with
+fillers) is identical to what the contract returns for the same inputs.
+
+Enum members come from src/global/Enums.sol, and the packed uint16 weight tables
+and the totalWeight each table is rolled against from src/Rarities.sol, so the
+port follows both files. The branching and None weights mirror the Solidity
+code and must be kept in step with it by hand.
+
+Quirks reproduced on purpose, because the contract behaves this way:
+  - maleIsHuman / femaleIsHuman compare enum indices Human_1..Human_12, which
+    in declaration order only covers Human_1, Human_10, Human_11 and Human_12.
+  - selectMouth runs before maleFacialHair is copied into the context, so a
+    male mouth is always drawn from MOUTH_C.
+  - M_HAIR has 211 weights summing to 9554 while selectMaleHair rolls against
+    9579, so a roll in [9554, 9579) reverts with TraitSelectionFailed. The
+    batch API returns None for those tokenIdSeeds and the CLI reports them.
+
+Usage:
+  python3 TraitsGenerator.py --global-seed N [--supply 10000] [--background 1] [--jobs 0]
+  (writes output/traits_context.ndjson, one TraitsContext per tokenIdSeed)
+"""
+
+import argparse
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from LibPRNG import PRNG, keccak_uint
+
+ROOT = Path(__file__).resolve().parents[1]
+ENUMS_PATH = ROOT / "src" / "global" / "Enums.sol"
+RARITIES_PATH = ROOT / "src" / "Rarities.sol"
+
+OUTPUT_DIR = "output"
+CONTEXT_FILENAME = "traits_context.ndjson"
+
+DEFAULT_SUPPLY = 10000
+DEFAULT_BACKGROUND = 1
+
+# ============================================================================
+# SOLIDITY SOURCES
+# ============================================================================
+
+_ENUM_PATTERN = re.compile(r"enum\s+(\w+)\s*\{([^}]*)\}")
+_HEX_CONSTANT_PATTERN = re.compile(r"bytes\s+private\s+constant\s+(\w+)\s*=\s*hex\"([0-9A-Fa-f]*)\"")
+_TOTAL_PATTERNS = (
+    re.compile(r"selectRandomTrait\(\s*prng\s*,\s*(\w+)\s*,\s*(\d+)\s*\)"),
+    re.compile(r"packed\s*=\s*(\w+)\s*;\s*totalWeight\s*=\s*(\d+)\s*;"),
+)
+_COMMENT_PATTERN = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+
+def load_enums(path=ENUMS_PATH) -> dict:
+    """Parse every `enum E_X { ... }` into {"E_X": [member, ...]} in declaration order."""
+    source = _COMMENT_PATTERN.sub("", Path(path).read_text())
+    return {
+        name: [m.strip() for m in body.split(",") if m.strip()]
+        for name, body in _ENUM_PATTERN.findall(source)
+    }
+
+def load_weight_tables(path=RARITIES_PATH) -> dict:
+    """Parse Rarities.sol hex constants into {"M_SKIN": (w0, w1, ...)} of uint16 weights."""
+    tables = {}
+    for name, hex_data in _HEX_CONSTANT_PATTERN.findall(Path(path).read_text()):
+        raw = bytes.fromhex(hex_data)
+        tables[name] = tuple(int.from_bytes(raw[i:i + 2], 'big') for i in range(0, len(raw), 2))
+    return tables
+
+def load_table_totals(path=RARITIES_PATH) -> dict:
+    """Parse the totalWeight every table is passed to selectRandomTrait with: {"M_HAIR": 9579, ...}."""
+    source = _COMMENT_PATTERN.sub("", Path(path).read_text())
+    totals = {}
+    for pattern in _TOTAL_PATTERNS:
+        for name, total in pattern.findall(source):
+            if name != "packed":
+                totals[name] = int(total)
+    return totals
+
+ENUMS = load_enums()
+WEIGHTS = load_weight_tables()
+TOTALS = load_table_totals()
+
+def enum_index(enum_name: str, member: str) -> int:
+    return ENUMS[enum_name].index(member)
+
+def _group(name: str) -> int:
+    return enum_index("E_TraitsGroup", name)
+
+def _mask(enum_name: str, members: list) -> int:
+    mask = 0
+    for member in members:
+        mask |= 1 << enum_index(enum_name, member)
+    return mask
+
+# ============================================================================
+# CONSTANTS (Traits.sol / TraitLogic.sol)
+# ============================================================================
+
+MIN_DATE = 4102444800
+RANGE_SIZE = 31496399
+NUM_SPECIAL_1S = len(ENUMS["E_Special_1s"])
+NUM_PRE_RENDERED_SPECIALS = 7
+
+SEX_MALE = enum_index("E_Sex", "Male")
+SEX_FEMALE = enum_index("E_Sex", "Female")
+
+_BIONIC_COLORS = ["Blue", "Green", "Orange", "Pink", "Purple", "Red", "Turquoise", "Yellow"]
+_EYE_PATCHES = [f"Bionic_Eye_Patch_{c}" for c in _BIONIC_COLORS] + ["Eye_Patch", "Pirate_Eye_Patch", "Eye_Mask"]
+_CLOAKS_AND_HOODIES = (
+    [f"Cloak_{c}" for c in ["Black", "Blue", "Green", "Purple", "Red", "White"]] + ["Cloak"]
+    + [f"Hoodie_{c}" for c in ["Blue", "Green", "Purple", "Red"]] + ["Hoodie"]
+    + [f"Sherpa_Hat_{c}" for c in ["Blue", "Brown", "Red"]]
+)
+_BLACK_FACIAL_HAIR = [f"{style}_Black" for style in [
+    "Anchor_Beard", "Beard", "Big_Beard", "Chin_Goatee", "Chinstrap", "Circle_Beard", "Dutch",
+    "Fu_Manchu", "Full_Goatee", "Goatee", "Handlebar", "Horseshoe", "Long_Beard", "Luxurious_Beard",
+    "Luxurious_Full_Goatee", "Mustache", "Muttonchops", "Pyramid_Mustache", "Walrus",
+]]
+
+FACIAL_HAIR_IS_BLACK = _mask("E_Male_Facial_Hair", _BLACK_FACIAL_HAIR)
+MALE_EYEWEAR_IS_EYE_PATCH = _mask("E_Male_Eye_Wear", _EYE_PATCHES)
+FEMALE_EYEWEAR_IS_EYE_PATCH = _mask("E_Female_Eye_Wear", _EYE_PATCHES)
+MALE_HEADWEAR_IS_CLOAK_OR_HOODIE = _mask("E_Male_Headwear", _CLOAKS_AND_HOODIES)
+FEMALE_HEADWEAR_IS_CLOAK_OR_HOODIE = _mask("E_Female_Headwear", _CLOAKS_AND_HOODIES)
+
+MALE_FILLER = _mask("E_Male_Skin", ["Robot", "Pumpkin"])
+FEMALE_FILLER = _mask("E_Female_Skin", ["Robot"])
+
+class _Skins:
+    """Skin enum indices for one sex, used by the TraitLogic checks."""
+    def __init__(self, enum_name: str):
+        members = ENUMS[enum_name]
+        for member in members:
+            setattr(self, member.upper(), members.index(member))
+
+M = _Skins("E_Male_Skin")
+F = _Skins("E_Female_Skin")
+
+# ============================================================================
+# STRUCTURES
+# ============================================================================
+
+@dataclass
+class TraitToRender:
+    """Mirror of the Solidity TraitToRender struct; filler is (group, index) or None."""
+    trait_group: int
+    trait_index: int
+    filler: tuple = None
+
+@dataclass
+class TraitsContext:
+    """Mirror of the Solidity TraitsContext struct. Enum fields hold indices."""
+    traits_to_render: list = field(default_factory=list)
+    token_id_seed: int = 0
+    special_id: int = 0
+    birthday: int = 0
+    sex: int = 0
+    background: int = 0
+
+    male_skin: int = 0
+    male_eyes: int = 0
+    male_face: int = 0
+    male_chain: int = 0
+    male_earring: int = 0
+    male_facial_hair: int = 0
+    male_mask: int = 0
+    male_scarf: int = 0
+    male_hair: int = 0
+    male_hat_hair: int = 0
+    male_headwear: int = 0
+    male_eye_wear: int = 0
+
+    female_skin: int = 0
+    female_eyes: int = 0
+    female_face: int = 0
+    female_chain: int = 0
+    female_earring: int = 0
+    female_mask: int = 0
+    female_scarf: int = 0
+    female_hair: int = 0
+    female_hat_hair: int = 0
+    female_headwear: int = 0
+    female_eye_wear: int = 0
+
+    mouth: int = 0
+
+# Context field -> Solidity enum, for naming values in exports
+FIELD_ENUMS = {
+    "sex": "E_Sex", "background": "E_Background", "mouth": "E_Mouth",
+    **{f"male_{k}": f"E_Male_{v}" for k, v in [
+        ("skin", "Skin"), ("eyes", "Eyes"), ("face", "Face"), ("chain", "Chain"), ("earring", "Earring"),
+        ("facial_hair", "Facial_Hair"), ("mask", "Mask"), ("scarf", "Scarf"), ("hair", "Hair"),
+        ("hat_hair", "Hat_Hair"), ("headwear", "Headwear"), ("eye_wear", "Eye_Wear"),
+    ]},
+    **{f"female_{k}": f"E_Female_{v}" for k, v in [
+        ("skin", "Skin"), ("eyes", "Eyes"), ("face", "Face"), ("chain", "Chain"), ("earring", "Earring"),
+        ("mask", "Mask"), ("scarf", "Scarf"), ("hair", "Hair"), ("hat_hair", "Hat_Hair"),
+        ("headwear", "Headwear"), ("eye_wear", "Eye_Wear"),
+    ]},
+}
+
+class TraitSelectionFailed(Exception):
+    """Rarities.TraitSelectionFailed: the roll fell past the end of a weight table."""
+
+# ============================================================================
+# RARITIES
+# ============================================================================
+
+def select_random_trait(prng: PRNG, weights: tuple, total_weight: int) -> int:
+    """Rarities.selectRandomTrait: uniform roll, then a linear cumulative scan."""
+    r = prng.uniform(total_weight)
+    cumulative = 0
+    for idx, weight in enumerate(weights):
+        cumulative += weight
+        if r < cumulative:
+            return idx
+    raise TraitSelectionFailed()
+
+def _roll(prng: PRNG, table: str) -> int:
+    return select_random_trait(prng, WEIGHTS[table], TOTALS[table])
+
+def _human(skin: int, skins: _Skins) -> bool:
+    return skins.HUMAN_1 <= skin <= skins.HUMAN_12
+
+def _select_male(ctx: TraitsContext, prng: PRNG) -> dict:
+    m = {}
+    skin = ctx.male_skin = m["skin"] = _roll(prng, "M_SKIN")
+    human, zombie, ghost = _human(skin, M), skin == M.ZOMBIE, skin == M.GHOST
+
+    # Eyes
+    if ghost:
+        m["eyes"] = enum_index("E_Male_Eyes", "Ghost_Left" if prng.uniform(10000) < 5000 else "Ghost_Right")
+    else:
+        m["eyes"] = _roll(prng, "M_EYES")
+
+    # Face
+    if human or zombie:
+        m["face"] = _roll(prng, "M_FACE_A")
+    elif skin in (M.APE, M.YETI, M.ZOMBIE_APE):
+        m["face"] = _roll(prng, "M_FACE_B")
+    elif skin in (M.ALIEN, M.DEMON, M.GHOST, M.GLITCH, M.GOBLIN, M.PUMPKIN, M.SKELETON, M.VAMPIRE):
+        m["face"] = _roll(prng, "M_FACE_C")
+    else:
+        m["face"] = 0
+
+    m["chain"] = _roll(prng, "M_CHAIN")
+    m["earring"] = _roll(prng, "M_EARRING")
+
+    # Facial hair
+    if not human and not zombie and not ghost:
+        m["facial_hair"] = 0
+    elif ghost:
+        m["facial_hair"] = _roll(prng, "M_FACIAL_HAIR_A")
+    else:
+        m["facial_hair"] = _roll(prng, "M_FACIAL_HAIR_B")
+
+    m["mask"] = _roll(prng, "M_MASK")
+    m["scarf"] = _roll(prng, "M_SCARF")
+
+    # Hair / hat hair: a None pre-roll, then the table
+    no_hair = skin in (M.ROBOT, M.MUMMY, M.VAMPIRE)
+    m["hair"] = _select_with_none(prng, "M_HAIR", no_hair, 400 if human or zombie else 1200)
+    m["hat_hair"] = _select_with_none(prng, "M_HAT_HAIR", no_hair, 400 if human or zombie else 800)
+
+    m["headwear"] = _roll(prng, "M_HEADWEAR")
+    m["eye_wear"] = _roll(prng, "M_EYEWEAR")
+    m["mouth"] = _select_mouth(ctx, prng)
+    return m
+
+def _select_female(ctx: TraitsContext, prng: PRNG) -> dict:
+    f = {}
+    skin = ctx.female_skin = f["skin"] = _roll(prng, "F_SKIN")
+    human, zombie = _human(skin, F), skin == F.ZOMBIE
+
+    if skin == F.GHOST:
+        f["eyes"] = enum_index("E_Female_Eyes", "Ghost_Left" if prng.uniform(10000) < 5000 else "Ghost_Right")
+    else:
+        f["eyes"] = _roll(prng, "F_EYES")
+
+    if human or zombie:
+        f["face"] = _roll(prng, "F_FACE_A")
+    elif skin in (F.APE, F.ZOMBIE_APE):
+        f["face"] = _roll(prng, "F_FACE_B")
+    elif skin in (F.ALIEN, F.DEMON, F.GHOST, F.GLITCH, F.GOBLIN, F.SKELETON, F.VAMPIRE):
+        f["face"] = _roll(prng, "F_FACE_C")
+    else:
+        f["face"] = 0
+
+    f["chain"] = _roll(prng, "F_CHAIN")
+    f["earring"] = _roll(prng, "F_EARRING")
+    f["mask"] = _roll(prng, "F_MASK")
+    f["scarf"] = _roll(prng, "F_SCARF")
+
+    no_hair = skin in (F.ROBOT, F.MUMMY, F.VAMPIRE)
+    f["hair"] = _select_with_none(prng, "F_HAIR", no_hair, 400 if human or zombie else 1200)
+    f["hat_hair"] = _select_with_none(prng, "F_HAT_HAIR", no_hair, 400 if human or zombie else 1200)
+
+    f["headwear"] = _roll(prng, "F_HEADWEAR")
+    f["eye_wear"] = _roll(prng, "F_EYEWEAR")
+    f["mouth"] = _select_mouth(ctx, prng)
+    return f
+
+def _select_with_none(prng: PRNG, table: str, excluded: bool, none_weight: int) -> int:
+    if excluded:
+        return 0
+    if prng.uniform(TOTALS[table] + none_weight) < none_weight:
+        return 0
+    return _roll(prng, table)
+
+def _select_mouth(ctx: TraitsContext, prng: PRNG) -> int:
+    if ctx.sex == SEX_FEMALE:
+        return _roll(prng, "MOUTH_A")
+    if (FACIAL_HAIR_IS_BLACK >> ctx.male_facial_hair) & 1:
+        return _roll(prng, "MOUTH_B")
+    return _roll(prng, "MOUTH_C")
+
+# ============================================================================
+# TRAITS
+# ============================================================================
+
+def _add(ctx: TraitsContext, group: str, index: int):
+    ctx.traits_to_render.append(TraitToRender(_group(group), index))
+
+def _add_optional(ctx: TraitsContext, group: str, index: int):
+    if index != 0:
+        _add(ctx, group, index)
+
+def _add_filler(ctx: TraitsContext, member: str):
+    ctx.traits_to_render[-1].filler = (_group("Filler_Traits_Group"), enum_index("E_Filler_Traits", member))
+
+def _add_headwear(ctx: TraitsContext, prefix: str):
+    headwear = getattr(ctx, f"{prefix}_headwear")
+    if headwear == 0:
+        return
+    _add(ctx, f"{prefix.title()}_Headwear_Group", headwear)
+
+    if prefix == "male" and (MALE_FILLER >> ctx.male_skin) & 1:
+        _add_filler(ctx, "Male_Robot_Headwear_Cover" if ctx.male_skin == M.ROBOT else "Male_Pumpkin_Headwear_Cover")
+    elif prefix == "female" and (FEMALE_FILLER >> ctx.female_skin) & 1:
+        _add_filler(ctx, "Female_Robot_Headwear_Cover")
+
+def generate_traits_context(token_id_seed: int, background_index: int, global_seed: int) -> TraitsContext:
+    """Traits.generateTraitsContext(tokenIdSeed, backgroundIndex, globalSeed)."""
+    prng = PRNG(keccak_uint(token_id_seed.to_bytes(2, 'big') + global_seed.to_bytes(32, 'big')))
+
+    ctx = TraitsContext(token_id_seed=token_id_seed)
+    ctx.birthday = MIN_DATE + prng.uniform(RANGE_SIZE + 1)
+
+    if background_index >= len(ENUMS["E_Background"]):
+        raise ValueError(f"background index {background_index} is not a valid E_Background")
+
+    if token_id_seed < NUM_SPECIAL_1S:
+        ctx.special_id = token_id_seed + 1
+        if token_id_seed < NUM_PRE_RENDERED_SPECIALS:
+            return ctx
+        ctx.background = background_index
+        _add(ctx, "Background_Group", background_index)
+        _add(ctx, "Special_1s_Group", token_id_seed)
+        return ctx
+
+    ctx.background = background_index
+    _add(ctx, "Background_Group", background_index)
+
+    ctx.sex = SEX_MALE if prng.uniform(10000) < 7000 else SEX_FEMALE
+    prefix = "male" if ctx.sex == SEX_MALE else "female"
+
+    selected = _select_male(ctx, prng) if ctx.sex == SEX_MALE else _select_female(ctx, prng)
+    for name, value in selected.items():
+        setattr(ctx, "mouth" if name == "mouth" else f"{prefix}_{name}", value)
+
+    add_trait_layers(ctx)
+    return ctx
+
+def add_trait_layers(ctx: TraitsContext):
+    """Append the TraitLogic render order for ctx's sex and selected traits to traits_to_render."""
+    prefix = "male" if ctx.sex == SEX_MALE else "female"
+    group = prefix.title()
+    selected = {part: getattr(ctx, f"{prefix}_{part}") for part in (
+        "skin", "eyes", "face", "chain", "earring", "scarf", "headwear", "hat_hair", "hair", "eye_wear")}
+
+    eye_patch_mask = MALE_EYEWEAR_IS_EYE_PATCH if ctx.sex == SEX_MALE else FEMALE_EYEWEAR_IS_EYE_PATCH
+    cloak_mask = MALE_HEADWEAR_IS_CLOAK_OR_HOODIE if ctx.sex == SEX_MALE else FEMALE_HEADWEAR_IS_CLOAK_OR_HOODIE
+    eye_wear = selected["eye_wear"]
+    headwear = selected["headwear"]
+    is_eye_patch = (eye_patch_mask >> eye_wear) & 1
+    is_cloak = (cloak_mask >> headwear) & 1
+
+    _add(ctx, f"{group}_Skin_Group", selected["skin"])
+    for part in ("Eyes", "Face", "Chain", "Earring"):
+        _add_optional(ctx, f"{group}_{part}_Group", selected[part.lower()])
+
+    if ctx.sex == SEX_MALE:
+        if ctx.male_facial_hair != 0:
+            _add_optional(ctx, "Male_Facial_Hair_Group", ctx.male_facial_hair)
+        else:
+            _add_optional(ctx, "Male_Mask_Group", ctx.male_mask)
+    else:
+        _add_optional(ctx, "Female_Mask_Group", ctx.female_mask)
+
+    _add_optional(ctx, f"{group}_Scarf_Group", selected["scarf"])
+
+    # Eye patch goes under hair/headwear
+    if is_eye_patch:
+        _add_optional(ctx, f"{group}_Eye_Wear_Group", eye_wear)
+
+    if headwear != 0:
+        _add_optional(ctx, f"{group}_Hat_Hair_Group", selected["hat_hair"])
+    else:
+        _add_optional(ctx, f"{group}_Hair_Group", selected["hair"])
+
+    if headwear != 0 and not is_cloak:
+        _add_headwear(ctx, prefix)
+
+    if not is_eye_patch:
+        _add_optional(ctx, f"{group}_Eye_Wear_Group", eye_wear)
+
+    # Cloaks and hoodies go over eye wear
+    if headwear != 0 and is_cloak:
+        _add_headwear(ctx, prefix)
+
+    if getattr(ctx, f"{prefix}_mask") == 0:
+        _add_optional(ctx, "Mouth_Group", ctx.mouth)
+
+# ============================================================================
+# BATCH
+# ============================================================================
+
+def _try_generate(token_id_seed: int, background_index: int, global_seed: int):
+    try:
+        return generate_traits_context(token_id_seed, background_index, global_seed)
+    except TraitSelectionFailed:
+        return None
+
+def _generate_chunk(token_id_seeds: list, background_index: int, global_seed: int) -> list:
+    return [_try_generate(seed, background_index, global_seed) for seed in token_id_seeds]
+
+def generate_collection(global_seed: int, supply: int = DEFAULT_SUPPLY,
+                        background_index: int = DEFAULT_BACKGROUND, jobs: int = 1) -> list:
+    """
+    TraitsContext for every tokenIdSeed in [0, supply), in seed order.
+    Seeds whose generateTraitsContext call would revert on-chain with
+    TraitSelectionFailed come back as None.
+    With jobs > 1 the seeds are split into contiguous chunks across a process pool.
+    """
+    seeds = list(range(supply))
+    if jobs <= 1:
+        return _generate_chunk(seeds, background_index, global_seed)
+
+    chunk_size = -(-supply // (jobs * 4))
+    chunks = [seeds[i:i + chunk_size] for i in range(0, supply, chunk_size)]
+    work = partial(_generate_chunk, background_index=background_index, global_seed=global_seed)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return [ctx for chunk in pool.map(work, chunks) for ctx in chunk]
+
+def context_to_dict(ctx: TraitsContext) -> dict:
+    """TraitsContext as plain JSON-ready data, with enum values named."""
+    data = asdict(ctx)
+    data["traits_to_render"] = [
+        {
+            "trait_group": ENUMS["E_TraitsGroup"][t.trait_group],
+            "trait_index": t.trait_index,
+            **({"filler": {"trait_group": ENUMS["E_TraitsGroup"][t.filler[0]], "trait_index": t.filler[1]}}
+               if t.filler else {}),
+        }
+        for t in ctx.traits_to_render
+    ]
+    if ctx.special_id == 0:
+        for name, enum_name in FIELD_ENUMS.items():
+            data[name] = ENUMS[enum_name][data[name]]
+    return data
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Predict RetroPunks traits offline from the global seed.")
+    parser.add_argument("--global-seed", type=lambda s: int(s, 0), required=True, help="revealed globalSeed")
+    parser.add_argument("--supply", type=int, default=DEFAULT_SUPPLY,
+                        help=f"number of tokenIdSeeds to generate (default: {DEFAULT_SUPPLY})")
+    parser.add_argument("--background", type=int, default=DEFAULT_BACKGROUND,
+                        help=f"E_Background index for every token (default: {DEFAULT_BACKGROUND})")
+    parser.add_argument("--jobs", "-j", type=int, default=0, metavar="N",
+                        help="worker processes (0 = one per CPU core, default: 0)")
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    print("=" * 70)
+    print("RetroPunks Traits Generator (offline generateTraitsContext)")
+    print("=" * 70)
+
+    contexts = generate_collection(args.global_seed, args.supply, args.background, jobs)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    output_file = os.path.join(OUTPUT_DIR, CONTEXT_FILENAME)
+    reverted = []
+    with open(output_file, 'w') as f:
+        for seed, ctx in enumerate(contexts):
+            if ctx is None:
+                reverted.append(seed)
+                data = {"token_id_seed": seed, "error": "TraitSelectionFailed"}
+            else:
+                data = context_to_dict(ctx)
+            f.write(json.dumps(data, separators=(",", ":")) + "\n")
+
+    generated = [c for c in contexts if c is not None]
+    males = sum(1 for c in generated if c.special_id == 0 and c.sex == SEX_MALE)
+    specials = sum(1 for c in generated if c.special_id)
+    print(f"Tokens:   {len(generated):,} ({males:,} male, {len(generated) - males - specials:,} female, {specials} specials)")
+    if reverted:
+        print(f"⊗ {len(reverted)} tokenIdSeed(s) revert with TraitSelectionFailed: {reverted[:20]}"
+              + (" ..." if len(reverted) > 20 else ""))
+    print(f"Output written to: {output_file}")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Worst-Case Token Search for RetroPunks
+
+Finds the heaviest tokenURI any holder can end up with, for sizing eth_call
+gas caps on marketplaces and indexers. Brute force over every trait
+combination is out of reach (a single male skin already has ~10^20), but the
+render cost is a sum of per-layer costs from TraitCosts, and TraitLogic only
+couples a few slots. Within one (sex, skin) branch the slots split into
+independent components:
+
+  single slots   eyes, face, chain, earring, scarf, eye wear
+  lower face     male:   facial hair, else mask; mouth only when mask == 0
+                 female: mask; mouth only when mask == 0
+  head           headwear (+ Robot/Pumpkin filler) with hat hair, or hair
+                 when headwear == 0
+  background     any E_Background; holders pick it with setTokenMetadata
+
+so the exact top-K of a branch is the K-best sum over its components, and the
+global top-K merges every branch plus the dynamic specials.
+
+Reachability follows Rarities.select* and TraitLogic exactly: a table entry
+is reachable when some roll below the table's totalWeight lands on it, the
+face table depends on the skin (A/B/C or none), ghosts only get
+Ghost_Left/Right eyes, facial hair is table A for ghosts, B for humans and
+zombies and none otherwise, Robot, Mummy and Vampire never get hair, and a
+male mouth is always drawn from MOUTH_C.
+Layers TraitLogic hides (mask under facial hair, hair under headwear, ...)
+are left at 0, or at a reachable non-zero mask where mask == 0 would
+render a mouth.
+
+Pre-rendered specials (tokenIdSeed 0-6) are a fixed PNG with no trait layers
+and are not ranked. Group loading (SSTORE2 read + decompression) is not
+part of the per-layer cost model either.
+
+Usage:
+  python3 WorstCaseSearch.py [--metric gas|svg_bytes|shapes] [--top 10] [--style rect|path]
+                             [--background N] [--assets FILE ...] [--calibration FILE]
+                             [--global-seed N [--supply 10000] [--jobs 0]]
+  (writes output/worst_case_tokens.ndjson; with --global-seed also lists the
+   heaviest real tokens and which ranked contexts a tokenIdSeed produces)
+"""
+
+import argparse
+import heapq
+import json
+import os
+from RarityDistribution import REVERT, table_distribution
+from SVGRenderer import STYLE_PATH, STYLE_RECT, SVGRenderer, default_asset_files
+from TraitCosts import DEFAULT_CALIBRATION, load_calibration, trait_costs
+from TraitsDecoder import BACKGROUND_GROUP_INDEX, load_trait_groups
+from TraitsGenerator import (
+    DEFAULT_SUPPLY, ENUMS, F, M, NUM_PRE_RENDERED_SPECIALS, NUM_SPECIAL_1S, SEX_FEMALE, SEX_MALE,
+    TraitsContext, _add, _group, _human, add_trait_layers, context_to_dict, enum_index, generate_collection,
+)
+
+OUTPUT_DIR = "output"
+RESULTS_FILENAME = "worst_case_tokens.ndjson"
+
+METRICS = ("gas", "svg_bytes", "shapes")
+DEFAULT_TOP = 10
+
+# ============================================================================
+# REACHABLE OPTIONS
+# ============================================================================
+
+def reachable(table: str) -> list:
+    """Indices Rarities.selectRandomTrait can return for a weight table."""
+    return [i for i in table_distribution(table) if i != REVERT]
+
+def _male_tables(skin: int) -> dict:
+    """Reachable indices per male slot for one skin, as _select_male branches."""
+    human, zombie, ghost = _human(skin, M), skin == M.ZOMBIE, skin == M.GHOST
+    if human or zombie:
+        face = reachable("M_FACE_A")
+    elif skin in (M.APE, M.YETI, M.ZOMBIE_APE):
+        face = reachable("M_FACE_B")
+    elif skin in (M.ALIEN, M.DEMON, M.GHOST, M.GLITCH, M.GOBLIN, M.PUMPKIN, M.SKELETON, M.VAMPIRE):
+        face = reachable("M_FACE_C")
+    else:
+        face = [0]
+
+    if ghost:
+        facial_hair = reachable("M_FACIAL_HAIR_A")
+    elif human or zombie:
+        facial_hair = reachable("M_FACIAL_HAIR_B")
+    else:
+        facial_hair = [0]
+
+    no_hair = skin in (M.ROBOT, M.MUMMY, M.VAMPIRE)
+    return {
+        "eyes": [enum_index("E_Male_Eyes", e) for e in ("Ghost_Left", "Ghost_Right")] if ghost
+                else reachable("M_EYES"),
+        "face": face,
+        "chain": reachable("M_CHAIN"),
+        "earring": reachable("M_EARRING"),
+        "facial_hair": facial_hair,
+        "mask": reachable("M_MASK"),
+        "scarf": reachable("M_SCARF"),
+        "hair": [0] if no_hair else sorted({0, *reachable("M_HAIR")}),
+        "hat_hair": [0] if no_hair else sorted({0, *reachable("M_HAT_HAIR")}),
+        "headwear": reachable("M_HEADWEAR"),
+        "eye_wear": reachable("M_EYEWEAR"),
+        "mouth": reachable("MOUTH_C"),
+    }
+
+def _female_tables(skin: int) -> dict:
+    """Reachable indices per female slot for one skin, as _select_female branches."""
+    human, zombie = _human(skin, F), skin == F.ZOMBIE
+    if human or zombie:
+        face = reachable("F_FACE_A")
+    elif skin in (F.APE, F.ZOMBIE_APE):
+        face = reachable("F_FACE_B")
+    elif skin in (F.ALIEN, F.DEMON, F.GHOST, F.GLITCH, F.GOBLIN, F.SKELETON, F.VAMPIRE):
+        face = reachable("F_FACE_C")
+    else:
+        face = [0]
+
+    no_hair = skin in (F.ROBOT, F.MUMMY, F.VAMPIRE)
+    return {
+        "eyes": [enum_index("E_Female_Eyes", e) for e in ("Ghost_Left", "Ghost_Right")] if skin == F.GHOST
+                else reachable("F_EYES"),
+        "face": face,
+        "chain": reachable("F_CHAIN"),
+        "earring": reachable("F_EARRING"),
+        "facial_hair": [0],
+        "mask": reachable("F_MASK"),
+        "scarf": reachable("F_SCARF"),
+        "hair": [0] if no_hair else sorted({0, *reachable("F_HAIR")}),
+        "hat_hair": [0] if no_hair else sorted({0, *reachable("F_HAT_HAIR")}),
+        "headwear": reachable("F_HEADWEAR"),
+        "eye_wear": reachable("F_EYEWEAR"),
+        "mouth": reachable("MOUTH_A"),
+    }
+
+# ============================================================================
+# COMPONENTS
+# ============================================================================
+
+class _Costs:
+    """Per-layer cost lookup: index 0 of an optional slot is never rendered."""
+
+    def __init__(self, rows: list, metric: str):
+        self.table = {(r["group_index"], r["trait_index"]): r[metric] for r in rows}
+
+    def layer(self, group: str, index: int, optional: bool = True) -> int:
+        if optional and index == 0:
+            return 0
+        return self.table[(_group(group), index)]
+
+def _best(options: list, k: int) -> list:
+    """Top-k (cost, fields) options by cost."""
+    return heapq.nlargest(k, options, key=lambda o: o[0])
+
+def _branch_components(costs: _Costs, sex: int, skin: int, k: int) -> list:
+    """Independent (cost, fields) option lists for one (sex, skin) branch."""
+    prefix = "male" if sex == SEX_MALE else "female"
+    group = prefix.title()
+    tables = _male_tables(skin) if sex == SEX_MALE else _female_tables(skin)
+    components = []
+
+    for part in ("eyes", "face", "chain", "earring", "scarf", "eye_wear"):
+        options = [(costs.layer(f"{group}_{part.title()}_Group", i), {f"{prefix}_{part}": i})
+                   for i in tables[part]]
+        components.append(_best(options, k))
+
+    # Lower face: facial hair (male) hides the mask, any mask hides the mouth
+    masks = tables["mask"]
+    hidden_mask = next((m for m in masks if m != 0), None)
+    mouths = [(costs.layer("Mouth_Group", m), {"mouth": m}) for m in tables["mouth"]] if 0 in masks else []
+    options = []
+    for fh in tables["facial_hair"]:
+        if fh != 0:
+            fh_cost = costs.layer("Male_Facial_Hair_Group", fh)
+            if hidden_mask is not None:
+                options.append((fh_cost, {"male_facial_hair": fh, "male_mask": hidden_mask}))
+            options.extend((fh_cost + c, {"male_facial_hair": fh, **f}) for c, f in mouths
+                           if f["mouth"] != 0 or hidden_mask is None)
+        else:
+            options.extend((costs.layer(f"{group}_Mask_Group", m), {f"{prefix}_mask": m}) for m in masks if m != 0)
+            options.extend(mouths)
+    components.append(_best(options, k))
+
+    # Head: headwear (and its filler) over hat hair, or bare hair
+    filler = 0
+    if sex == SEX_MALE and skin in (M.ROBOT, M.PUMPKIN):
+        member = "Male_Robot_Headwear_Cover" if skin == M.ROBOT else "Male_Pumpkin_Headwear_Cover"
+        filler = costs.layer("Filler_Traits_Group", enum_index("E_Filler_Traits", member), optional=False)
+    elif sex == SEX_FEMALE and skin == F.ROBOT:
+        filler = costs.layer("Filler_Traits_Group", enum_index("E_Filler_Traits", "Female_Robot_Headwear_Cover"),
+                             optional=False)
+
+    # The k best pairs only ever use the k best headwear and the k best hat hair
+    headwear = _best([(costs.layer(f"{group}_Headwear_Group", h) + filler, h)
+                      for h in tables["headwear"] if h != 0], k)
+    hat_hair = _best([(costs.layer(f"{group}_Hat_Hair_Group", h), h) for h in tables["hat_hair"]], k)
+    options = [
+        (hw_cost + hh_cost, {f"{prefix}_headwear": hw, f"{prefix}_hat_hair": hh})
+        for hw_cost, hw in headwear for hh_cost, hh in hat_hair
+    ]
+    if 0 in tables["headwear"]:
+        options.extend((costs.layer(f"{group}_Hair_Group", h), {f"{prefix}_hair": h}) for h in tables["hair"])
+    components.append(_best(options, k))
+    return components
+
+def k_best_sums(components: list, k: int) -> list:
+    """
+    The k largest (total, choice) sums picking one option from each component.
+    Every component must be sorted by descending cost; choice holds the index
+    picked in each. Classic frontier search: pop the best, push each
+    one-step-worse neighbour once.
+    """
+    if any(not c for c in components):
+        return []
+    start = (0,) * len(components)
+    frontier = [(-sum(c[0][0] for c in components), start)]
+    seen = {start}
+    results = []
+    while frontier and len(results) < k:
+        neg_total, choice = heapq.heappop(frontier)
+        results.append((-neg_total, choice))
+        for i, j in enumerate(choice):
+            if j + 1 < len(components[i]):
+                nxt = choice[:i] + (j + 1,) + choice[i + 1:]
+                if nxt not in seen:
+                    seen.add(nxt)
+                    delta = components[i][j][0] - components[i][j + 1][0]
+                    heapq.heappush(frontier, (neg_total + delta, nxt))
+    return results
+
+# ============================================================================
+# SEARCH
+# ============================================================================
+
+def _context(sex: int, skin: int, background: int, fields: dict) -> TraitsContext:
+    ctx = TraitsContext(sex=sex, background=background)
+    setattr(ctx, "male_skin" if sex == SEX_MALE else "female_skin", skin)
+    for name, value in fields.items():
+        setattr(ctx, name, value)
+    _add(ctx, "Background_Group", background)
+    add_trait_layers(ctx)
+    return ctx
+
+def _special_context(token_id_seed: int, background: int) -> TraitsContext:
+    ctx = TraitsContext(token_id_seed=token_id_seed, special_id=token_id_seed + 1, background=background)
+    _add(ctx, "Background_Group", background)
+    _add(ctx, "Special_1s_Group", token_id_seed)
+    return ctx
+
+def context_cost(costs: _Costs, ctx: TraitsContext) -> int:
+    """Sum of layer costs for everything renderToSvg draws, fillers included."""
+    total = 0
+    for t in ctx.traits_to_render:
+        total += costs.table[(t.trait_group, t.trait_index)]
+        if t.filler is not None:
+            total += costs.table[t.filler]
+    return total
+
+def search(costs: _Costs, k: int, backgrounds: list) -> list:
+    """Top-k (cost, TraitsContext) over every reachable non-pre-rendered token."""
+    bg_options = _best([(costs.layer("Background_Group", b, optional=False), {"background": b})
+                        for b in backgrounds], k)
+    candidates = []
+
+    for seed in range(NUM_PRE_RENDERED_SPECIALS, NUM_SPECIAL_1S):
+        special = costs.layer("Special_1s_Group", seed, optional=False)
+        candidates.extend((special + c, _special_context(seed, f["background"])) for c, f in bg_options)
+
+    for sex, table in ((SEX_MALE, "M_SKIN"), (SEX_FEMALE, "F_SKIN")):
+        group = "Male_Skin_Group" if sex == SEX_MALE else "Female_Skin_Group"
+        for skin in reachable(table):
+            components = [bg_options] + _branch_components(costs, sex, skin, k)
+            skin_cost = costs.layer(group, skin, optional=False)
+            for total, choice in k_best_sums(components, k):
+                fields = {}
+                for component, j in zip(components, choice):
+                    fields.update(component[j][1])
+                background = fields.pop("background")
+                candidates.append((skin_cost + total, _context(sex, skin, background, fields)))
+
+    return heapq.nlargest(k, candidates, key=lambda c: c[0])
+
+def _layer_key(ctx: TraitsContext) -> tuple:
+    """traits_to_render without the background, which the holder can change."""
+    return tuple((t.trait_group, t.trait_index, t.filler) for t in ctx.traits_to_render
+                 if t.trait_group != BACKGROUND_GROUP_INDEX)
+
+def scan_collection(costs: _Costs, global_seed: int, supply: int, jobs: int, backgrounds: list) -> list:
+    """(cost, TraitsContext) for every real token, each at its most expensive allowed background."""
+    bg_group = _group("Background_Group")
+    worst_bg = max(backgrounds, key=lambda b: costs.table[(bg_group, b)])
+    tokens = []
+    for ctx in generate_collection(global_seed, supply, worst_bg, jobs):
+        if ctx is None or 0 < ctx.special_id <= NUM_PRE_RENDERED_SPECIALS:
+            continue
+        tokens.append((context_cost(costs, ctx), ctx))
+    return tokens
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def _describe(ctx: TraitsContext) -> str:
+    data = context_to_dict(ctx)
+    if ctx.special_id:
+        return f"Special {ENUMS['E_Special_1s'][ctx.special_id - 1]} on {ENUMS['E_Background'][ctx.background]}"
+    layers = [f"{t['trait_group'].removesuffix('_Group')}:{t['trait_index']}" for t in data["traits_to_render"]]
+    return " ".join(layers)
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the most expensive reachable RetroPunks tokens.")
+    parser.add_argument("--metric", choices=METRICS, default="gas", help="per-layer cost to maximize (default: gas)")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help=f"contexts to return (default: {DEFAULT_TOP})")
+    parser.add_argument("--style", choices=(STYLE_RECT, STYLE_PATH), default=STYLE_RECT,
+                        help="renderer to model: rect is the deployed PathSVGRenderer.sol, "
+                             "path the unwired PathSVGRenderer2.sol (default: rect)")
+    parser.add_argument("--background", type=int, default=None,
+                        help="fix the E_Background index (default: any, holders can set it)")
+    parser.add_argument("--assets", nargs="+", default=None, metavar="FILE",
+                        help="asset files to load (default: output/*_asset.txt)")
+    parser.add_argument("--calibration", metavar="FILE", help="TraitCosts calibration JSON")
+    parser.add_argument("--global-seed", type=lambda s: int(s, 0), default=None,
+                        help="also scan the revealed collection for this globalSeed")
+    parser.add_argument("--supply", type=int, default=DEFAULT_SUPPLY,
+                        help=f"tokenIdSeeds to scan (default: {DEFAULT_SUPPLY})")
+    parser.add_argument("--jobs", "-j", type=int, default=0, metavar="N",
+                        help="worker processes for the scan (0 = one per CPU core, default: 0)")
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    groups = load_trait_groups(args.assets or default_asset_files(), copy=False)
+    calibration = load_calibration(args.calibration) if args.calibration else dict(DEFAULT_CALIBRATION)
+    costs = _Costs(trait_costs(groups, args.style, calibration), args.metric)
+    backgrounds = [args.background] if args.background is not None else list(range(len(ENUMS["E_Background"])))
+    renderer = SVGRenderer(groups, args.style)
+
+    print("=" * 70)
+    print(f"Worst-Case Token Search ({args.metric}, {args.style} style)")
+    print("=" * 70)
+
+    results = search(costs, args.top, backgrounds)
+
+    seeds_by_layers = {}
+    tokens = []
+    if args.global_seed is not None:
+        tokens = scan_collection(costs, args.global_seed, args.supply, jobs, backgrounds)
+        for _, ctx in tokens:
+            seeds_by_layers.setdefault(_layer_key(ctx), []).append(ctx.token_id_seed)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    results_file = os.path.join(OUTPUT_DIR, RESULTS_FILENAME)
+    with open(results_file, 'w') as f:
+        for rank, (cost, ctx) in enumerate(results, 1):
+            svg = renderer.render(ctx.traits_to_render, ctx.background)
+            seeds = seeds_by_layers.get(_layer_key(ctx), [])
+            data = {"rank": rank, args.metric: cost, "svg_bytes_total": len(svg), **context_to_dict(ctx)}
+            if args.global_seed is not None:
+                data["token_id_seeds"] = seeds
+            f.write(json.dumps(data, separators=(",", ":")) + "\n")
+            hit = f"  seeds {seeds[:5]}" if seeds else ""
+            print(f"{rank:>3}. {cost:>9} {len(svg):>7} B  {_describe(ctx)}{hit}")
+
+    if tokens:
+        print(f"\nHeaviest tokens for globalSeed {args.global_seed} (each at its worst background):")
+        for cost, ctx in heapq.nlargest(args.top, tokens, key=lambda t: t[0]):
+            print(f"  #{ctx.token_id_seed:<6} {cost:>9}  {_describe(ctx)}")
+        hits = sum(1 for _, ctx in results if _layer_key(ctx) in seeds_by_layers)
+        print(f"{hits} of {len(results)} ranked contexts are produced by a tokenIdSeed below {args.supply}")
+
+    print("=" * 70)
+    print(f"Results written to: {results_file}")
+    print("=" * 70)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.32;
+
+import { Script } from "forge-std/Script.sol";
+import { console } from "forge-std/console.sol";
+
+import { Rarities } from "../src/Rarities.sol";
+import { LibPRNG } from "../src/libraries/LibPRNG.sol";
+
+/**
+ * @title SelectionGas
+ * @notice Measures the gas of one trait selection for the current linear
+ *         layout (Rarities.selectRandomTrait) and for the alias layout built
+ *         by python/AliasTables.py, table by table, over the same seeds.
+ *
+ * Each sample is an external self-call so a TraitSelectionFailed revert only
+ * drops that sample; the logged gas is the mean over samples that selected a
+ * trait. Output lines: "linear <table> <gas> <samples>" and "alias ...".
+ *
+ * Usage
+ * ─────
+ * python3 AliasTables.py --bench (from python/, with anvil running), or:
+ * forge script script/SelectionGas.s.sol --rpc-url localhost \
+ *     --sig "run(bytes[],uint256[],bytes[],uint256)" \
+ *     "[0x<weights>,...]" "[<totalWeight>,...]" "[0x<alias table>,...]" <samples>
+ */
+contract SelectionGas is Script, Rarities {
+    function run(bytes[] memory weights, uint256[] memory totals, bytes[] memory aliasTables, uint256 samples) external view {
+        for (uint256 t; t < weights.length; ++t) {
+            (uint256 linearGas, uint256 linearOk) = _measure(weights[t], totals[t], weights[t], false, samples);
+            (uint256 aliasGas, uint256 aliasOk) = _measure(weights[t], totals[t], aliasTables[t], true, samples);
+            console.log("linear", t, linearGas, linearOk);
+            console.log("alias", t, aliasGas, aliasOk);
+        }
+    }
+
+    function measureLinear(bytes memory packedWeights, uint256 totalWeight, uint256 seed) external view returns (uint256 gasUsed, uint256 idx) {
+        LibPRNG.PRNG memory prng = LibPRNG.PRNG(seed);
+        gasUsed = gasleft();
+        idx = selectRandomTrait(prng, packedWeights, totalWeight);
+        gasUsed -= gasleft();
+    }
+
+    function measureAlias(bytes memory aliasTable, uint256 totalWeight, uint256 numTraits, uint256 seed) external view returns (uint256 gasUsed, uint256 idx) {
+        LibPRNG.PRNG memory prng = LibPRNG.PRNG(seed);
+        gasUsed = gasleft();
+        idx = selectRandomTraitAlias(prng, aliasTable, totalWeight, numTraits);
+        gasUsed -= gasleft();
+    }
+
+    /// @dev Copy of the function AliasTables.py emits next to the *_ALIAS constants.
+    function selectRandomTraitAlias(LibPRNG.PRNG memory prng, bytes memory aliasTable, uint256 totalWeight, uint256 numTraits) internal pure returns (uint256 idx) {
+        uint256 r = LibPRNG.uniform(prng, (aliasTable.length >> 2) * totalWeight);
+        assembly {
+            idx := div(r, totalWeight)
+            let entry := shr(224, mload(add(add(aliasTable, 32), shl(2, idx))))
+            if iszero(lt(mod(r, totalWeight), shr(16, entry))) { idx := and(entry, 0xffff) }
+        }
+        if (idx >= numTraits) {
+            revert TraitSelectionFailed();
+        }
+    }
+
+    function _measure(bytes memory packedWeights, uint256 totalWeight, bytes memory table, bool isAlias, uint256 samples) internal view returns (uint256 meanGas, uint256 ok) {
+        uint256 totalGas;
+        uint256 numTraits = packedWeights.length >> 1;
+        for (uint256 s; s < samples; ++s) {
+            uint256 seed = uint256(keccak256(abi.encode(s)));
+            if (isAlias) {
+                try this.measureAlias(table, totalWeight, numTraits, seed) returns (uint256 gasUsed, uint256) {
+                    totalGas += gasUsed;
+                    ++ok;
+                } catch { }
+            } else {
+                try this.measureLinear(table, totalWeight, seed) returns (uint256 gasUsed, uint256) {
+                    totalGas += gasUsed;
+                    ++ok;
+                } catch { }
+            }
+        }
+        meanGas = ok == 0 ? 0 : totalGas / ok;
+    }
+}
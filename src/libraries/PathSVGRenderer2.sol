@@ -13,6 +13,16 @@ library PathSVGRenderer {
     // Background group layerType uses small enum values (0-9), so 0xFF never collides.
     uint8 private constant LAYER_FULLRES = 0xFF; // NEW
 
+    // Rect-encoded layers: runs merged into w x h rects, already grouped by color.
+    // v2 only: Renderer.sol / Renderer2.sol import PathSVGRenderer.sol and
+    // TraitsLoader.sol, which do not know these layer types.
+    uint8 private constant LAYER_RECTS = 0xFE;
+    uint8 private constant LAYER_RECTS_FULLRES = 0xFD;
+
+    // Color variant: another trait's runs/rects drawn through a palette remap.
+    // v2 only as well; the deployed TraitsLoader.sol misparses 0xFC blobs.
+    uint8 private constant LAYER_VARIANT = 0xFC;
+
     // ══════════════════════════════════════════════════════════════════════════
     //                            ENTRY POINT
     // ══════════════════════════════════════════════════════════════════════════
@@ -60,6 +70,23 @@ library PathSVGRenderer {
             return;
         }
 
+        // Variants carry only a palette remap; the geometry comes from their base trait.
+        // An empty remap means identity, so the hot non-variant path pays one length check.
+        uint16[] memory remap;
+        if (trait.layerType == LAYER_VARIANT) {
+            remap = _decodeRemap(data, group.paletteIndexByteSize, group.paletteRgba.length);
+            trait = group.traits[uint8(data[0])];
+            data = trait.traitData;
+            if (data.length == 0) {
+                return;
+            }
+        }
+
+        if (trait.layerType == LAYER_RECTS || trait.layerType == LAYER_RECTS_FULLRES) {
+            _renderRectLayer(buffer, group, data, trait.layerType == LAYER_RECTS_FULLRES ? 1 : 2, remap);
+            return;
+        }
+
         uint8 pSize = group.paletteIndexByteSize;
         uint256 colorCount = group.paletteRgba.length;
 
@@ -96,6 +123,9 @@ library PathSVGRenderer {
                         colorIdx = (uint16(uint8(data[ptr])) << 8) | uint16(uint8(data[ptr + 1]));
                         ptr += 2;
                     }
+                    if (remap.length != 0) {
+                        colorIdx = remap[colorIdx];
+                    }
 
                     // NEW: No alpha check here — transparent runs are never stored by the encoder.
                     // NEW: Append path rectangle command to this color's buffer.
@@ -137,6 +167,71 @@ library PathSVGRenderer {
         }
     }
 
+    /**
+     * Rect layers store one block per color in palette order, so each <path> is written
+     * straight into the buffer with no per-color accumulators. Output matches the RLE
+     * path for the same pixels, except that merged rows become one taller subpath.
+     */
+    function _renderRectLayer(bytes memory buffer, TraitGroup memory group, bytes memory data, uint256 unit, uint16[] memory remap) private pure {
+        uint8 pSize = group.paletteIndexByteSize;
+        uint256 ptr = 0;
+        uint8 numColors = uint8(data[ptr++]);
+
+        unchecked {
+            for (uint256 c = 0; c < numColors; ++c) {
+                uint16 colorIdx = _decodePaletteIndex(data, ptr, pSize);
+                if (remap.length != 0) {
+                    colorIdx = remap[colorIdx];
+                }
+                ptr += pSize;
+                uint8 numRects = uint8(data[ptr++]);
+
+                buffer.concat('<path fill="');
+                _emitRgbColor(buffer, group.paletteRgba[colorIdx]);
+                buffer.concat('" d="');
+
+                for (uint256 i = 0; i < numRects; ++i) {
+                    bytes memory w = bytes(Utils.toString(uint256(uint8(data[ptr + 2])) * unit));
+                    buffer.concat(
+                        abi.encodePacked(
+                            "M",
+                            Utils.toString(uint256(uint8(data[ptr])) * unit),
+                            " ",
+                            Utils.toString(uint256(uint8(data[ptr + 1])) * unit),
+                            "h",
+                            w,
+                            "v",
+                            Utils.toString(uint256(uint8(data[ptr + 3])) * unit),
+                            "h-",
+                            w,
+                            "z"
+                        )
+                    );
+                    ptr += 4;
+                }
+
+                buffer.concat('"/>');
+            }
+        }
+    }
+
+    /**
+     * Variant data: [baseTraitIndex:1][numColors:1] then numColors * [from:pSize][to:pSize].
+     * Builds a palette-sized lookup; only the base trait's colors are ever read from it.
+     */
+    function _decodeRemap(bytes memory data, uint8 pSize, uint256 colorCount) private pure returns (uint16[] memory remap) {
+        remap = new uint16[](colorCount);
+        uint8 numColors = uint8(data[1]);
+        uint256 ptr = 2;
+
+        unchecked {
+            for (uint256 i = 0; i < numColors; ++i) {
+                remap[_decodePaletteIndex(data, ptr, pSize)] = _decodePaletteIndex(data, ptr + pSize, pSize);
+                ptr += uint256(pSize) * 2;
+            }
+        }
+    }
+
     // ══════════════════════════════════════════════════════════════════════════
     //                         COLOR EMISSION
     // ══════════════════════════════════════════════════════════════════════════
@@ -6,6 +6,16 @@ import { CachedTraitGroups, TraitGroup, TraitInfo } from "../global/Structs.sol"
 import { IAssets } from "../interfaces/IAssets.sol";
 
 library TraitsLoader {
+    // Rect-encoded layers (see _parseRectsLength). Background layerTypes are small
+    // enum values, so these never collide with them.
+    // v2 only: Renderer.sol / Renderer2.sol import PathSVGRenderer.sol and
+    // TraitsLoader.sol, which do not know these layer types.
+    uint8 private constant LAYER_RECTS = 0xFE;
+    uint8 private constant LAYER_RECTS_FULLRES = 0xFD;
+    // Color variant: [baseTraitIndex:1][numColors:1] then numColors * [from:pSize][to:pSize].
+    // v2 only as well; the deployed TraitsLoader.sol misparses 0xFC blobs.
+    uint8 private constant LAYER_VARIANT = 0xFC;
+
     function initCachedTraitGroups(uint256 _traitGroupsLength) public pure returns (CachedTraitGroups memory) {
         return CachedTraitGroups({ traitGroups: new TraitGroup[](_traitGroupsLength), traitGroupsLoaded: new bool[](_traitGroupsLength) });
     }
@@ -53,6 +63,8 @@ library TraitsLoader {
                 // Trait header: [x1:1][y1:1][x2:1][y2:1][layerType:1][nameLen:1]
                 // NEW: Bounding box is now in 24x24 logical coordinate space.
                 // NEW: layerType: 0 = normal 24x24 logical, 0xFF = full-res 48x48 exception.
+                // 0xFE / 0xFD = the same two resolutions, stored as w x h rects instead of 2D RLE.
+                // 0xFC = color variant of an earlier trait in the group (palette remap only).
                 // For the Background group, layerType encodes the background type enum instead.
                 t.x1 = uint8(traitGroupData[index]);
                 t.y1 = uint8(traitGroupData[index + 1]);
@@ -80,6 +92,10 @@ library TraitsLoader {
                     } else if (layerType == uint8(E_Background_Type.Background_Image)) {
                         index = _parse2DRLELength(traitGroupData, index, pSize);
                     }
+                } else if (t.layerType == LAYER_RECTS || t.layerType == LAYER_RECTS_FULLRES) {
+                    index = _parseRectsLength(traitGroupData, index, pSize);
+                } else if (t.layerType == LAYER_VARIANT) {
+                    index += 2 + uint256(uint8(traitGroupData[index + 1])) * 2 * pSize;
                 } else {
                     index = _parse2DRLELength(traitGroupData, index, pSize);
                 }
@@ -117,6 +133,28 @@ library TraitsLoader {
         return index;
     }
 
+    /**
+     * @notice Byte length of a rect-encoded layer:
+     *   [numColors:1]
+     *   Per color: [paletteIndex:pSize][numRects:1] then numRects * [x:1][y:1][w:1][h:1]
+     */
+    function _parseRectsLength(bytes memory data, uint256 startIndex, uint8 pSize) internal pure returns (uint256) {
+        uint256 index = startIndex;
+
+        uint8 numColors = uint8(data[index++]);
+
+        for (uint256 c = 0; c < numColors;) {
+            index += pSize;
+            uint8 numRects = uint8(data[index++]);
+            index += uint256(numRects) * 4;
+            unchecked {
+                ++c;
+            }
+        }
+
+        return index;
+    }
+
     function _decodeTraitGroupName(bytes memory traitGroupData, uint256 startIndex) internal pure returns (bytes memory) {
         uint8 nameLength = uint8(traitGroupData[startIndex]);
         bytes memory name = new bytes(nameLength);